@@ -1,101 +1,37 @@
 import os
-import pandas as pd
-import re
+import sys
+import argparse
 
-def extract_body(text):
-    
-    parts = re.split(r"\n\s*\n", text, maxsplit=1)
-    body = parts[1] if len(parts) > 1 else parts[0]
-
-    cleaned_lines = []
-    for line in body.splitlines():
-        if re.match(r"^(Archive-name|From|Subject|Path|Xref|Organization|Lines|Newsgroups|Message-ID|Keywords):", line, re.I):
-            continue
-        if line.strip().startswith((">", "|")): 
-            continue
-        cleaned_lines.append(line)
-
-    body_text = "\n".join(cleaned_lines).strip()
-    body_text = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F]", "", body_text)
-    return body_text
-
-
-def convert_20ng_to_excel(root_folder, output_excel, max_files=None):
-   
-    data = []
-    for category in sorted(os.listdir(root_folder)):
-        category_path = os.path.join(root_folder, category)
-
-        if os.path.isdir(category_path):
-            print(f"Processing category: {category}")
-
-            for i, filename in enumerate(os.listdir(category_path)):
-                if max_files and i >= max_files:
-                    break
-
-                file_path = os.path.join(category_path, filename)
-                try:
-                    with open(file_path, "r", encoding="latin1") as f:
-                        raw_text = f.read()
-                        body = extract_body(raw_text)
-                        if body:
-                            data.append({
-                                "filename": filename,
-                                "category": category,
-                                "text": body
-                            })
-                except Exception as e:
-                    print(f"Skipping {file_path}: {e}")
-
-    df = pd.DataFrame(data)
-    df.to_excel(output_excel, index=False, engine="openpyxl")
-    print(f"✅ Step 1 done: Saved {len(df)} rows to {output_excel}")
-
-
-def clean_body(raw_text):
-    if pd.isna(raw_text):
-        return ""
-
-
-    parts = re.split(r"\n\s*\n", raw_text, maxsplit=1)
-    body = parts[1] if len(parts) > 1 else parts[0]
-
-    cleaned_lines = []
-    for line in body.splitlines():
-        if re.match(r"^(archive-name|from|subject|path|xref|organization|lines|newsgroups|message-id|keywords|last-modified|version):", line, re.I):
-            continue
-        if line.strip().startswith((">", "|")):
-            continue
-        if line.strip().startswith("--"):  
-            break
-        if re.search(r"In article\s*<.*?>", line, re.I):
-            continue
-        if re.search(r"writes:|wrote:", line, re.I):
-            continue
-        cleaned_lines.append(line)
-
-    body = "\n".join(cleaned_lines)
-
-
-    body = re.sub(r"\S+@\S+", " ", body)
-    body = re.sub(r"http\S+|www\.\S+", " ", body)
-    body = re.sub(r"<[^>]+>", " ", body)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from preprocessing.newsgroups import clean_post, VERSION
+from preprocessing.cache import cached_map
+from preprocessing.corpus_builder import build_corpus
+from preprocessing.columnar import read_table, write_table, write_excel_report
 
+def extract_body(text):
+    """Strip headers and quoted lines from a raw post"""
+    return clean_post(text, "body")
 
-    body = re.sub(r"[^a-zA-Z0-9\s\.\,\!\?]", " ", body)
 
+def convert_20ng_to_parquet(root_folder, output_parquet, max_files=None, workers=None, resume=False):
+    """Extract post bodies in a process pool, streaming them to ``output_parquet``"""
+    written, processed, errors = build_corpus(root_folder, output_parquet, ["body"], workers,
+                                              max_files=max_files, resume=resume)
+    for error in errors:
+        print(f"Skipping {error}")
+    print(f"✅ Step 1 done: Saved {written} rows to {output_parquet}")
 
-    body = re.sub(r"\s{2,}", " ", body)
-    body = body.lower().strip()
 
-    return body
+def clean_body(raw_text):
+    """Drop reply boilerplate and signatures, then normalize the extracted body"""
+    return clean_post(raw_text, "metadata")
 
 
-def process_final_dataset(input_excel, output_excel):
-    df = pd.read_excel(input_excel, engine="openpyxl")
+def process_final_dataset(input_parquet, output_parquet, output_excel=None):
+    df = read_table(input_parquet, columns=["category", "text"])
     print(f"Loaded {len(df)} rows for deep cleaning...")
 
-    df["text"] = df["text"].apply(clean_body)
+    df["text"] = cached_map(clean_body, df["text"], "newsgroups.metadata", VERSION)
 
     df["text"] = df["text"].str.strip()
 
@@ -103,23 +39,34 @@ def process_final_dataset(input_excel, output_excel):
 
     df = df[["category", "text"]].reset_index(drop=True)
 
-    df.to_excel(output_excel, index=False, engine="openpyxl")
-    print(f"✅ Final dataset saved: {len(df)} rows → {output_excel}")
+    write_table(df, output_parquet)
+    if output_excel:
+        write_excel_report(df, output_excel)
+    print(f"✅ Final dataset saved: {len(df)} rows → {output_parquet}")
 
 if __name__ == "__main__":
-    root_folder = r"D:\Infosys Project\20news-18828"
-
- 
-    convert_20ng_to_excel(
-        root_folder=root_folder,
-        output_excel="20news_initial.xlsx",
-        max_files=50 
+    parser = argparse.ArgumentParser(description="Build the 20 Newsgroups metadata dataset")
+    parser.add_argument("root_folder", help="20news-18828 folder (one sub-folder per category)")
+    parser.add_argument("--initial", default="20news_initial.parquet")
+    parser.add_argument("--output", default="news_MetaData.parquet")
+    parser.add_argument("--output-excel", default=None, help="optional Excel report of the final dataset")
+    parser.add_argument("--max-files", type=int, default=None, help="files per category (default: all)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--resume", action="store_true", help="continue an interrupted run")
+    args = parser.parse_args()
+
+    convert_20ng_to_parquet(
+        root_folder=args.root_folder,
+        output_parquet=args.initial,
+        max_files=args.max_files,
+        workers=args.workers,
+        resume=args.resume,
     )
 
-
     process_final_dataset(
-        input_excel="20news_initial.xlsx",
-        output_excel="news_MetaData.xlsx"
+        input_parquet=args.initial,
+        output_parquet=args.output,
+        output_excel=args.output_excel
     )
 
     print("\n🚀 Processing Complete!")
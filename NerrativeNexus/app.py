@@ -1,174 +1,207 @@
 import streamlit as st
 import pandas as pd
 import os
-import json
-import uuid
+import tempfile
 import requests
-from datetime import datetime, timezone
+from importlib.util import find_spec
+from datetime import datetime, time, timezone
 from dotenv import load_dotenv
 
-try:
-    import docx
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
-    st.warning("⚠️ python-docx not installed. Word documents (.docx) won't be supported.")
-
-try:
-    import pdfplumber
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
-    st.warning("⚠️ pdfplumber not installed. PDF files won't be supported.")
-
-try:
-    import praw
-    REDDIT_AVAILABLE = True
-except ImportError:
-    REDDIT_AVAILABLE = False
-    st.warning("⚠️ praw not installed. Reddit functionality won't be supported.")
+from record_log import RecordLog
+from record_store import RecordStore
+from records import create_file_record, create_reddit_record, create_news_record
+from reddit_bulk import RedditBulkFetcher, read_url_list
+from dedup import DedupIndex, save_deduplicated
+from news_harvester import NewsHarvester, NEWS_API_URL, AIOHTTP_AVAILABLE
+
+from extraction import DOCX_AVAILABLE, PDF_AVAILABLE
+from readers import (read_txt, read_csv, read_csv_preview, guess_text_column, iter_csv_records,
+                     iter_document_records, supported_types)
+from batch_ingest import ingest, summarize, REPORT_FIELDS
+from exporter import export_records, commit_export, FORMATS, MIME_TYPES, PARQUET_AVAILABLE
+
+REDDIT_AVAILABLE = find_spec("praw") is not None
+
 
+@st.cache_resource
+def get_config():
+    """Read .env once per server process instead of on every rerun"""
+    load_dotenv()
+    return {
+        "REDDIT_CLIENT_ID": os.getenv("REDDIT_CLIENT_ID"),
+        "REDDIT_CLIENT_SECRET": os.getenv("REDDIT_CLIENT_SECRET"),
+        "REDDIT_USER_AGENT": os.getenv("REDDIT_USER_AGENT"),
+        "NEWS_API_KEY": os.getenv("NEWS_API_KEY"),
+    }
 
-load_dotenv()
 
-REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
-REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
-REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT")
-NEWS_API_KEY = os.getenv("NEWS_API_KEY")
+config = get_config()
+REDDIT_CLIENT_ID = config["REDDIT_CLIENT_ID"]
+REDDIT_CLIENT_SECRET = config["REDDIT_CLIENT_SECRET"]
+REDDIT_USER_AGENT = config["REDDIT_USER_AGENT"]
+NEWS_API_KEY = config["NEWS_API_KEY"]
+REDDIT_CONFIGURED = bool(REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET and REDDIT_USER_AGENT)
 
 DATA_DIR = "data"
 os.makedirs(DATA_DIR, exist_ok=True)
 DATA_FILE = os.path.join(DATA_DIR, "data_store.json")
+LOG_DIR = os.path.join(DATA_DIR, "records")
+INDEX_DB = os.path.join(DATA_DIR, "records.sqlite3")
+EXPORT_DIR = os.path.join(DATA_DIR, "exports")
 
+SKIP_REASONS = {"url": "same URL", "exact": "identical text", "near": "near-duplicate text"}
 
-reddit = None
-if REDDIT_AVAILABLE and REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET and REDDIT_USER_AGENT:
-    try:
-        reddit = praw.Reddit(
-            client_id=REDDIT_CLIENT_ID,
-            client_secret=REDDIT_CLIENT_SECRET,
-            user_agent=REDDIT_USER_AGENT
-        )
-    except Exception as e:
-        st.error(f"❌ Error initializing Reddit client: {e}")
 
+def make_reddit_client():
+    """Build a praw client from the .env credentials"""
+    import praw
 
-def load_data():
-    """Load existing data from JSON file"""
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            st.warning("⚠️ Data file corrupted. Starting fresh.")
-            return []
-        except Exception as e:
-            st.error(f"Error loading data: {e}")
-            return []
-    return []
+    return praw.Reddit(
+        client_id=REDDIT_CLIENT_ID,
+        client_secret=REDDIT_CLIENT_SECRET,
+        user_agent=REDDIT_USER_AGENT
+    )
 
 
-def save_single_data(new_record):
-    """Save new record to JSON file"""
-    try:
-        data = load_data()
-        data.append(new_record)
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
-        return True
-    except Exception as e:
-        st.error(f"Error saving data: {e}")
-        return False
+@st.cache_resource
+def get_reddit_client():
+    """Shared praw client, created on first use and kept across reruns"""
+    return make_reddit_client()
+
 
+@st.cache_resource
+def get_news_session():
+    """Pooled HTTP session for NewsAPI requests, kept across reruns"""
+    return requests.Session()
 
-def save_data_export(records, format_choice):
-    """Save collected data as CSV or JSON for export"""
+
+@st.cache_resource
+def get_record_log():
+    """Open the append-only record log once per server process"""
+    log = RecordLog(LOG_DIR)
     try:
-        if format_choice == "CSV":
-            df = pd.json_normalize(records)
-            df.to_csv("output_data.csv", index=False, encoding="utf-8")
-            return "✅ Data exported to output_data.csv"
-        else:
-            with open("output_data.json", "w", encoding="utf-8") as f:
-                json.dump(records, f, indent=4, ensure_ascii=False)
-            return "✅ Data exported to output_data.json"
+        log.migrate_json(DATA_FILE)
     except Exception as e:
-        return f"❌ Error exporting data: {e}"
+        st.error(f"Error migrating {DATA_FILE}: {e}")
+    return log
 
 
-def read_txt(file):
-    """Read text file"""
-    try:
-        return file.read().decode("utf-8")
-    except UnicodeDecodeError:
-        file.seek(0)
-        try:
-            return file.read().decode("latin-1")
-        except Exception as e:
-            raise Exception(f"Could not decode text file: {e}")
+@st.cache_resource
+def get_record_store():
+    """Open the SQLite record index once per server process"""
+    store = RecordStore(INDEX_DB)
+    store.sync(get_record_log())
+    return store
 
 
-def read_csv(file):
-    """Read CSV file and convert to string"""
-    try:
-        df = pd.read_csv(file)
-        return df.to_string()
-    except Exception as e:
-        raise Exception(f"Error reading CSV: {e}")
+@st.cache_resource
+def get_dedup_index():
+    """Open the duplicate index once per server process"""
+    dedup = DedupIndex(get_record_store())
+    dedup.catch_up()
+    return dedup
 
 
-def read_docx(file):
-    """Read Word document"""
-    if not DOCX_AVAILABLE:
-        raise Exception("python-docx not installed. Install with: pip install python-docx")
-    
-    try:
-        doc = docx.Document(file)
-        return "\n".join([para.text for para in doc.paragraphs])
-    except Exception as e:
-        raise Exception(f"Error reading Word document: {e}")
+@st.cache_data(ttl=60, show_spinner=False)
+def load_page(data_version, filters, page_size, cursor):
+    """One page of the dataset view; cached per data version, filters and cursor"""
+    records, next_cursor = get_record_store().page(limit=page_size, after=cursor, **dict(filters))
+    rows = [{
+        "id": r.get("id"),
+        "source": r.get("source"),
+        "author": r.get("author"),
+        "timestamp": r.get("timestamp"),
+        "text": (r.get("text") or "")[:300],
+        "url / file": (r.get("metadata") or {}).get("url") or (r.get("metadata") or {}).get("filename"),
+    } for r in records]
+    return rows, next_cursor
 
 
-def read_pdf(file):
-    """Read PDF file"""
-    if not PDF_AVAILABLE:
-        raise Exception("pdfplumber not installed. Install with: pip install pdfplumber")
-    
+@st.cache_data(ttl=60, show_spinner=False)
+def count_records(data_version, filters):
+    return get_record_store().count(**dict(filters))
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def list_sources(data_version):
+    return get_record_store().sources()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def list_labels(data_version, field):
+    """Labels written by score_records.py, most frequent first"""
+    return list(get_record_store().label_counts(field))
+
+
+def save_single_data(new_record):
+    """Append new record to the record log"""
+    return save_records([new_record]) == 1
+
+
+def save_records(records):
+    """Append new (non-duplicate) records with a single fsync; returns the number saved"""
     try:
-        text = ""
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        return text if text.strip() else "No text could be extracted from this PDF."
+        saved, skipped = save_deduplicated(get_record_log(), get_record_store(), get_dedup_index(), records)
+        if skipped:
+            reasons = ", ".join(f"{n} {SKIP_REASONS[reason]}" for reason, n in skipped.items())
+            st.info(f"⏭️ Skipped {sum(skipped.values())} duplicate record(s): {reasons}")
+        return saved
     except Exception as e:
-        raise Exception(f"Error reading PDF: {e}")
+        st.error(f"Error saving data: {e}")
+        return 0
+
+
+def save_data_export(format_choice, incremental=False, **filters):
+    """
+    Stream stored records into a temporary CSV, JSONL or Parquet file for download.
+    Returns (path, records exported, last rowid exported).
+    """
+    fmt = FORMATS[format_choice]
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix="export-", suffix=f".{fmt}", dir=EXPORT_DIR)
+    os.close(fd)
+    try:
+        count, last = export_records(get_record_store(), fmt, path, incremental, **filters)
+    except Exception:
+        os.unlink(path)
+        raise
+    return path, count, last
+
+
+def commit_data_export(fmt, last, filters):
+    """Download callback: an incremental export only moves its marker once it has been downloaded"""
+    if last is not None:
+        commit_export(get_record_store(), fmt, last, **dict(filters))
+
+
+def ingest_document(file, filename, file_type, on_progress=None, batch_chunks=8):
+    """
+    Stream a PDF/Word document into the store chunk by chunk.
+    Returns (records saved, total characters, first record) or None if no text was found.
+    """
+    saved, total_chars, batch, first_record = 0, 0, [], None
+    for record in iter_document_records(file, filename, file_type, on_progress=on_progress):
+        first_record = first_record or record
+        total_chars += len(record["text"])
+        batch.append(record)
+        if len(batch) >= batch_chunks:
+            saved += save_records(batch)
+            batch = []
+    if batch:
+        saved += save_records(batch)
+    if first_record is None:
+        return None
+    return saved, total_chars, first_record
 
 
 def fetch_reddit_post(url):
     """Fetch a single Reddit post given its URL"""
-    if not reddit:
+    if not REDDIT_CONFIGURED:
         raise Exception("Reddit client not initialized. Check your API credentials.")
     
     try:
-        submission = reddit.submission(url=url)
-        record = {
-            "id": str(uuid.uuid4()),
-            "source": "reddit",
-            "author": submission.author.name if submission.author else "unknown",
-            "timestamp": datetime.fromtimestamp(submission.created_utc, tz=timezone.utc).isoformat(),
-            "text": (submission.title or "") + "\n" + (submission.selftext or ""),
-            "metadata": {
-                "language": "en",
-                "likes": submission.score,
-                "rating": None,
-                "url": url,
-                "subreddit": submission.subreddit.display_name,
-                "num_comments": submission.num_comments
-            }
-        }
-        return record
+        submission = get_reddit_client().submission(url=url)
+        return create_reddit_record(submission, url=url)
     except Exception as e:
         raise Exception(f"Error fetching Reddit post: {e}")
 
@@ -179,55 +212,32 @@ def fetch_news(query):
         raise Exception("News API key not found. Check your .env file.")
     
     try:
-        url = f"https://newsapi.org/v2/everything?q={query}&apiKey={NEWS_API_KEY}&sortBy=publishedAt&pageSize=1"
-        response = requests.get(url).json()
+        response = get_news_session().get(
+            NEWS_API_URL,
+            params={"q": query, "sortBy": "publishedAt", "pageSize": 1},
+            headers={"X-Api-Key": NEWS_API_KEY},
+            timeout=15,
+        ).json()
 
         if "articles" not in response or len(response["articles"]) == 0:
             return None
 
-        article = response["articles"][0]
-        record = {
-            "id": str(uuid.uuid4()),
-            "source": "news",
-            "author": article.get("author") or "unknown",
-            "timestamp": article.get("publishedAt"),
-            "text": (article.get("title") or "") + "\n" + (article.get("description") or ""),
-            "metadata": {
-                "language": article.get("language", "en"),
-                "likes": None,
-                "rating": None,
-                "url": article.get("url"),
-                "source_name": article.get("source", {}).get("name", "unknown")
-            }
-        }
-        return record
+        return create_news_record(response["articles"][0])
     except Exception as e:
         raise Exception(f"Error fetching news: {e}")
 
 
-def create_file_record(filename, source_type, file_type, content):
-    """Create a data record for file uploads"""
-    return {
-        "id": str(uuid.uuid4()),
-        "source": "file",
-        "author": "user_upload",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "text": content,
-        "metadata": {
-            "filename": filename,
-            "source_type": source_type,
-            "file_type": file_type,
-            "content_length": len(content),
-            "language": "en"
-        }
-    }
+record_log = get_record_log()
+if record_log.recovered_bytes:
+    st.warning(f"⚠️ Discarded {record_log.recovered_bytes} bytes of an incomplete write at the end of the data log.")
+    record_log.recovered_bytes = 0
 
 
 st.title("📊 NarrativeNexus Data Collector")
 st.write("Comprehensive data collection from files, Reddit posts, and news articles.")
 
 
-tab1, tab2, tab3 = st.tabs(["📄 File Upload", "🔗 Reddit Posts", "📰 News Articles"])
+tab1, tab2, tab3, tab4 = st.tabs(["📄 File Upload", "🔗 Reddit Posts", "📰 News Articles", "🗂️ Dataset"])
 
 
 with tab1:
@@ -235,17 +245,33 @@ with tab1:
     st.write("Upload text files for analysis and storage.")
     
 
-    supported_types = ["txt", "csv"]
-    if DOCX_AVAILABLE:
-        supported_types.append("docx")
-    if PDF_AVAILABLE:
-        supported_types.append("pdf")
+    file_types = supported_types()
+    if not DOCX_AVAILABLE:
+        st.caption("⚠️ python-docx not installed. Word documents (.docx) won't be supported.")
+    if not PDF_AVAILABLE:
+        st.caption("⚠️ pdfplumber not installed. PDF files won't be supported.")
 
     uploaded_file = st.file_uploader(
-        f"Upload a file ({', '.join(['.' + t for t in supported_types])})",
-        type=supported_types
+        f"Upload a file ({', '.join(['.' + t for t in file_types])})",
+        type=file_types
     )
 
+    csv_rows = False
+    if uploaded_file is not None and uploaded_file.name.lower().endswith(".csv"):
+        csv_rows = st.checkbox("Store one record per CSV row", value=True, key="csv_rows")
+        if csv_rows:
+            try:
+                preview = read_csv_preview(uploaded_file)
+                columns = list(preview.columns)
+                csv_text_column = st.selectbox("Text column:", columns,
+                                               index=columns.index(guess_text_column(preview)))
+                csv_metadata_columns = st.multiselect("Metadata columns:",
+                                                      [c for c in columns if c != csv_text_column])
+                st.dataframe(preview)
+            except Exception as e:
+                st.error(f"❌ Error reading CSV header: {e}")
+                csv_rows = False
+
     text_input = st.text_area("Or paste text directly here:", height=150)
 
     if st.button("Process File/Text", key="file_process"):
@@ -253,6 +279,7 @@ with tab1:
             content = None
             filename = None
             file_type = None
+            streamed = False
             
         
             if uploaded_file is not None:
@@ -262,14 +289,41 @@ with tab1:
                 
                 if file_extension == "txt":
                     content = read_txt(uploaded_file)
+                elif file_extension == "csv" and csv_rows:
+                    streamed = True
+                    rows_read, rows_saved = 0, 0
+                    status = st.empty()
+                    with st.spinner(f"Streaming rows from {filename}..."):
+                        for records in iter_csv_records(uploaded_file, filename, csv_text_column,
+                                                        csv_metadata_columns):
+                            rows_read += len(records)
+                            rows_saved += save_records(records)
+                            status.write(f"{rows_read:,} rows read, {rows_saved:,} saved...")
+                    st.success(f"✅ Saved {rows_saved:,} of {rows_read:,} rows as separate records.")
                 elif file_extension == "csv":
                     content = read_csv(uploaded_file)
-                elif file_extension == "docx":
-                    content = read_docx(uploaded_file)
-                elif file_extension == "pdf":
-                    content = read_pdf(uploaded_file)
-                    
-     
+                elif file_extension in ("docx", "pdf"):
+                    streamed = True
+                    progress = st.progress(0.0)
+                    with st.spinner(f"Extracting {filename}..."):
+                        result = ingest_document(uploaded_file, filename, file_extension,
+                                                 on_progress=lambda done, total: progress.progress(done / total))
+                    progress.progress(1.0)
+                    if result is None:
+                        st.warning(f"⚠️ No text could be extracted from {filename}.")
+                    elif result[0]:
+                        saved, total_chars, record = result
+                        st.success(f"✅ Content saved successfully as {saved} record(s)!")
+                        col1, col2, col3 = st.columns(3)
+                        with col1:
+                            st.metric("Content Length", f"{total_chars:,} chars")
+                        with col2:
+                            st.metric("Type", file_type.upper())
+                        with col3:
+                            st.metric("Chunks", saved)
+                        with st.expander("Preview Content"):
+                            st.write(record["text"][:500] + ("..." if len(record["text"]) > 500 else ""))
+
             elif text_input.strip():
                 content = text_input
                 filename = "pasted_text"
@@ -297,12 +351,50 @@ with tab1:
                             st.info(f"Showing first {preview_length} characters of {len(content):,} total")
                         else:
                             st.write(content)
-            else:
+            elif not streamed:
                 st.warning("⚠️ Please upload a file or paste some text.")
                 
         except Exception as e:
             st.error(f"❌ Error processing content: {e}")
 
+    st.subheader("📦 Batch Upload")
+    batch_files = st.file_uploader(
+        "Upload many files or .zip archives",
+        type=file_types + ["zip"],
+        accept_multiple_files=True,
+        key="batch_upload"
+    )
+    batch_workers = st.slider("Reader processes", min_value=1, max_value=max(2, os.cpu_count() or 1),
+                              value=os.cpu_count() or 1, key="batch_workers")
+
+    if st.button("Process Batch", key="batch_process"):
+        if not batch_files:
+            st.warning("⚠️ Please upload at least one file.")
+        else:
+            try:
+                saved = {"count": 0}
+
+                def save_batch(records):
+                    saved["count"] += save_records(records)
+
+                progress = st.progress(0.0)
+                with tempfile.TemporaryDirectory() as upload_dir:
+                    for uploaded in batch_files:
+                        with open(os.path.join(upload_dir, os.path.basename(uploaded.name)), "wb") as f:
+                            f.write(uploaded.getbuffer())
+                    with st.spinner(f"Reading {len(batch_files)} uploads..."):
+                        report = ingest([upload_dir], save_batch, workers=batch_workers,
+                                        on_progress=lambda done, total: progress.progress(done / total))
+                progress.progress(1.0)
+
+                summary = summarize(report)
+                st.success(f"✅ Saved {saved['count']} records from {summary['files']} files.")
+                if summary.get("error"):
+                    st.warning(f"⚠️ {summary['error']} files could not be read.")
+                st.dataframe(pd.DataFrame(report, columns=REPORT_FIELDS))
+            except Exception as e:
+                st.error(f"❌ Error processing batch: {e}")
+
 
 with tab2:
     st.header("🔗 Reddit Post Collector")
@@ -310,7 +402,7 @@ with tab2:
     
     if not REDDIT_AVAILABLE:
         st.error("❌ Reddit functionality unavailable. Install praw: `pip install praw`")
-    elif not reddit:
+    elif not REDDIT_CONFIGURED:
         st.error("❌ Reddit API not configured. Check your .env file for REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, and REDDIT_USER_AGENT")
     else:
         reddit_url = st.text_input("Enter Reddit post URL:", 
@@ -345,6 +437,61 @@ with tab2:
             else:
                 st.warning("⚠️ Please enter a Reddit URL.")
 
+        st.subheader("📦 Bulk Collection")
+        bulk_mode = st.radio("Collect from:", ["URL list", "Subreddit"], horizontal=True, key="reddit_bulk_mode")
+
+        if bulk_mode == "URL list":
+            bulk_urls = st.text_area("Reddit post URLs (one per line):", height=120)
+            url_file = st.file_uploader("Or upload a .txt/.csv file of URLs", type=["txt", "csv"], key="reddit_url_file")
+        else:
+            subreddit_name = st.text_input("Subreddit:", placeholder="e.g., technology")
+            col1, col2 = st.columns(2)
+            with col1:
+                subreddit_limit = st.number_input("Number of posts:", min_value=1, max_value=1000, value=50)
+            with col2:
+                subreddit_sort = st.selectbox("Sort by:", ["hot", "new", "top"])
+
+        col1, col2 = st.columns(2)
+        with col1:
+            include_comments = st.checkbox("Include comment trees", key="reddit_bulk_comments")
+        with col2:
+            bulk_workers = st.slider("Parallel workers", min_value=1, max_value=16, value=8)
+
+        if st.button("Fetch in Bulk", key="reddit_bulk_fetch"):
+            fetcher = RedditBulkFetcher(make_reddit_client, max_workers=bulk_workers,
+                                        include_comments=include_comments)
+            progress = st.progress(0.0)
+            on_progress = lambda done, total: progress.progress(done / total)
+            try:
+                records, errors = None, []
+                if bulk_mode == "URL list":
+                    urls = read_url_list(bulk_urls)
+                    if url_file is not None:
+                        urls += [u for u in read_url_list(url_file) if u not in urls]
+                    if not urls:
+                        st.warning("⚠️ Please enter or upload at least one Reddit URL.")
+                    else:
+                        with st.spinner(f"Fetching {len(urls)} Reddit posts..."):
+                            records, errors = fetcher.fetch_urls(urls, on_progress=on_progress)
+                elif not subreddit_name.strip():
+                    st.warning("⚠️ Please enter a subreddit name.")
+                else:
+                    with st.spinner(f"Fetching posts from r/{subreddit_name.strip()}..."):
+                        records, errors = fetcher.fetch_subreddit(subreddit_name.strip(), limit=int(subreddit_limit),
+                                                                  sort=subreddit_sort, on_progress=on_progress)
+
+                if records is not None:
+                    progress.progress(1.0)
+                    saved = save_records(records)
+                    st.success(f"✅ Saved {saved} Reddit posts.")
+                    if errors:
+                        st.warning(f"⚠️ {len(errors)} posts could not be fetched.")
+                        with st.expander("Failed URLs"):
+                            for item, error in errors:
+                                st.write(f"**{getattr(item, 'id', item)}:** {error}")
+            except Exception as e:
+                st.error(f"❌ Error: {e}")
+
 
 with tab3:
     st.header("📰 News Article Collector")
@@ -385,4 +532,133 @@ with tab3:
             else:
                 st.warning("⚠️ Please enter search keywords.")
 
-
+        st.subheader("📦 Bulk Harvest")
+        if not AIOHTTP_AVAILABLE:
+            st.info("Install aiohttp to harvest many articles at once: `pip install aiohttp`")
+        else:
+            harvest_queries = st.text_area("Search queries (one per line):", height=100)
+            col1, col2 = st.columns(2)
+            with col1:
+                harvest_max = st.number_input("Max articles per query:", min_value=1, max_value=10000, value=300)
+            with col2:
+                harvest_concurrency = st.slider("Concurrent requests", min_value=1, max_value=16, value=4)
+
+            if st.button("Harvest News", key="news_harvest"):
+                queries = [q.strip() for q in harvest_queries.splitlines() if q.strip()]
+                if queries:
+                    harvested = {"count": 0}
+                    status = st.empty()
+
+                    def sink(records):
+                        harvested["count"] += save_records(records)
+                        status.write(f"Saved {harvested['count']} articles...")
+
+                    try:
+                        with st.spinner(f"Harvesting {len(queries)} queries..."):
+                            harvester = NewsHarvester(NEWS_API_KEY, concurrency=harvest_concurrency)
+                            results = harvester.harvest(queries, int(harvest_max), sink)
+                        st.success(f"✅ Saved {harvested['count']} news articles.")
+                        for query, result in results.items():
+                            if isinstance(result, Exception):
+                                st.error(f"❌ {query}: {result}")
+                            else:
+                                st.write(f"**{query}:** {result} articles")
+                    except Exception as e:
+                        st.error(f"❌ Error: {e}")
+                else:
+                    st.warning("⚠️ Please enter at least one search query.")
+
+
+
+
+with tab4:
+    st.header("🗂️ Collected Dataset")
+    st.write("Browse stored records page by page.")
+
+    store = get_record_store()
+    data_version = store.data_version()
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        source_filter = st.selectbox("Source:", ["All"] + list_sources(data_version), key="dataset_source")
+    with col2:
+        date_filter = st.date_input("Date range:", value=(), key="dataset_dates")
+    with col3:
+        page_size = st.selectbox("Rows per page:", [25, 50, 100, 250], index=1, key="dataset_page_size")
+    search_filter = st.text_input("Search text:", placeholder="words that must all appear", key="dataset_search")
+    label_filters = {}
+    labels = {field: list_labels(data_version, field) for field in ("topic", "sentiment")}
+    if any(labels.values()):
+        for column, (field, options) in zip(st.columns(2), labels.items()):
+            with column:
+                label_filters[field] = st.selectbox(f"{field.title()}:", ["All"] + options, key=f"dataset_{field}")
+
+    filters = {field: value for field, value in label_filters.items() if value != "All"}
+    if source_filter != "All":
+        filters["source"] = source_filter
+    if len(date_filter) >= 1:
+        filters["since"] = datetime.combine(date_filter[0], time.min, tzinfo=timezone.utc)
+    if len(date_filter) == 2:
+        filters["until"] = datetime.combine(date_filter[1], time.max, tzinfo=timezone.utc)
+    if search_filter.strip():
+        filters["search"] = search_filter.strip()
+    filters = tuple(sorted(filters.items()))
+
+    # Keyset cursors of the pages visited so far; reset when the filters change
+    if st.session_state.get("dataset_filters") != (filters, page_size):
+        st.session_state["dataset_filters"] = (filters, page_size)
+        st.session_state["dataset_cursors"] = [None]
+    cursors = st.session_state["dataset_cursors"]
+
+    total = count_records(data_version, filters)
+    rows, next_cursor = load_page(data_version, filters, page_size, cursors[-1])
+    page_number = len(cursors)
+    page_count = max(1, -(-total // page_size))
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Previous", key="dataset_prev", disabled=page_number == 1):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        st.write(f"Page {page_number:,} of {page_count:,} — {total:,} matching records")
+    with col3:
+        if st.button("Next ➡️", key="dataset_next", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+
+    st.dataframe(pd.DataFrame(rows), hide_index=True)
+
+    record_id = st.selectbox("Show full record:", [""] + [row["id"] for row in rows], key="dataset_record")
+    if record_id:
+        st.json(store.get(record_id))
+
+    st.subheader("📦 Export")
+    col1, col2 = st.columns(2)
+    with col1:
+        export_formats = [f for f in FORMATS if FORMATS[f] != "parquet" or PARQUET_AVAILABLE]
+        export_format = st.selectbox("Format:", export_formats, key="export_format")
+    with col2:
+        export_new_only = st.checkbox("Only records added since the last export", key="export_incremental")
+    st.caption("Exports use the filters above.")
+
+    if st.button("Prepare export", key="export_prepare"):
+        previous = st.session_state.pop("export_file", None)
+        if previous and os.path.exists(previous[0]):
+            os.unlink(previous[0])
+        try:
+            with st.spinner("Writing export..."):
+                path, count, last = save_data_export(export_format, export_new_only, **dict(filters))
+            st.session_state["export_file"] = (path, FORMATS[export_format], count,
+                                               last if export_new_only else None, filters)
+        except Exception as e:
+            st.error(f"❌ Error exporting data: {e}")
+
+    if "export_file" in st.session_state:
+        path, fmt, count, last, export_filters = st.session_state["export_file"]
+        if os.path.exists(path):
+            st.success(f"✅ {count:,} records ready")
+            with open(path, "rb") as f:
+                st.download_button(f"⬇️ Download {fmt.upper()}", f, file_name=f"narrative_nexus_export.{fmt}",
+                                   mime=MIME_TYPES[fmt], key="export_download",
+                                   on_click=commit_data_export, args=(fmt, last, export_filters))
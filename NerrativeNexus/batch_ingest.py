@@ -0,0 +1,166 @@
+"""
+Batch ingestion of many files, folders and zip archives.
+
+Files are read in a process pool (PDF extraction is CPU bound), their records
+are written to the store in bulk, and a per-file report with timings and
+errors is produced.
+
+    python batch_ingest.py reports/ archive.zip notes.txt --workers 4 --report ingest_report.csv
+"""
+import io
+import os
+import csv
+import time
+import zipfile
+import argparse
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from readers import iter_file_records, supported_types, file_extension
+
+
+REPORT_FIELDS = ["file", "type", "status", "records", "chars", "seconds", "error"]
+
+
+def collect_inputs(paths):
+    """Expand files, directories and .zip archives into (name, path, zip_member) items"""
+    items = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for filename in sorted(files):
+                    full_path = os.path.join(root, filename)
+                    items.extend(collect_inputs([full_path]) if filename.lower().endswith(".zip")
+                                 else [(os.path.relpath(full_path, path), full_path, None)])
+        elif path.lower().endswith(".zip"):
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir():
+                        items.append((f"{os.path.basename(path)}/{info.filename}", path, info.filename))
+        else:
+            items.append((os.path.basename(path), path, None))
+    return items
+
+
+def read_input(item):
+    """Worker: read one input item; returns (report row, records)"""
+    name, path, member = item
+    file_type = file_extension(member or path)
+    row = {"file": name, "type": file_type, "status": "ok", "records": 0, "chars": 0, "seconds": 0.0, "error": ""}
+    if file_type not in supported_types():
+        row["status"] = "skipped"
+        row["error"] = f"unsupported file type .{file_type}"
+        return row, []
+
+    start = time.perf_counter()
+    try:
+        if member:
+            with zipfile.ZipFile(path) as archive:
+                file = io.BytesIO(archive.read(member))
+        else:
+            file = open(path, "rb")
+        with file:
+            records = list(iter_file_records(file, os.path.basename(member or path), "batch_upload", workers=1))
+        row["records"] = len(records)
+        row["chars"] = sum(len(r["text"]) for r in records)
+        if not records:
+            row["status"] = "empty"
+    except Exception as e:
+        records = []
+        row["status"] = "error"
+        row["error"] = str(e)
+    row["seconds"] = round(time.perf_counter() - start, 3)
+    return row, records
+
+
+def ingest(paths, save, workers=None, batch_size=500, on_progress=None):
+    """
+    Read every input under ``paths`` and pass records to ``save`` in batches
+    of about ``batch_size``. Returns the per-file report rows.
+    """
+    items = collect_inputs(paths)
+    workers = workers or os.cpu_count() or 1
+    report, pending = [], []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        queue = deque()
+        remaining = iter(items)
+        for item in remaining:
+            queue.append(pool.submit(read_input, item))
+            if len(queue) >= workers * 2:
+                break
+        while queue:
+            row, records = queue.popleft().result()
+            next_item = next(remaining, None)
+            if next_item:
+                queue.append(pool.submit(read_input, next_item))
+            report.append(row)
+            pending.extend(records)
+            if len(pending) >= batch_size:
+                save(pending)
+                pending = []
+            if on_progress:
+                on_progress(len(report), len(items))
+    if pending:
+        save(pending)
+    return report
+
+
+def write_report(report, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(report)
+
+
+def summarize(report):
+    statuses = Counter(row["status"] for row in report)
+    return {
+        "files": len(report),
+        "records": sum(row["records"] for row in report),
+        "seconds": round(sum(row["seconds"] for row in report), 3),
+        **statuses,
+    }
+
+
+def main():
+    from record_store import open_record_store
+    from dedup import DedupIndex, save_deduplicated
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="files, directories or .zip archives")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=500, help="records per bulk write")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--report", default=None, help="write the per-file report to this CSV")
+    args = parser.parse_args()
+
+    log, store = open_record_store(args.data_dir)
+    dedup = DedupIndex(store)
+    totals = Counter()
+
+    def save(records):
+        saved, skipped = save_deduplicated(log, store, dedup, records)
+        totals["saved"] += saved
+        totals.update(skipped)
+
+    start = time.perf_counter()
+    report = ingest(args.paths, save, workers=args.workers, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    log.close()
+
+    for row in report:
+        marker = {"ok": "✅", "empty": "⚪", "skipped": "⏭️"}.get(row["status"], "❌")
+        print(f"{marker} {row['file']}: {row['records']} records, {row['chars']:,} chars in {row['seconds']:.2f}s"
+              + (f" ({row['error']})" if row["error"] else ""))
+    print(f"\n📦 {summarize(report)}")
+    print(f"💾 Saved {totals.pop('saved', 0)} records, skipped duplicates: {dict(totals)}")
+    print(f"⏱️ Wall time: {elapsed:.2f}s")
+    if args.report:
+        write_report(report, args.report)
+        print(f"📋 Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
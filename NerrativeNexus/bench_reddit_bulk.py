@@ -0,0 +1,46 @@
+"""
+Offline throughput benchmark for bulk Reddit ingestion.
+
+Runs RedditBulkFetcher against MockReddit with a fixed per-request latency
+and compares a single worker (the old one-post-per-click path) with a pool.
+
+    python bench_reddit_bulk.py --posts 200 --latency 0.05 --workers 1 4 8 16
+"""
+import time
+import argparse
+
+from reddit_bulk import MockReddit, RedditBulkFetcher
+
+
+def run(posts, latency, workers, include_comments, requests_per_minute):
+    urls = [f"https://www.reddit.com/r/mock/comments/p{i}/post_{i}/" for i in range(posts)]
+    fetcher = RedditBulkFetcher(
+        lambda: MockReddit(latency=latency),
+        max_workers=workers,
+        requests_per_minute=requests_per_minute,
+        include_comments=include_comments,
+    )
+    start = time.perf_counter()
+    records, errors = fetcher.fetch_urls(urls)
+    elapsed = time.perf_counter() - start
+    return len(records), len(errors), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per mock API request")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--comments", action="store_true", help="also fetch comment trees")
+    parser.add_argument("--rpm", type=float, default=1e9,
+                        help="rate limit in requests/minute (default: unlimited)")
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'records':>8} {'errors':>7} {'seconds':>9} {'posts/s':>9}")
+    for workers in args.workers:
+        count, errors, elapsed = run(args.posts, args.latency, workers, args.comments, args.rpm)
+        print(f"{workers:>8} {count:>8} {errors:>7} {elapsed:>9.2f} {count / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
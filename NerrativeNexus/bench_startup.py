@@ -0,0 +1,85 @@
+"""
+Startup and rerun latency benchmark for the Streamlit app.
+
+Each app version is run headless with streamlit's AppTest in a fresh
+subprocess and a scratch copy of data/, timing only the script body. The
+first run includes imports and resource initialisation; later runs measure a
+plain rerun (what happens on every widget interaction).
+
+    python bench_startup.py                      # current app.py
+    git show <old-commit>:NerrativeNexus/app.py > app_old.py
+    python bench_startup.py app_old.py app.py --reruns 30
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+import statistics
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def child(app_path, reruns):
+    import time
+    from streamlit.testing.v1 import AppTest
+    from streamlit.runtime.scriptrunner import script_runner
+
+    # Time only the script body: AppTest.run() itself polls for results,
+    # which would swamp the sub-100ms reruns being measured.
+    script_times = []
+
+    def timed_exec(code, namespace):
+        start = time.perf_counter()
+        try:
+            exec(code, namespace)
+        finally:
+            script_times.append(time.perf_counter() - start)
+
+    script_runner.exec = timed_exec
+
+    at = AppTest.from_file(app_path, default_timeout=300)
+    for _ in range(reruns + 1):
+        at.run()
+    print(json.dumps({"first": script_times[0], "reruns": script_times[1:],
+                      "exceptions": [e.value for e in at.exception]}))
+
+
+def measure(app_path, reruns):
+    app_path = os.path.abspath(app_path)
+    with tempfile.TemporaryDirectory() as workdir:
+        shutil.copytree(os.path.join(HERE, "data"), os.path.join(workdir, "data"))
+        env = dict(os.environ, PYTHONPATH=HERE + os.pathsep + os.environ.get("PYTHONPATH", ""))
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", app_path, "--reruns", str(reruns)],
+            cwd=workdir, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("apps", nargs="*", default=[os.path.join(HERE, "app.py")])
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.child, args.reruns)
+
+    print(f"{'app':<24} {'first run':>10} {'rerun p50':>10} {'rerun p95':>10}")
+    for app in args.apps:
+        result = measure(app, args.reruns)
+        reruns = sorted(result["reruns"])
+        p95 = reruns[min(len(reruns) - 1, int(len(reruns) * 0.95))]
+        print(f"{os.path.basename(app):<24} {result['first'] * 1000:>8.0f}ms "
+              f"{statistics.median(reruns) * 1000:>8.2f}ms {p95 * 1000:>8.2f}ms")
+        if result["exceptions"]:
+            print(f"   ⚠️ exceptions: {result['exceptions']}")
+
+
+if __name__ == "__main__":
+    main()
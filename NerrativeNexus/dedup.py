@@ -0,0 +1,273 @@
+import re
+import json
+import hashlib
+import threading
+import unicodedata
+from collections import Counter
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import numpy as np
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dedup_hashes (
+    hash       BLOB PRIMARY KEY,
+    record_id  TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS dedup_urls (
+    url        TEXT PRIMARY KEY,
+    record_id  TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS dedup_lsh (
+    band       INTEGER NOT NULL,
+    bucket     BLOB NOT NULL,
+    record_id  TEXT NOT NULL,
+    PRIMARY KEY (band, bucket, record_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS dedup_signatures (
+    record_id  TEXT PRIMARY KEY,
+    signature  BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "ref", "share_id"})
+TRACKING_PREFIXES = ("utm_",)
+_NON_WORD = re.compile(r"[^\w]+")
+
+# MinHash / LSH parameters: 128 permutations in 16 bands of 8 rows put the
+# LSH candidate threshold near Jaccard 0.7; candidates are then confirmed
+# against NEAR_DUPLICATE_THRESHOLD using the stored signatures.
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+MIN_SHINGLES = 10
+NEAR_DUPLICATE_THRESHOLD = 0.8
+# Bump when keys change; the index is then rebuilt from the store
+DEDUP_VERSION = "3"
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 2 ** 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 2 ** 32, size=NUM_PERM, dtype=np.uint64)
+
+
+def normalize_text(text):
+    """Case-fold, NFKC-normalize and collapse punctuation/whitespace"""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def row_identity(record):
+    """
+    ``source/filename/position`` for a record that is one row (CSV) or chunk
+    (PDF/Word) of a file, else None. Different rows often share short texts
+    ("Great product", "Thanks!"), so for these only the same row of the same
+    file counts as a duplicate.
+    """
+    metadata = record.get("metadata") or {}
+    position = metadata.get("row", metadata.get("chunk_index"))
+    if position is None:
+        return None
+    return f"{record.get('source')}/{metadata.get('filename')}/{position}"
+
+
+def exact_key(record):
+    """Normalized-text hash, scoped to the row identity for file rows and chunks"""
+    identity = row_identity(record)
+    text = normalize_text(record.get("text"))
+    if identity is not None:
+        text = identity + "\0" + text
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def normalize_url(url):
+    """
+    Canonical form of a URL: lower-case host without www, no fragment,
+    tracking params or trailing slash. http and https are treated as the same
+    (both become https); other schemes are kept.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [(k, v) for k, v in parse_qsl(parts.query)
+             if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)]
+    path = parts.path.rstrip("/") or "/"
+    scheme = parts.scheme.lower()
+    if scheme in ("", "http"):
+        scheme = "https"
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ""))
+
+
+def minhash_signature(text):
+    """MinHash signature over word 5-gram shingles (None for very short texts)"""
+    tokens = normalize_text(text).split()
+    if len(tokens) < SHINGLE_SIZE + MIN_SHINGLES - 1:
+        return None
+    shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles),
+        dtype=np.uint64, count=len(shingles),
+    )
+    # a < 2**32 and h < 2**32, so a * h + b cannot overflow uint64
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def _band_keys(signature):
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        yield band, hashlib.blake2b(chunk, digest_size=8).digest()
+
+
+class DedupIndex:
+    """
+    Persistent duplicate index stored next to the records in SQLite.
+
+    Exact duplicates are found by primary-key lookups on the normalized-text
+    hash and the canonical ``metadata.url``; near duplicates (reposted news
+    copy, lightly edited text) by MinHash LSH buckets. The index is derived
+    from the ``RecordStore`` and catches up from it with ``catch_up``.
+
+    File rows and chunks (see ``row_identity``) are only exact duplicates of
+    the same row of the same file, and are not matched as near duplicates.
+
+    SQLite access goes through the store's lock. ``lock`` serializes
+    check-then-append across threads (``save_deduplicated``), so two sessions
+    sharing the index cannot both accept the same record.
+    """
+
+    def __init__(self, store, near_duplicates=True):
+        self.store = store
+        self.conn = store.conn
+        self.near_duplicates = near_duplicates
+        self.lock = threading.RLock()
+        with self.store._lock, self.conn:
+            self.conn.executescript(SCHEMA)
+            if self.store.get_meta("dedup_version") != DEDUP_VERSION:
+                for table in ("dedup_hashes", "dedup_urls", "dedup_lsh", "dedup_signatures"):
+                    self.conn.execute(f"DELETE FROM {table}")
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dedup_rowid', '0')")
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dedup_version', ?)",
+                                  (DEDUP_VERSION,))
+
+    def _signature(self, record):
+        if not self.near_duplicates or row_identity(record) is not None:
+            return None
+        return minhash_signature(record.get("text"))
+
+    def check(self, record, signature=None):
+        """Return ``(reason, existing_id)`` if ``record`` is already stored, else ``None``"""
+        with self.store._lock:
+            url = normalize_url((record.get("metadata") or {}).get("url"))
+            if url:
+                row = self.conn.execute("SELECT record_id FROM dedup_urls WHERE url = ?", (url,)).fetchone()
+                if row:
+                    return "url", row[0]
+            row = self.conn.execute("SELECT record_id FROM dedup_hashes WHERE hash = ?",
+                                    (exact_key(record),)).fetchone()
+            if row:
+                return "exact", row[0]
+            if signature is None:
+                signature = self._signature(record)
+            if signature is not None:
+                match = self._near_match(signature)
+                if match:
+                    return "near", match
+            return None
+
+    def _near_match(self, signature):
+        candidates = set()
+        for band, bucket in _band_keys(signature):
+            rows = self.conn.execute("SELECT record_id FROM dedup_lsh WHERE band = ? AND bucket = ?", (band, bucket))
+            candidates.update(r[0] for r in rows)
+        for record_id in candidates:
+            row = self.conn.execute("SELECT signature FROM dedup_signatures WHERE record_id = ?",
+                                    (record_id,)).fetchone()
+            if row and np.mean(np.frombuffer(row[0], dtype=np.uint32) == signature) >= NEAR_DUPLICATE_THRESHOLD:
+                return record_id
+        return None
+
+    def _index(self, record):
+        record_id = str(record["id"])
+        url = normalize_url((record.get("metadata") or {}).get("url"))
+        if url:
+            self.conn.execute("INSERT OR IGNORE INTO dedup_urls (url, record_id) VALUES (?, ?)", (url, record_id))
+        self.conn.execute("INSERT OR IGNORE INTO dedup_hashes (hash, record_id) VALUES (?, ?)",
+                          (exact_key(record), record_id))
+        signature = self._signature(record)
+        if signature is not None:
+            self.conn.execute("INSERT OR REPLACE INTO dedup_signatures (record_id, signature) VALUES (?, ?)",
+                              (record_id, signature.tobytes()))
+            self.conn.executemany("INSERT OR IGNORE INTO dedup_lsh (band, bucket, record_id) VALUES (?, ?, ?)",
+                                  [(band, bucket, record_id) for band, bucket in _band_keys(signature)])
+
+    def catch_up(self, batch_size=1000):
+        """Index store rows added since the last catch-up; returns how many were indexed"""
+        with self.store._lock:
+            last = int(self.store.get_meta("dedup_rowid", 0))
+            indexed = 0
+            while True:
+                rows = self.conn.execute("SELECT rowid, record FROM records WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                                         (last, batch_size)).fetchall()
+                if not rows:
+                    return indexed
+                with self.conn:
+                    for rowid, raw in rows:
+                        self._index(json.loads(raw))
+                    last = rows[-1][0]
+                    self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dedup_rowid', ?)",
+                                      (str(last),))
+                indexed += len(rows)
+
+    def filter_new(self, records):
+        """
+        Split ``records`` into those not seen before and a Counter of skipped
+        records by reason (``url``, ``exact``, ``near``). Duplicates within
+        the batch itself are caught too, using in-memory LSH buckets so each
+        signature is only compared with candidates sharing a band.
+        """
+        kept, skipped = [], Counter()
+        batch_urls, batch_hashes, batch_signatures = set(), set(), []
+        batch_buckets = {}
+        for record in records:
+            url = normalize_url((record.get("metadata") or {}).get("url"))
+            digest = exact_key(record)
+            if url and url in batch_urls:
+                skipped["url"] += 1
+                continue
+            if digest in batch_hashes:
+                skipped["exact"] += 1
+                continue
+            signature = self._signature(record)
+            duplicate = self.check(record, signature)
+            if duplicate:
+                skipped[duplicate[0]] += 1
+                continue
+            if signature is not None:
+                keys = list(_band_keys(signature))
+                candidates = {i for key in keys for i in batch_buckets.get(key, ())}
+                if any(np.mean(batch_signatures[i] == signature) >= NEAR_DUPLICATE_THRESHOLD for i in candidates):
+                    skipped["near"] += 1
+                    continue
+                for key in keys:
+                    batch_buckets.setdefault(key, []).append(len(batch_signatures))
+                batch_signatures.append(signature)
+            if url:
+                batch_urls.add(url)
+            batch_hashes.add(digest)
+            kept.append(record)
+        return kept, skipped
+
+
+def save_deduplicated(log, store, dedup, records):
+    """Drop duplicates, append the rest to the log and update the indexes; returns (saved, skipped)"""
+    with dedup.lock:
+        dedup.catch_up()
+        kept, skipped = dedup.filter_new(records)
+        saved = log.extend(kept)
+        store.sync(log)
+        dedup.catch_up()
+    return saved, skipped
@@ -0,0 +1,189 @@
+"""
+Streaming export of stored records to CSV, JSONL and Parquet.
+
+Records are read from the store in chunks and written as they arrive, so an
+export never holds the whole corpus in memory. CSV and Parquet share one
+stable flattened schema: the known ``metadata.*`` fields get their own
+columns and anything else is kept as JSON in ``metadata.extra``. Incremental
+exports only include records added since the previous completed export of
+that format and filters; the marker is saved only once the export has been
+delivered (written by the CLI, downloaded in the app).
+
+    python exporter.py parquet --output corpus.parquet
+    python exporter.py jsonl --incremental --output new_records.jsonl
+"""
+import csv
+import json
+import argparse
+from importlib.util import find_spec
+
+PARQUET_AVAILABLE = find_spec("pyarrow") is not None
+
+FORMATS = {"CSV": "csv", "JSONL": "jsonl", "Parquet": "parquet"}
+MIME_TYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson", "parquet": "application/vnd.apache.parquet"}
+
+RECORD_FIELDS = ["id", "source", "author", "timestamp", "text"]
+METADATA_FIELDS = {
+    "language": "string",
+    "likes": "int64",
+    "rating": "float64",
+    "url": "string",
+    "subreddit": "string",
+    "num_comments": "int64",
+    "source_name": "string",
+    "filename": "string",
+    "source_type": "string",
+    "file_type": "string",
+    "content_length": "int64",
+    "document_id": "string",
+    "chunk_index": "int64",
+    "first_page": "int64",
+    "last_page": "int64",
+    "first_paragraph": "int64",
+    "last_paragraph": "int64",
+    "row": "int64",
+}
+COLUMNS = RECORD_FIELDS + [f"metadata.{name}" for name in METADATA_FIELDS] + ["metadata.extra"]
+
+
+def flatten_record(record):
+    """Map a record onto the fixed export columns"""
+    row = {field: record.get(field) for field in RECORD_FIELDS}
+    metadata = dict(record.get("metadata") or {})
+    for name, kind in METADATA_FIELDS.items():
+        value = metadata.pop(name, None)
+        if value is not None and kind == "int64":
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                metadata[name] = value
+                value = None
+        elif value is not None and kind == "float64":
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                metadata[name] = value
+                value = None
+        elif value is not None and kind == "string":
+            value = str(value)
+        row[f"metadata.{name}"] = value
+    row["metadata.extra"] = json.dumps(metadata, ensure_ascii=False) if metadata else None
+    return row
+
+
+def parquet_schema():
+    import pyarrow as pa
+
+    types = {"string": pa.string(), "int64": pa.int64(), "float64": pa.float64()}
+    fields = [pa.field(name, pa.string()) for name in RECORD_FIELDS]
+    fields += [pa.field(f"metadata.{name}", types[kind]) for name, kind in METADATA_FIELDS.items()]
+    fields.append(pa.field("metadata.extra", pa.string()))
+    return pa.schema(fields)
+
+
+class _CSVWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, records):
+        self.writer.writerows(flatten_record(r) for r in records)
+
+    def close(self):
+        self.file.close()
+
+
+class _JSONLWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, records):
+        self.file.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path):
+        if not PARQUET_AVAILABLE:
+            raise Exception("pyarrow not installed. Install with: pip install pyarrow")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = parquet_schema()
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, records):
+        rows = [flatten_record(r) for r in records]
+        columns = {name: [row[name] for row in rows] for name in COLUMNS}
+        self.writer.write_table(self.pa.table(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"csv": _CSVWriter, "jsonl": _JSONLWriter, "parquet": _ParquetWriter}
+
+
+def export_marker(fmt, **filters):
+    """Meta key of the incremental export marker for ``fmt`` with these filters"""
+    filters = {name: value for name, value in filters.items() if value is not None}
+    if not filters:
+        return f"export_rowid:{fmt}"
+    return f"export_rowid:{fmt}:" + json.dumps(filters, sort_keys=True, default=str)
+
+
+def export_records(store, fmt, path, incremental=False, chunk_size=5000, **filters):
+    """
+    Stream records from ``store`` into ``path`` as ``fmt`` (csv, jsonl or
+    parquet), one chunk of ``chunk_size`` records at a time. With
+    ``incremental`` only records added since the last completed incremental
+    export of this format and filters are written.
+    Returns ``(records exported, last rowid)``; pass the rowid to
+    ``commit_export`` once the export has been delivered.
+    """
+    after = int(store.get_meta(export_marker(fmt, **filters), 0)) if incremental else 0
+    writer = WRITERS[fmt](path)
+    exported, last = 0, after
+    try:
+        for last, records in store.iter_batches(chunk_size, after_rowid=after, **filters):
+            writer.write(records)
+            exported += len(records)
+    finally:
+        writer.close()
+    return exported, last
+
+
+def commit_export(store, fmt, last_rowid, **filters):
+    """Move the incremental marker of ``fmt`` and these filters past ``last_rowid``"""
+    marker = export_marker(fmt, **filters)
+    if last_rowid > int(store.get_meta(marker, 0)):
+        store.set_meta(marker, last_rowid)
+
+
+def main():
+    from record_store import open_record_store
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("format", choices=sorted(WRITERS))
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--incremental", action="store_true", help="only records added since the last export")
+    parser.add_argument("--source", default=None)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--data-dir", default="data")
+    args = parser.parse_args()
+
+    log, store = open_record_store(args.data_dir)
+    filters = {"source": args.source} if args.source else {}
+    count, last = export_records(store, args.format, args.output, args.incremental, args.chunk_size, **filters)
+    if args.incremental:
+        commit_export(store, args.format, last, **filters)
+    log.close()
+    print(f"✅ Exported {count:,} records to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
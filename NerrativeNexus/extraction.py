@@ -0,0 +1,144 @@
+"""
+Streaming text extraction for large PDF and Word uploads.
+
+PDF pages are extracted in a process pool, a few pages per task, and yielded
+back in page order. At most ``max_in_flight`` tasks are outstanding at any
+time, so peak memory is bounded by a handful of pages regardless of document
+size. ``iter_chunks`` groups the page stream into text chunks that can be
+written to the store one by one.
+"""
+import os
+import shutil
+import tempfile
+from collections import deque
+from contextlib import contextmanager
+from importlib.util import find_spec
+from concurrent.futures import ProcessPoolExecutor
+
+# Probe without importing; pdfplumber and python-docx are only loaded when a
+# document is actually read.
+PDF_AVAILABLE = find_spec("pdfplumber") is not None
+DOCX_AVAILABLE = find_spec("docx") is not None
+
+
+PAGES_PER_TASK = 8
+CHUNK_CHARS = 50_000
+
+
+@contextmanager
+def as_path(source, suffix=""):
+    """Yield a filesystem path for ``source``, spooling file objects to a temp file"""
+    if isinstance(source, (str, os.PathLike)):
+        yield os.fspath(source)
+        return
+    source.seek(0)
+    tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+    try:
+        with tmp:
+            shutil.copyfileobj(source, tmp, length=1024 * 1024)
+        yield tmp.name
+    finally:
+        os.unlink(tmp.name)
+
+
+def _extract_pages(path, start, stop):
+    """Worker: extract text of pages [start, stop) from the PDF at ``path``"""
+    import pdfplumber
+
+    pages = []
+    with pdfplumber.open(path, pages=list(range(start + 1, stop + 1))) as pdf:
+        for offset, page in enumerate(pdf.pages):
+            pages.append((start + offset, page.extract_text() or ""))
+            page.close()
+    return pages
+
+
+def pdf_page_count(path):
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def iter_pdf_pages(source, workers=None, pages_per_task=PAGES_PER_TASK, max_in_flight=None, on_progress=None):
+    """
+    Yield ``(page_number, text)`` for every page of a PDF, in order.
+
+    ``source`` may be a path or a file object (e.g. a Streamlit upload).
+    ``on_progress(done_pages, total_pages)`` is called as pages arrive.
+    """
+    if not PDF_AVAILABLE:
+        raise Exception("pdfplumber not installed. Install with: pip install pdfplumber")
+
+    with as_path(source, suffix=".pdf") as path:
+        total = pdf_page_count(path)
+        ranges = [(start, min(start + pages_per_task, total)) for start in range(0, total, pages_per_task)]
+        workers = workers or min(os.cpu_count() or 1, len(ranges)) or 1
+
+        if workers == 1 or len(ranges) <= 1:
+            for start, stop in ranges:
+                yield from _extract_pages(path, start, stop)
+                if on_progress:
+                    on_progress(stop, total)
+            return
+
+        max_in_flight = max_in_flight or workers * 2
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            tasks = iter(ranges)
+            for start, stop in tasks:
+                pending.append(pool.submit(_extract_pages, path, start, stop))
+                if len(pending) >= max_in_flight:
+                    break
+            while pending:
+                pages = pending.popleft().result()
+                next_task = next(tasks, None)
+                if next_task:
+                    pending.append(pool.submit(_extract_pages, path, *next_task))
+                yield from pages
+                if on_progress:
+                    on_progress(pages[-1][0] + 1, total)
+
+
+def iter_docx_paragraphs(source):
+    """Yield the text of each paragraph in a Word document"""
+    if not DOCX_AVAILABLE:
+        raise Exception("python-docx not installed. Install with: pip install python-docx")
+    import docx
+
+    document = docx.Document(source)
+    for paragraph in document.paragraphs:
+        yield paragraph.text
+
+
+def iter_chunks(parts, chunk_chars=CHUNK_CHARS):
+    """
+    Group a stream of text parts (pages or paragraphs) into chunks of about
+    ``chunk_chars`` characters. Yields ``(first_part, last_part, text)``;
+    parts are joined with newlines and never split.
+    """
+    buffer, size, first, last = [], 0, 0, 0
+    for number, text in enumerate(parts):
+        if isinstance(text, tuple):
+            number, text = text
+        if buffer and size + len(text) > chunk_chars:
+            yield first, last, "\n".join(buffer)
+            buffer, size = [], 0
+        if not buffer:
+            first = number
+        buffer.append(text)
+        size += len(text) + 1
+        last = number
+    if buffer:
+        yield first, last, "\n".join(buffer)
+
+
+def iter_document_chunks(source, file_type, chunk_chars=CHUNK_CHARS, on_progress=None, workers=None):
+    """Chunk a PDF (by page) or Word document (by paragraph) without building one large string"""
+    if file_type == "pdf":
+        parts = ((n, text) for n, text in iter_pdf_pages(source, workers=workers, on_progress=on_progress) if text)
+    elif file_type == "docx":
+        parts = iter_docx_paragraphs(source)
+    else:
+        raise ValueError(f"Unsupported document type: {file_type}")
+    yield from iter_chunks(parts, chunk_chars)
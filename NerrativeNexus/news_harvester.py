@@ -0,0 +1,154 @@
+"""
+Paginated, concurrent NewsAPI harvester.
+
+Pages through /v2/everything at the maximum page size for several queries at
+once over a single pooled aiohttp session, retrying timeouts, 429s and 5xx
+responses with exponential backoff, and hands each page of records to a
+``sink`` as soon as it arrives so nothing accumulates in memory.
+
+    python news_harvester.py "climate change" "artificial intelligence" --max 300
+    python news_harvester.py ai --base-url http://127.0.0.1:8765/v2/everything --api-key test
+"""
+import os
+import random
+import asyncio
+import argparse
+from collections import Counter
+from importlib.util import find_spec
+
+from records import create_news_record
+
+AIOHTTP_AVAILABLE = find_spec("aiohttp") is not None
+
+NEWS_API_URL = "https://newsapi.org/v2/everything"
+MAX_PAGE_SIZE = 100
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class NewsAPIError(Exception):
+    pass
+
+
+class NewsHarvester:
+    def __init__(self, api_key, base_url=NEWS_API_URL, concurrency=4, timeout=15.0,
+                 max_retries=4, backoff=0.5, page_size=MAX_PAGE_SIZE):
+        if not AIOHTTP_AVAILABLE:
+            raise NewsAPIError("aiohttp not installed. Install with: pip install aiohttp")
+        self.api_key = api_key
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.page_size = min(page_size, MAX_PAGE_SIZE)
+
+    async def _get_page(self, session, query, page):
+        import aiohttp
+
+        params = {
+            "q": query,
+            "sortBy": "publishedAt",
+            "pageSize": self.page_size,
+            "page": page,
+        }
+        headers = {"X-Api-Key": self.api_key}
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with session.get(self.base_url, params=params, headers=headers) as response:
+                    if response.status in RETRY_STATUSES and attempt < self.max_retries:
+                        retry_after = response.headers.get("Retry-After")
+                        delay = float(retry_after) if retry_after and retry_after.isdigit() else None
+                        await self._sleep(attempt, delay)
+                        continue
+                    payload = await response.json(content_type=None)
+                    if payload.get("status") == "error":
+                        # Free plans stop at 100 results; treat that as the end of the query
+                        if payload.get("code") == "maximumResultsReached":
+                            return {"articles": [], "totalResults": 0}
+                        raise NewsAPIError(f"{payload.get('code')}: {payload.get('message')}")
+                    return payload
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise NewsAPIError(f"Request for '{query}' page {page} failed: {e}")
+                await self._sleep(attempt)
+        raise NewsAPIError(f"Request for '{query}' page {page} failed after {self.max_retries} retries")
+
+    async def _sleep(self, attempt, delay=None):
+        if delay is None:
+            delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+        await asyncio.sleep(delay)
+
+    async def _harvest_query(self, session, semaphore, query, max_articles, sink):
+        harvested, page = 0, 1
+        while harvested < max_articles:
+            async with semaphore:
+                payload = await self._get_page(session, query, page)
+            articles = payload.get("articles") or []
+            if not articles:
+                break
+            records = [create_news_record(a) for a in articles[:max_articles - harvested]]
+            sink(records)
+            harvested += len(records)
+            if harvested >= (payload.get("totalResults") or 0) or len(articles) < self.page_size:
+                break
+            page += 1
+        return harvested
+
+    async def harvest_async(self, queries, max_articles=300, sink=None):
+        """Harvest up to ``max_articles`` per query; returns {query: count or exception}"""
+        import aiohttp
+
+        sink = sink or (lambda records: None)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            results = await asyncio.gather(
+                *(self._harvest_query(session, semaphore, q, max_articles, sink) for q in queries),
+                return_exceptions=True,
+            )
+        return dict(zip(queries, results))
+
+    def harvest(self, queries, max_articles=300, sink=None):
+        return asyncio.run(self.harvest_async(queries, max_articles, sink))
+
+
+def main():
+    from dotenv import load_dotenv
+    from record_store import open_record_store
+    from dedup import DedupIndex, save_deduplicated
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("queries", nargs="+")
+    parser.add_argument("--max", type=int, default=300, help="maximum articles per query")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--base-url", default=NEWS_API_URL)
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--data-dir", default="data")
+    args = parser.parse_args()
+
+    load_dotenv()
+    api_key = args.api_key or os.getenv("NEWS_API_KEY")
+    if not api_key:
+        parser.error("News API key not found. Pass --api-key or set NEWS_API_KEY.")
+
+    log, store = open_record_store(args.data_dir)
+    dedup = DedupIndex(store)
+    skipped = Counter()
+
+    def sink(records):
+        skipped.update(save_deduplicated(log, store, dedup, records)[1])
+
+    harvester = NewsHarvester(api_key, base_url=args.base_url, concurrency=args.concurrency)
+    for query, result in harvester.harvest(args.queries, args.max, sink).items():
+        if isinstance(result, Exception):
+            print(f"❌ {query}: {result}")
+        else:
+            print(f"✅ {query}: {result} articles")
+    if skipped:
+        print(f"⏭️ Skipped {sum(skipped.values())} duplicates: {dict(skipped)}")
+    log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Local stand-in for NewsAPI's /v2/everything endpoint.
+
+Serves deterministic fake articles with real pagination so news_harvester.py
+can be exercised and timed offline. Every ``--fail-every``-th request answers
+with a 429 or 503 to exercise retry/backoff.
+
+    python news_stub_server.py --port 8765 --total 500 --latency 0.1
+"""
+import json
+import time
+import argparse
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(total, latency, fail_every):
+    counter = {"requests": 0}
+    lock = threading.Lock()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, payload, headers=None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path != "/v2/everything":
+                return self._send(404, {"status": "error", "code": "notFound", "message": parsed.path})
+
+            with lock:
+                counter["requests"] += 1
+                n = counter["requests"]
+            time.sleep(latency)
+            if fail_every and n % fail_every == 0:
+                status = 429 if n % (2 * fail_every) == 0 else 503
+                return self._send(status, {"status": "error", "code": "rateLimited", "message": "stub"},
+                                  {"Retry-After": "0"})
+
+            params = parse_qs(parsed.query)
+            if "X-Api-Key" not in self.headers and "apiKey" not in params:
+                return self._send(401, {"status": "error", "code": "apiKeyMissing", "message": "no key"})
+
+            query = params.get("q", [""])[0]
+            page_size = min(int(params.get("pageSize", ["100"])[0]), 100)
+            page = int(params.get("page", ["1"])[0])
+            start = (page - 1) * page_size
+            articles = [
+                {
+                    "source": {"id": None, "name": "Stub Times"},
+                    "author": f"author {i % 7}",
+                    "title": f"{query} headline {i}",
+                    "description": f"Stub description {i} about {query}.",
+                    "url": f"https://stub.example/{query.replace(' ', '-')}/{i}",
+                    "publishedAt": f"2024-01-{1 + i % 28:02d}T12:00:00Z",
+                }
+                for i in range(start, min(start + page_size, total))
+            ]
+            self._send(200, {"status": "ok", "totalResults": total, "articles": articles})
+
+    return StubHandler
+
+
+def serve(port=8765, total=500, latency=0.05, fail_every=0):
+    """Start the stub server in a background thread and return it"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(total, latency, fail_every))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--total", type=int, default=500, help="totalResults reported per query")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--fail-every", type=int, default=0, help="fail every Nth request (0 = never)")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args.total, args.latency, args.fail_every))
+    print(f"📰 NewsAPI stub listening on http://127.0.0.1:{args.port}/v2/everything")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import os
+import uuid
+from itertools import chain
+
+import pandas as pd
+
+from extraction import DOCX_AVAILABLE, PDF_AVAILABLE, iter_docx_paragraphs, iter_pdf_pages, iter_document_chunks
+from records import create_file_record
+
+
+def supported_types():
+    """File extensions that can be read with the installed optional dependencies"""
+    types = ["txt", "csv"]
+    if DOCX_AVAILABLE:
+        types.append("docx")
+    if PDF_AVAILABLE:
+        types.append("pdf")
+    return types
+
+
+def file_extension(filename):
+    return os.path.splitext(filename)[1].lower().replace(".", "")
+
+
+def read_txt(file):
+    """Read text file"""
+    try:
+        return file.read().decode("utf-8")
+    except UnicodeDecodeError:
+        file.seek(0)
+        try:
+            return file.read().decode("latin-1")
+        except Exception as e:
+            raise Exception(f"Could not decode text file: {e}")
+
+
+def read_csv(file):
+    """Read CSV file and convert to string"""
+    try:
+        df = pd.read_csv(file)
+        return df.to_string()
+    except Exception as e:
+        raise Exception(f"Error reading CSV: {e}")
+
+
+def read_csv_preview(file, nrows=5):
+    """Read only the first rows of a CSV to offer column choices"""
+    preview = pd.read_csv(file, nrows=nrows)
+    file.seek(0)
+    return preview
+
+
+def guess_text_column(preview):
+    """Pick the string column with the longest average value"""
+    text_columns = [c for c in preview.columns if pd.api.types.is_string_dtype(preview[c])]
+    if not text_columns:
+        return preview.columns[0]
+    return max(text_columns, key=lambda c: preview[c].astype(str).str.len().mean())
+
+
+def iter_csv_records(file, filename, text_column, metadata_columns=(), chunksize=10_000, source_type="csv_row"):
+    """
+    Stream a CSV in chunks of ``chunksize`` rows and yield one list of
+    records per chunk: one record per non-empty row of ``text_column``, with
+    the chosen ``metadata_columns`` under ``metadata.fields``. Only one chunk
+    is held in memory at a time.
+    """
+    metadata_columns = [c for c in metadata_columns if c != text_column]
+    usecols = [text_column] + metadata_columns
+    row_offset = 0
+    for chunk in pd.read_csv(file, usecols=usecols, chunksize=chunksize, dtype=str, keep_default_na=False):
+        fields = chunk[metadata_columns].to_dict("records") if metadata_columns else None
+        records = []
+        for i, text in enumerate(chunk[text_column]):
+            if not text.strip():
+                continue
+            extra = {"row": row_offset + i}
+            if fields:
+                extra["fields"] = fields[i]
+            records.append(create_file_record(filename, source_type, "csv", text, extra))
+        row_offset += len(chunk)
+        yield records
+
+
+def read_docx(file):
+    """Read Word document"""
+    try:
+        return "\n".join(iter_docx_paragraphs(file))
+    except Exception as e:
+        raise Exception(f"Error reading Word document: {e}")
+
+
+def read_pdf(file):
+    """Read PDF file"""
+    try:
+        text = "".join(page_text + "\n" for _, page_text in iter_pdf_pages(file) if page_text)
+        return text if text.strip() else "No text could be extracted from this PDF."
+    except Exception as e:
+        raise Exception(f"Error reading PDF: {e}")
+
+
+def iter_document_records(file, filename, file_type, source_type="file_upload", on_progress=None, workers=None):
+    """
+    Yield records for a PDF/Word document, one per text chunk.
+
+    A document that fits in one chunk becomes a single plain record; longer
+    ones share a ``document_id`` and carry ``chunk_index`` and the page or
+    paragraph range of each chunk.
+    """
+    document_id = str(uuid.uuid4())
+    part_name = "page" if file_type == "pdf" else "paragraph"
+    chunks = iter_document_chunks(file, file_type, on_progress=on_progress, workers=workers)
+
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+    if second is None:
+        yield create_file_record(filename, source_type, file_type, first[2])
+        return
+
+    for chunk_index, (first_part, last_part, text) in enumerate(chain((first, second), chunks)):
+        yield create_file_record(filename, source_type, file_type, text, {
+            "document_id": document_id,
+            "chunk_index": chunk_index,
+            f"first_{part_name}": first_part + 1,
+            f"last_{part_name}": last_part + 1,
+        })
+
+
+def iter_file_records(file, filename, source_type="file_upload", on_progress=None, workers=None):
+    """Read any supported file and yield its records"""
+    file_type = file_extension(filename)
+    if file_type in ("docx", "pdf"):
+        yield from iter_document_records(file, filename, file_type, source_type, on_progress, workers)
+        return
+    if file_type == "txt":
+        content = read_txt(file)
+    elif file_type == "csv":
+        content = read_csv(file)
+    else:
+        raise Exception(f"Unsupported file type: .{file_type}")
+    if content and content.strip():
+        yield create_file_record(filename, source_type, file_type, content)
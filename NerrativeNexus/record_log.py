@@ -0,0 +1,286 @@
+import os
+import json
+import time
+import atexit
+import threading
+
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_FILE = "offsets.idx"
+MIGRATION_MARKER = "MIGRATED"
+
+
+def _segment_name(number):
+    return f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}"
+
+
+class RecordLog:
+    """
+    Append-only JSONL record log.
+
+    Records are written as one JSON document per line into numbered segment
+    files. Every append also writes an ``id -> (segment, offset, length)``
+    entry to ``offsets.idx`` so single records can be read back without a scan.
+    Writes are flushed to the OS on every append and fsynced in batches
+    (every ``sync_every`` records or ``sync_interval`` seconds).
+
+    On open, anything after the last complete line of the newest segment
+    (a torn write from a crash) is truncated instead of discarding the store.
+    """
+
+    def __init__(self, root, segment_bytes=64 * 1024 * 1024, sync_every=32, sync_interval=1.0):
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self.segment_bytes = segment_bytes
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+
+        self.recovered_bytes = 0
+        self._lock = threading.RLock()
+        self._offsets = {}
+        self._count = 0
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+        self._load_index()
+        self._recover_tail()
+
+        self._segment = max(self._segments(), default=0)
+        self._data = open(self._segment_path(self._segment), "ab")
+        self._end = self._data.tell()
+        self._index = open(os.path.join(root, INDEX_FILE), "ab")
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Opening / recovery
+    # ------------------------------------------------------------------
+    def _segment_path(self, number):
+        return os.path.join(self.root, _segment_name(number))
+
+    def _segments(self):
+        numbers = []
+        for name in os.listdir(self.root):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                try:
+                    numbers.append(int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(numbers)
+
+    def _load_index(self):
+        """Read offsets.idx, ignoring torn lines and entries past the end of data"""
+        index_path = os.path.join(self.root, INDEX_FILE)
+        self._indexed_end = (0, 0)
+        if not os.path.exists(index_path):
+            return
+
+        sizes = {n: os.path.getsize(self._segment_path(n)) for n in self._segments()}
+        valid_bytes = 0
+        with open(index_path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                parts = raw.rstrip(b"\n").split(b"\t")
+                if len(parts) != 4:
+                    break
+                try:
+                    record_id = parts[0].decode("utf-8")
+                    segment, offset, length = int(parts[1]), int(parts[2]), int(parts[3])
+                except ValueError:
+                    break
+                if offset + length > sizes.get(segment, -1):
+                    break
+                if record_id:
+                    self._offsets[record_id] = (segment, offset, length)
+                self._count += 1
+                self._indexed_end = (segment, offset + length)
+                valid_bytes += len(raw)
+
+        if valid_bytes != os.path.getsize(index_path):
+            with open(index_path, "r+b") as f:
+                f.truncate(valid_bytes)
+
+    def _recover_tail(self):
+        """Index records written after the last index entry and cut off a torn tail"""
+        segment, start = self._indexed_end
+        entries = []
+        for number in self._segments():
+            if number < segment:
+                continue
+            path = self._segment_path(number)
+            position = start if number == segment else 0
+            with open(path, "r+b") as f:
+                f.seek(position)
+                for raw in iter(f.readline, b""):
+                    record = None
+                    if raw.endswith(b"\n"):
+                        try:
+                            record = json.loads(raw)
+                        except ValueError:
+                            record = None
+                    if record is None:
+                        size = os.path.getsize(path)
+                        self.recovered_bytes += size - position
+                        f.truncate(position)
+                        break
+                    entries.append((str(record.get("id") or ""), number, position, len(raw)))
+                    position += len(raw)
+
+        if entries:
+            with open(os.path.join(self.root, INDEX_FILE), "ab") as f:
+                for record_id, number, offset, length in entries:
+                    f.write(f"{record_id}\t{number}\t{offset}\t{length}\n".encode("utf-8"))
+                    if record_id:
+                        self._offsets[record_id] = (number, offset, length)
+                    self._count += 1
+                f.flush()
+                os.fsync(f.fileno())
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def _write(self, record):
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        if self._end and self._end + len(line) > self.segment_bytes:
+            self._roll_segment()
+        offset = self._end
+        self._data.write(line)
+        self._end += len(line)
+
+        record_id = str(record.get("id") or "")
+        self._index.write(f"{record_id}\t{self._segment}\t{offset}\t{len(line)}\n".encode("utf-8"))
+        if record_id:
+            self._offsets[record_id] = (self._segment, offset, len(line))
+        self._count += 1
+        self._pending += 1
+        return self._segment, offset
+
+    def _roll_segment(self):
+        self._sync()
+        self._data.close()
+        self._segment += 1
+        self._data = open(self._segment_path(self._segment), "ab")
+        self._end = 0
+
+    def _sync(self):
+        self._data.flush()
+        os.fsync(self._data.fileno())
+        self._index.flush()
+        os.fsync(self._index.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _flush(self, force=False):
+        self._data.flush()
+        self._index.flush()
+        if force or self._pending >= self.sync_every or \
+                time.monotonic() - self._last_sync >= self.sync_interval:
+            self._sync()
+
+    def append(self, record):
+        """Append one record; returns its (segment, offset) position"""
+        with self._lock:
+            position = self._write(record)
+            self._flush()
+            return position
+
+    def extend(self, records):
+        """Append many records with a single fsync; returns the number written"""
+        written = 0
+        with self._lock:
+            for record in records:
+                self._write(record)
+                written += 1
+            if written:
+                self._flush(force=True)
+        return written
+
+    def flush(self):
+        """Force pending writes to disk"""
+        with self._lock:
+            if not self._data.closed:
+                self._flush(force=True)
+
+    def close(self):
+        with self._lock:
+            if not self._data.closed:
+                self._flush(force=True)
+                self._data.close()
+                self._index.close()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, record_id):
+        return record_id in self._offsets
+
+    def __iter__(self):
+        for record, _ in self.read_from((0, 0)):
+            yield record
+
+    def end_position(self):
+        """Position just past the last committed record"""
+        with self._lock:
+            self._data.flush()
+            return self._segment, self._end
+
+    def read_from(self, position):
+        """
+        Yield ``(record, next_position)`` for every record at or after
+        ``position``. Pass the last ``next_position`` back in to resume.
+        """
+        last_segment, last_end = self.end_position()
+        segment, offset = position
+        for number in self._segments():
+            if number < segment or number > last_segment:
+                continue
+            start = offset if number == segment else 0
+            with open(self._segment_path(number), "rb") as f:
+                f.seek(start)
+                for raw in iter(f.readline, b""):
+                    if number == last_segment and start + len(raw) > last_end:
+                        break
+                    start += len(raw)
+                    try:
+                        record = json.loads(raw)
+                    except ValueError:
+                        continue
+                    yield record, (number, start)
+
+    def get(self, record_id):
+        """Read a single record by id using the offset index"""
+        location = self._offsets.get(record_id)
+        if location is None:
+            return None
+        segment, offset, length = location
+        with self._lock:
+            self._data.flush()
+        with open(self._segment_path(segment), "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+    def migrate_json(self, json_path):
+        """
+        One-time import of the legacy ``data_store.json`` array.
+        Returns the number of migrated records (0 if already migrated).
+        """
+        marker = os.path.join(self.root, MIGRATION_MARKER)
+        if os.path.exists(marker) or not os.path.exists(json_path):
+            return 0
+
+        with open(json_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError(f"{json_path} does not contain a JSON array")
+
+        migrated = self.extend(r for r in records if isinstance(r, dict) and r.get("id") not in self)
+        with open(marker, "w", encoding="utf-8") as f:
+            f.write(f"{os.path.abspath(json_path)}\t{migrated}\n")
+        return migrated
@@ -0,0 +1,446 @@
+import os
+import re
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from record_log import RecordLog
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    rowid      INTEGER PRIMARY KEY,
+    id         TEXT NOT NULL UNIQUE,
+    source     TEXT,
+    author     TEXT,
+    timestamp  TEXT,
+    ts         REAL,
+    url        TEXT,
+    subreddit  TEXT,
+    record     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_records_source_ts ON records(source, ts);
+CREATE INDEX IF NOT EXISTS idx_records_ts ON records(ts);
+CREATE INDEX IF NOT EXISTS idx_records_url ON records(url);
+CREATE INDEX IF NOT EXISTS idx_records_subreddit_ts ON records(subreddit, ts);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# One row per scored record. Each model writes only its own columns plus
+# ``<model>_model``, the fingerprint of the model file that produced them,
+# so models are (re)scored independently.
+SCORES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    rowid            INTEGER PRIMARY KEY,
+    topic            TEXT,
+    topic_prob       REAL,
+    topic_model      TEXT,
+    sentiment        TEXT,
+    sentiment_prob   REAL,
+    sentiment_model  TEXT,
+    vader_compound   REAL,
+    vader_pos        REAL,
+    vader_neg        REAL,
+    vader_neu        REAL,
+    vader_model      TEXT,
+    scored_at        REAL
+);
+CREATE INDEX IF NOT EXISTS idx_scores_topic ON scores(topic, topic_prob);
+CREATE INDEX IF NOT EXISTS idx_scores_sentiment ON scores(sentiment, sentiment_prob);
+CREATE INDEX IF NOT EXISTS idx_scores_vader ON scores(vader_compound);
+"""
+
+VADER_FIELDS = ("vader_compound", "vader_pos", "vader_neg", "vader_neu")
+SCORE_MODELS = {
+    "topic": ("topic", "topic_prob"),
+    "sentiment": ("sentiment", "sentiment_prob"),
+    "vader": VADER_FIELDS,
+}
+SCORE_FIELDS = tuple(field for fields in SCORE_MODELS.values() for field in fields)
+
+# Contentless full-text index over record text, filled by a trigger so that
+# ignored duplicate inserts never reach it.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(text, content='');
+CREATE TRIGGER IF NOT EXISTS records_fts_insert AFTER INSERT ON records BEGIN
+    INSERT INTO records_fts (rowid, text) VALUES (new.rowid, json_extract(new.record, '$.text'));
+END;
+"""
+
+
+def fts_query(search):
+    """Turn free text into an FTS5 query that matches all words"""
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", search))
+
+
+def to_epoch(value):
+    """Convert an ISO-8601 string or datetime to a UNIX timestamp (None if unparseable)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return None
+
+
+class RecordStore:
+    """
+    SQLite index over collected records.
+
+    Holds one row per record (the full JSON plus the columns it is queried
+    by) with secondary indexes on id, source, timestamp, metadata.url and
+    metadata.subreddit. ``sync`` incrementally pulls new records from a
+    ``RecordLog`` so the log stays the append-only source of truth.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        with self.conn:
+            self._migrate_scores()
+        self.conn.executescript(SCORES_SCHEMA)
+        self.conn.commit()
+        self.has_fts = self._init_fts()
+
+    def _migrate_scores(self):
+        """
+        Convert a scores table keyed by one combined ``scorer`` string
+        ("topic:<fp>,sentiment:<fp>") to per-model fingerprint columns. A
+        model's fingerprint is only kept where its columns hold values.
+        """
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(scores)")]
+        if "scorer" not in columns:
+            return
+        self.conn.execute("ALTER TABLE scores RENAME TO scores_old")
+        for index in ("idx_scores_topic", "idx_scores_sentiment", "idx_scores_vader"):
+            self.conn.execute(f"DROP INDEX IF EXISTS {index}")
+        for statement in SCORES_SCHEMA.strip().split(";"):
+            if statement.strip():
+                self.conn.execute(statement)
+        copied = [name for name in columns if name in SCORE_FIELDS or name in ("rowid", "scored_at")]
+        self.conn.execute(f"INSERT INTO scores ({', '.join(copied)}) SELECT {', '.join(copied)} FROM scores_old")
+        for (scorer,) in self.conn.execute("SELECT DISTINCT scorer FROM scores_old").fetchall():
+            for part in scorer.split(","):
+                model, _, fingerprint = part.partition(":")
+                if model in SCORE_MODELS and SCORE_MODELS[model][0] in copied:
+                    self.conn.execute(
+                        f"UPDATE scores SET {model}_model = ? WHERE {SCORE_MODELS[model][0]} IS NOT NULL "
+                        "AND rowid IN (SELECT rowid FROM scores_old WHERE scorer = ?)", (fingerprint, scorer))
+        self.conn.execute("DROP TABLE scores_old")
+
+    def _init_fts(self):
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'records_fts'").fetchone() is not None
+        try:
+            with self.conn:
+                self.conn.executescript(FTS_SCHEMA)
+                if not exists:
+                    self.conn.execute("INSERT INTO records_fts (rowid, text) "
+                                      "SELECT rowid, json_extract(record, '$.text') FROM records")
+        except sqlite3.OperationalError:
+            return False
+        return True
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _row(record):
+        metadata = record.get("metadata") or {}
+        return (
+            str(record["id"]),
+            record.get("source"),
+            record.get("author"),
+            record.get("timestamp"),
+            to_epoch(record.get("timestamp")),
+            metadata.get("url"),
+            metadata.get("subreddit"),
+            json.dumps(record, ensure_ascii=False),
+        )
+
+    def _insert(self, records):
+        rows = [self._row(r) for r in records if r.get("id")]
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO records "
+            "(id, source, author, timestamp, ts, url, subreddit, record) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    def add(self, records):
+        """Insert records in one transaction; existing ids are left untouched"""
+        with self._lock, self.conn:
+            return self._insert(records)
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def sync(self, log, batch_size=1000):
+        """Index records appended to ``log`` since the last sync; returns how many were read"""
+        with self._lock:
+            saved = self.get_meta("log_position", "0:0")
+            position = tuple(int(p) for p in saved.split(":"))
+            batch, synced = [], 0
+            for record, position in log.read_from(position):
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    synced += self._commit_batch(batch, position)
+                    batch = []
+            if batch:
+                synced += self._commit_batch(batch, position)
+            return synced
+
+    def _commit_batch(self, batch, position):
+        with self.conn:
+            self._insert(batch)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('log_position', ?)",
+                (f"{position[0]}:{position[1]}",),
+            )
+        return len(batch)
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+    def _where(self, source=None, since=None, until=None, subreddit=None, url=None, author=None, search=None,
+               topic=None, sentiment=None):
+        clauses, params = [], []
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(source)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(to_epoch(since))
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(to_epoch(until))
+        if subreddit is not None:
+            clauses.append("subreddit = ?")
+            params.append(subreddit)
+        if url is not None:
+            clauses.append("url = ?")
+            params.append(url)
+        if author is not None:
+            clauses.append("author = ?")
+            params.append(author)
+        if search and fts_query(search):
+            if self.has_fts:
+                clauses.append("rowid IN (SELECT rowid FROM records_fts WHERE records_fts MATCH ?)")
+                params.append(fts_query(search))
+            else:
+                clauses.append("json_extract(record, '$.text') LIKE ?")
+                params.append(f"%{search}%")
+        for field, value in (("topic", topic), ("sentiment", sentiment)):
+            if value is not None:
+                clauses.append(f"rowid IN (SELECT rowid FROM scores WHERE {field} = ?)")
+                params.append(value)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        return where, params
+
+    def __len__(self):
+        return self.count()
+
+    def get(self, record_id):
+        """Look up one record by id"""
+        row = self.conn.execute("SELECT record FROM records WHERE id = ?", (record_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find_by_url(self, url):
+        """All records whose metadata.url equals ``url``"""
+        return list(self.query(url=url))
+
+    def count(self, **filters):
+        where, params = self._where(**filters)
+        return self.conn.execute(f"SELECT COUNT(*) FROM records{where}", params).fetchone()[0]
+
+    def query(self, limit=None, offset=0, newest_first=True, **filters):
+        """
+        Yield matching records ordered by timestamp.
+
+        Filters: ``source``, ``since``/``until`` (ISO string or datetime),
+        ``subreddit``, ``url``, ``author``, ``search`` (full-text, all words)
+        and the model labels ``topic``/``sentiment``.
+        """
+        where, params = self._where(**filters)
+        order = "DESC" if newest_first else "ASC"
+        sql = f"SELECT record FROM records{where} ORDER BY ts {order}, rowid {order}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        for (raw,) in self.conn.execute(sql, params):
+            yield json.loads(raw)
+
+    def page(self, limit=50, after=None, **filters):
+        """
+        One page of records, newest first, using keyset pagination so deep
+        pages cost the same as the first. ``after`` is the cursor returned
+        with the previous page. Returns ``(records, next_cursor)``;
+        ``next_cursor`` is None on the last page.
+
+        Records with a timestamp are paged first with a predicate the ``ts``
+        indexes can seek on; records without one follow in a second phase,
+        newest rowid first (a cursor with ``ts`` None is in that phase).
+        """
+        where, params = self._where(**filters)
+        where = where + (" AND " if where else " WHERE ")
+        rows = []
+        if after is None or after[0] is not None:
+            condition, cursor_params = "ts IS NOT NULL", []
+            if after is not None:
+                condition, cursor_params = "ts <= ? AND (ts < ? OR rowid < ?)", [after[0], after[0], after[1]]
+            rows = self.conn.execute(
+                f"SELECT ts, rowid, record FROM records{where}{condition} ORDER BY ts DESC, rowid DESC LIMIT ?",
+                params + cursor_params + [limit + 1],
+            ).fetchall()
+        if len(rows) <= limit:
+            condition, cursor_params = "ts IS NULL", []
+            if after is not None and after[0] is None:
+                condition, cursor_params = "ts IS NULL AND rowid < ?", [after[1]]
+            rows += self.conn.execute(
+                f"SELECT ts, rowid, record FROM records{where}{condition} ORDER BY rowid DESC LIMIT ?",
+                params + cursor_params + [limit + 1 - len(rows)],
+            ).fetchall()
+        records = [json.loads(raw) for _, _, raw in rows[:limit]]
+        next_cursor = (rows[limit - 1][0], rows[limit - 1][1]) if len(rows) > limit else None
+        return records, next_cursor
+
+    def sources(self):
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT source FROM records ORDER BY source")]
+
+    def data_version(self):
+        """Changes whenever records are added or scored; used to invalidate cached pages and labels"""
+        records, scores = self.conn.execute(
+            "SELECT (SELECT MAX(rowid) FROM records), (SELECT value FROM meta WHERE key = 'scores_version')"
+        ).fetchone()
+        return records or 0, int(scores or 0)
+
+    def iter_batches(self, batch_size=1000, after_rowid=0, **filters):
+        """
+        Yield ``(last_rowid, records)`` batches in insertion order, starting
+        after ``after_rowid``. Only one batch is held in memory at a time.
+        """
+        where, params = self._where(**filters)
+        where = where + (" AND" if where else " WHERE") + " rowid > ?"
+        last = after_rowid
+        while True:
+            rows = self.conn.execute(
+                f"SELECT rowid, record FROM records{where} ORDER BY rowid LIMIT ?",
+                params + [last, batch_size],
+            ).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield last, [json.loads(raw) for _, raw in rows]
+
+    def iter_records(self, batch_size=1000, **filters):
+        """Yield records in insertion order, fetching ``batch_size`` rows at a time"""
+        for _, records in self.iter_batches(batch_size, **filters):
+            yield from records
+
+    # ------------------------------------------------------------------
+    # Model scores
+    # ------------------------------------------------------------------
+    def _unscored_where(self, models, **filters):
+        """WHERE clause for records lacking scores from any of ``models`` ({name: fingerprint})"""
+        unknown = set(models) - set(SCORE_MODELS)
+        if unknown:
+            raise ValueError(f"Unknown score models {sorted(unknown)}")
+        where, params = self._where(**filters)
+        current = " AND ".join(f"s.{name}_model IS ?" for name in models)
+        where = where + (" AND" if where else " WHERE") + (
+            f" NOT EXISTS (SELECT 1 FROM scores s WHERE s.rowid = records.rowid AND {current})")
+        return where, params + list(models.values())
+
+    def iter_unscored(self, models, batch_size=1000, **filters):
+        """
+        Yield ``(rowids, records)`` batches of records without current scores
+        from one of ``models`` ({name: fingerprint}): never scored, or scored
+        by a different version of that model.
+        """
+        where, params = self._unscored_where(models, **filters)
+        last = 0
+        while True:
+            rows = self.conn.execute(
+                f"SELECT rowid, record FROM records{where} AND rowid > ? ORDER BY rowid LIMIT ?",
+                params + [last, batch_size],
+            ).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield [rowid for rowid, _ in rows], [json.loads(raw) for _, raw in rows]
+
+    def count_unscored(self, models, **filters):
+        where, params = self._unscored_where(models, **filters)
+        return self.conn.execute(f"SELECT COUNT(*) FROM records{where}", params).fetchone()[0]
+
+    def set_scores(self, model, fingerprint, rowids, **fields):
+        """
+        Store ``model``'s outputs for ``rowids``; ``fields`` maps its
+        SCORE_MODELS columns to per-row values. Other models' columns are kept.
+        """
+        columns = [name for name in SCORE_MODELS[model] if name in fields] + [f"{model}_model", "scored_at"]
+        now = datetime.now(timezone.utc).timestamp()
+        rows = zip(rowids, *(fields[name] for name in SCORE_MODELS[model] if name in fields))
+        with self._lock, self.conn:
+            self.conn.executemany(
+                f"INSERT INTO scores (rowid, {', '.join(columns)}) VALUES (?, {', '.join('?' * len(columns))}) "
+                f"ON CONFLICT(rowid) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in columns)}",
+                ((rowid, *values, fingerprint, now) for rowid, *values in rows),
+            )
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('scores_version', 1) "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+            )
+
+    def get_scores(self, record_id):
+        """Model labels, probabilities and VADER scores stored for one record (None if unscored)"""
+        row = self.conn.execute(
+            f"SELECT {', '.join(SCORE_FIELDS)} FROM scores "
+            "WHERE rowid = (SELECT rowid FROM records WHERE id = ?)", (record_id,)).fetchone()
+        return dict(zip(SCORE_FIELDS, row)) if row else None
+
+    def label_counts(self, field, **filters):
+        """``{label: count}`` of ``topic`` or ``sentiment`` over matching records"""
+        if field not in ("topic", "sentiment"):
+            raise ValueError(f"Unknown label field {field}")
+        where, params = self._where(**filters)
+        rows = self.conn.execute(
+            f"SELECT {field}, COUNT(*) FROM scores WHERE {field} IS NOT NULL "
+            f"AND rowid IN (SELECT rowid FROM records{where}) GROUP BY {field} ORDER BY COUNT(*) DESC", params)
+        return dict(rows.fetchall())
+
+
+def open_record_store(data_dir="data"):
+    """Open the record log and its SQLite index under ``data_dir`` and sync them"""
+    log = RecordLog(os.path.join(data_dir, "records"))
+    legacy = os.path.join(data_dir, "data_store.json")
+    log.migrate_json(legacy)
+    store = RecordStore(os.path.join(data_dir, "records.sqlite3"))
+    store.sync(log)
+    return log, store
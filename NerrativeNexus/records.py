@@ -0,0 +1,63 @@
+import uuid
+from datetime import datetime, timezone
+
+
+def create_file_record(filename, source_type, file_type, content, extra_metadata=None):
+    """Create a data record for file uploads"""
+    record = {
+        "id": str(uuid.uuid4()),
+        "source": "file",
+        "author": "user_upload",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "text": content,
+        "metadata": {
+            "filename": filename,
+            "source_type": source_type,
+            "file_type": file_type,
+            "content_length": len(content),
+            "language": "en"
+        }
+    }
+    if extra_metadata:
+        record["metadata"].update(extra_metadata)
+    return record
+
+
+def create_reddit_record(submission, url=None, comments=None):
+    """Create a data record from a praw Submission"""
+    record = {
+        "id": str(uuid.uuid4()),
+        "source": "reddit",
+        "author": submission.author.name if submission.author else "unknown",
+        "timestamp": datetime.fromtimestamp(submission.created_utc, tz=timezone.utc).isoformat(),
+        "text": (submission.title or "") + "\n" + (submission.selftext or ""),
+        "metadata": {
+            "language": "en",
+            "likes": submission.score,
+            "rating": None,
+            "url": url or f"https://www.reddit.com{submission.permalink}",
+            "subreddit": submission.subreddit.display_name,
+            "num_comments": submission.num_comments
+        }
+    }
+    if comments is not None:
+        record["metadata"]["comments"] = comments
+    return record
+
+
+def create_news_record(article):
+    """Create a data record from a NewsAPI article"""
+    return {
+        "id": str(uuid.uuid4()),
+        "source": "news",
+        "author": article.get("author") or "unknown",
+        "timestamp": article.get("publishedAt"),
+        "text": (article.get("title") or "") + "\n" + (article.get("description") or ""),
+        "metadata": {
+            "language": article.get("language", "en"),
+            "likes": None,
+            "rating": None,
+            "url": article.get("url"),
+            "source_name": (article.get("source") or {}).get("name", "unknown")
+        }
+    }
@@ -0,0 +1,262 @@
+import io
+import time
+import random
+import threading
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from records import create_reddit_record
+
+
+# Reddit's OAuth API allows 100 queries per minute per client id
+DEFAULT_REQUESTS_PER_MINUTE = 100
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by all fetch workers"""
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, burst=None):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst or max(1, int(self.rate * 10))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def read_url_list(source):
+    """
+    Parse Reddit URLs from a string, a list, or an uploaded text/CSV file.
+    Blank lines and ``#`` comments are skipped and duplicates removed.
+    """
+    if hasattr(source, "read"):
+        source = source.read()
+    if isinstance(source, bytes):
+        source = source.decode("utf-8", errors="ignore")
+    if isinstance(source, str):
+        source = io.StringIO(source)
+
+    urls, seen = [], set()
+    for line in source:
+        for cell in str(line).split(","):
+            url = cell.strip().strip('"')
+            if not url or url.startswith("#") or ("reddit.com" not in url and "redd.it" not in url):
+                continue
+            if url not in seen:
+                seen.add(url)
+                urls.append(url)
+    return urls
+
+
+def flatten_comments(submission, limiter=None):
+    """Return the full comment tree of a submission as a flat list"""
+    if limiter:
+        limiter.acquire()
+    submission.comments.replace_more(limit=0)
+    comments = []
+    for comment in submission.comments.list():
+        comments.append({
+            "id": comment.id,
+            "parent_id": comment.parent_id,
+            "author": comment.author.name if comment.author else "unknown",
+            "body": comment.body,
+            "score": comment.score,
+            "depth": getattr(comment, "depth", 0),
+        })
+    return comments
+
+
+class RedditBulkFetcher:
+    """
+    Fetch many Reddit submissions with a bounded thread pool.
+
+    praw clients are not thread-safe, so each worker thread builds its own
+    client from ``client_factory``; all workers share one ``RateLimiter`` so
+    the pool as a whole stays under the API quota.
+    """
+
+    def __init__(self, client_factory, max_workers=8, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 include_comments=False):
+        self.client_factory = client_factory
+        self.max_workers = max_workers
+        self.include_comments = include_comments
+        self.limiter = RateLimiter(requests_per_minute)
+        self._local = threading.local()
+
+    def _client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.client_factory()
+        return client
+
+    def _build(self, submission, url=None):
+        comments = flatten_comments(submission, self.limiter) if self.include_comments else None
+        return create_reddit_record(submission, url=url, comments=comments)
+
+    def _fetch_url(self, url):
+        submission = self._client().submission(url=url)
+        self.limiter.acquire()
+        # Touching title triggers praw's lazy fetch of the submission
+        submission.title
+        return self._build(submission, url=url)
+
+    def _run(self, func, items, on_progress=None):
+        records, errors = [], []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(func, item): item for item in items}
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    records.append(future.result())
+                except Exception as e:
+                    errors.append((futures[future], str(e)))
+                if on_progress:
+                    on_progress(done, len(futures))
+        return records, errors
+
+    def fetch_urls(self, urls, on_progress=None):
+        """Fetch submissions by URL; returns (records, [(url, error), ...])"""
+        return self._run(self._fetch_url, list(urls), on_progress)
+
+    def fetch_subreddit(self, name, limit=100, sort="hot", on_progress=None):
+        """Fetch up to ``limit`` submissions from a subreddit listing"""
+        listing = getattr(self._client().subreddit(name), sort)
+        # praw pages listings 100 submissions per request
+        submissions = []
+        for i, submission in enumerate(listing(limit=limit)):
+            if i % 100 == 0:
+                self.limiter.acquire()
+            submissions.append(submission)
+            # Without comments the listing is all the work, so report it as it streams in
+            if on_progress and not self.include_comments:
+                on_progress(i + 1, limit)
+        if not self.include_comments:
+            if on_progress:
+                on_progress(len(submissions), len(submissions))
+            return [self._build(s) for s in submissions], []
+        return self._run(self._build, submissions, on_progress)
+
+
+# ----------------------------------------------------------------------
+# Offline mock client for benchmarking
+# ----------------------------------------------------------------------
+class MockComments:
+    def __init__(self, submission_id, count, latency):
+        self._submission_id = submission_id
+        self._count = count
+        self._latency = latency
+
+    def replace_more(self, limit=0):
+        time.sleep(self._latency)
+        return []
+
+    def list(self):
+        return [
+            SimpleNamespace(
+                id=f"{self._submission_id}_c{i}",
+                parent_id=f"t3_{self._submission_id}" if i == 0 else f"t1_{self._submission_id}_c{i - 1}",
+                author=SimpleNamespace(name=f"commenter{i}"),
+                body=f"Mock comment {i}",
+                score=random.randint(0, 50),
+                depth=i % 3,
+            )
+            for i in range(self._count)
+        ]
+
+
+class MockSubmission:
+    """Mimics praw's lazy Submission: the first attribute access costs one round trip"""
+
+    def __init__(self, submission_id, subreddit="mock", latency=0.05, num_comments=5):
+        self.id = submission_id
+        self._subreddit = subreddit
+        self._latency = latency
+        self._num_comments = num_comments
+        self._fetched = False
+
+    def _fetch(self):
+        if not self._fetched:
+            time.sleep(self._latency)
+            self._fetched = True
+
+    @property
+    def title(self):
+        self._fetch()
+        return f"Mock post {self.id}"
+
+    @property
+    def selftext(self):
+        self._fetch()
+        return "Lorem ipsum dolor sit amet. " * 5
+
+    @property
+    def author(self):
+        self._fetch()
+        return SimpleNamespace(name="mock_author")
+
+    @property
+    def created_utc(self):
+        self._fetch()
+        return 1700000000.0
+
+    @property
+    def score(self):
+        self._fetch()
+        return 42
+
+    @property
+    def num_comments(self):
+        self._fetch()
+        return self._num_comments
+
+    @property
+    def permalink(self):
+        return f"/r/{self._subreddit}/comments/{self.id}/mock_post/"
+
+    @property
+    def subreddit(self):
+        return SimpleNamespace(display_name=self._subreddit)
+
+    @property
+    def comments(self):
+        return MockComments(self.id, self._num_comments, self._latency)
+
+
+class MockSubreddit:
+    def __init__(self, name, latency):
+        self.display_name = name
+        self._latency = latency
+
+    def _listing(self, limit=100):
+        for i in range(limit or 100):
+            if i % 100 == 0:
+                time.sleep(self._latency)
+            submission = MockSubmission(f"{self.display_name}{i}", self.display_name, self._latency)
+            submission._fetched = True
+            yield submission
+
+    hot = new = top = _listing
+
+
+class MockReddit:
+    """Drop-in stand-in for ``praw.Reddit`` with a fixed per-request latency"""
+
+    def __init__(self, latency=0.05):
+        self.latency = latency
+
+    def submission(self, id=None, url=None):
+        submission_id = id or url.rstrip("/").split("/comments/")[-1].split("/")[0]
+        return MockSubmission(submission_id, latency=self.latency)
+
+    def subreddit(self, name):
+        return MockSubreddit(name, self.latency)
@@ -0,0 +1,213 @@
+"""
+Batch scoring of stored records with the topic and sentiment classifiers.
+
+Records are streamed from the store in batches. Each batch is scored with
+one ``predict_proba`` call per model and the labels and probabilities are
+written to the store's indexed ``scores`` table, so records can be
+filtered by ``topic``/``sentiment``. Each model's scores are stored with the
+fingerprint of its own model file, and only records without scores from the
+current files are read: re-running after new collection scores just the new
+records, and retraining a model rescores everything. Running a subset of the
+models (``--no-sentiment``, ``--vader``) leaves the other models' scores alone.
+
+Models are compact artifact directories (see modeling/compact.py) or joblib
+Pipeline pickles. Each model's text gets the same cleaning as its training
+data (the 20 Newsgroups classification cleaner for topics, the review
+cleaner for sentiment), via the shared preprocessing cache. ``--vader`` also stores sentence-level VADER
+score vectors (compound/pos/neg/neu) of the raw text, computed in a process
+pool (see modeling/vader.py).
+
+    python score_records.py
+    python score_records.py --source reddit --batch-size 2000
+    python score_records.py --no-sentiment
+    python score_records.py --vader --vader-workers 4
+"""
+import os
+import sys
+import time
+import hashlib
+import argparse
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+from modeling.compact import load_model
+from preprocessing.cache import cached_map
+from preprocessing.reviews import clean_text, CLEAN_TEXT_VERSION, CACHE_NAMESPACE
+from preprocessing.newsgroups import clean_post, VERSION as NEWSGROUPS_VERSION
+from modeling.vader import VaderEngine, VADER_VERSION, FIELDS as VADER_FIELDS
+
+TOPIC_MODEL = os.path.join(REPO_ROOT, "Topic Modeling", "models", "text_classifier.compact")
+SENTIMENT_MODEL = os.path.join(REPO_ROOT, "Sentiment Analysis", "random_forest_model.compact")
+SENTIMENT_LABELS = {0: "negative", 1: "positive"}
+
+
+def model_fingerprint(path):
+    """Short content hash of a model file or artifact directory"""
+    digest = hashlib.blake2b(digest_size=8)
+    files = [os.path.join(path, name) for name in sorted(os.listdir(path))] if os.path.isdir(path) else [path]
+    for name in files:
+        with open(name, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class Scorer:
+    """
+    One model: ``score(texts)`` returns the most likely labels and their
+    probabilities as store fields. The fingerprint covers the model file and
+    ``prepare_version``, so changing either rescores.
+    """
+
+    def __init__(self, name, path, prepare=None, labels=None, prepare_version=None):
+        self.name, self.path = name, path
+        self.model = load_model(path)
+        self.prepare = prepare
+        self.labels = labels or {}
+        self.fingerprint = model_fingerprint(path)
+        if prepare_version is not None:
+            self.fingerprint += f"-p{prepare_version}"
+        self.seconds = 0.0
+        self.documents = 0
+
+    def score(self, texts):
+        start = time.perf_counter()
+        if self.prepare is not None:
+            texts = self.prepare(texts)
+        proba = self.model.predict_proba(texts)
+        best = np.argmax(proba, axis=1)
+        classes = self.model.classes_[best].tolist()
+        labels = [self.labels.get(c, str(c)) for c in classes]
+        self.seconds += time.perf_counter() - start
+        self.documents += len(texts)
+        return {self.name: labels, self.name + "_prob": proba[np.arange(len(best)), best].tolist()}
+
+    def close(self):
+        pass
+
+
+class VaderScorer:
+    """Sentence-level VADER vectors of the raw text as ``vader_*`` store fields"""
+
+    name = "vader"
+
+    def __init__(self, workers=None):
+        self.engine = VaderEngine(workers)
+        self.fingerprint = f"v{VADER_VERSION}"
+        self.seconds = 0.0
+        self.documents = 0
+
+    def score(self, texts):
+        start = time.perf_counter()
+        scores = self.engine.score(texts)
+        self.seconds += time.perf_counter() - start
+        self.documents += len(texts)
+        return {f"vader_{field}": scores[field].tolist() for field in VADER_FIELDS}
+
+    def close(self):
+        self.engine.close()
+
+
+def prepare_topic(texts):
+    # Same cleaner and cache namespace as the classification corpus build
+    return cached_map(clean_post, texts, "newsgroups.classification", NEWSGROUPS_VERSION)
+
+
+def prepare_sentiment(texts):
+    return cached_map(clean_text, texts, CACHE_NAMESPACE, CLEAN_TEXT_VERSION)
+
+
+def make_scorers(topic_model=TOPIC_MODEL, sentiment_model=SENTIMENT_MODEL, vader=False, vader_workers=None):
+    scorers = []
+    if topic_model:
+        scorers.append(Scorer("topic", topic_model, prepare_topic, prepare_version=NEWSGROUPS_VERSION))
+    if sentiment_model:
+        scorers.append(Scorer("sentiment", sentiment_model, prepare_sentiment, SENTIMENT_LABELS,
+                              CLEAN_TEXT_VERSION))
+    if vader:
+        scorers.append(VaderScorer(vader_workers))
+    if not scorers:
+        raise Exception("No models to score with")
+    return scorers
+
+
+def score_records(store, scorers, batch_size=1000, on_progress=None, **filters):
+    """
+    Score, with each of ``scorers``, the records in ``store`` that lack
+    current scores from that model; an unchanged model scores nothing.
+    Returns ``(scored, seconds)``, counting one per record and model.
+    """
+    pending = {scorer.name: store.count_unscored({scorer.name: scorer.fingerprint}, **filters)
+               for scorer in scorers}
+    total = sum(pending.values())
+    scored, start = 0, time.perf_counter()
+    for scorer in scorers:
+        if not pending[scorer.name]:
+            continue
+        # Each model only reads the records it has no current scores for
+        for rowids, records in store.iter_unscored({scorer.name: scorer.fingerprint}, batch_size, **filters):
+            texts = [record.get("text") or "" for record in records]
+            store.set_scores(scorer.name, scorer.fingerprint, rowids, **scorer.score(texts))
+            scored += len(records)
+            if on_progress:
+                on_progress(scored, total)
+    return scored, time.perf_counter() - start
+
+
+def main():
+    from record_store import open_record_store
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topic-model", default=TOPIC_MODEL)
+    parser.add_argument("--sentiment-model", default=SENTIMENT_MODEL)
+    parser.add_argument("--no-topic", action="store_true")
+    parser.add_argument("--no-sentiment", action="store_true")
+    parser.add_argument("--vader", action="store_true", help="also store VADER score vectors")
+    parser.add_argument("--vader-workers", type=int, default=None)
+    parser.add_argument("--source", default=None)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--data-dir", default="data")
+    args = parser.parse_args()
+
+    sentiment_model = None if args.no_sentiment else args.sentiment_model
+    if sentiment_model and not os.path.exists(sentiment_model):
+        if args.sentiment_model != SENTIMENT_MODEL:
+            raise Exception(f"Sentiment model not found: {sentiment_model}")
+        print(f"⚠️ {SENTIMENT_MODEL} not found (run model_1.py to create it); skipping sentiment")
+        sentiment_model = None
+    scorers = make_scorers(None if args.no_topic else args.topic_model, sentiment_model, args.vader,
+                           args.vader_workers)
+
+    log, store = open_record_store(args.data_dir)
+    filters = {"source": args.source} if args.source else {}
+
+    def report(done, total):
+        print(f"\r🏷️ {done:,}/{total:,} record scores", end="", flush=True)
+
+    try:
+        scored, seconds = score_records(store, scorers, args.batch_size, report, **filters)
+    finally:
+        for scorer in scorers:
+            scorer.close()
+    log.close()
+    if not scored:
+        print("✅ Nothing to score")
+        return
+    print(f"\n✅ Stored {scored:,} record scores in {seconds:.2f}s")
+    for scorer in scorers:
+        if scorer.documents:
+            print(f"   {scorer.name:<10} {scorer.documents:,} records in {scorer.seconds:.2f}s "
+                  f"({scorer.documents / scorer.seconds:,.0f} docs/s)")
+        else:
+            print(f"   {scorer.name:<10} up to date")
+    for field in ("topic", "sentiment"):
+        counts = store.label_counts(field, **filters)
+        if counts:
+            print(f"📊 {field}: " + ", ".join(f"{label} {count:,}" for label, count in list(counts.items())[:5]))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+# data_paths.py
+# Amazon review CSVs, and the split/prediction artifacts keyed by their contents.
+# Importing this is cheap (no data is read), so comparison scripts can find
+# saved predictions without going through train_test.py.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from modeling.artifacts import Artifacts, file_key
+from preprocessing.reviews import CLEAN_TEXT_VERSION
+
+# Relative to the Sentiment Analysis directory
+train_path = os.path.join("data", "amazon_rev", "amazon_reviews_train.csv")
+test_path  = os.path.join("data", "amazon_rev", "amazon_reviews_test.csv")
+
+
+def split_artifacts():
+    """Artifacts for the current CSVs and cleaning version"""
+    return Artifacts("sentiment", f"{file_key(train_path, test_path)}-clean{CLEAN_TEXT_VERSION}")
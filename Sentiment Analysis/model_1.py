@@ -1,4 +1,7 @@
-from train_test import X_train, y_train, X_test, y_test
+import os
+import sys
+import joblib
+from train_test import X_train, y_train, X_test, y_test, artifacts
 
 print("Training samples:", len(X_train))
 print("Testing samples:", len(X_test))
@@ -11,21 +14,44 @@ from sklearn.metrics import classification_report, confusion_matrix, accuracy_sc
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-# Vectorize
-vectorizer = TfidfVectorizer(max_features=5000)
-X_train_tfidf = vectorizer.fit_transform(X_train)
-X_test_tfidf  = vectorizer.transform(X_test)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from modeling.compact import export_compact
+from modeling.artifacts import file_key
+
+# Vectorize (reuses the matrices saved for the same CSVs)
+vectorizer = artifacts.load_object("tfidf_vectorizer")
+X_train_tfidf = artifacts.load_matrix("tfidf_train")
+X_test_tfidf  = artifacts.load_matrix("tfidf_test")
+if vectorizer is None or X_train_tfidf is None or X_test_tfidf is None:
+    vectorizer = TfidfVectorizer(max_features=5000)
+    X_train_tfidf = vectorizer.fit_transform(X_train)
+    X_test_tfidf  = vectorizer.transform(X_test)
+    artifacts.save_object("tfidf_vectorizer", vectorizer)
+    artifacts.save_matrix("tfidf_train", X_train_tfidf)
+    artifacts.save_matrix("tfidf_test", X_test_tfidf)
+else:
+    print("Loaded TF-IDF matrices from", artifacts.path)
 
 # Train
 rf = RandomForestClassifier(n_estimators=200, random_state=42)
 rf.fit(X_train_tfidf, y_train)
-y_pred_rf = rf.predict(X_test_tfidf)
+y_proba_rf = rf.predict_proba(X_test_tfidf)
+y_pred_rf = rf.classes_[y_proba_rf.argmax(axis=1)]
 
 # Evaluation
 print(" Random Forest Results:")
 print("Accuracy:", accuracy_score(y_test, y_pred_rf))
 print(classification_report(y_test, y_pred_rf))
 
+# Save for predict.py, plus a memory-mapped copy that scoring workers can share
+joblib.dump(rf, "random_forest_model.pkl")
+joblib.dump(vectorizer, "tfidf_vectorizer.pkl")
+export_compact(rf, "random_forest_model.compact", vectorizer=vectorizer)
+
+# Test predictions for model_performance.py
+artifacts.save_predictions("random_forest", y_test, y_pred_rf, y_proba_rf, rf.classes_,
+                           model_key=file_key("random_forest_model.pkl"))
+
 # Confusion Matrix
 cm = confusion_matrix(y_test, y_pred_rf)
 sns.heatmap(cm, annot=True, fmt="d", cmap="Blues")
@@ -1,4 +1,4 @@
-from train_test import X_train, y_train, X_test, y_test
+from train_test import X_train, y_train, X_test, y_test, artifacts
 
 print("Training samples:", len(X_train))
 print("Testing samples:", len(X_test))
@@ -16,12 +16,21 @@ from sklearn.metrics import accuracy_score, classification_report, confusion_mat
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-# Tokenization
-tokenizer = Tokenizer(num_words=20000)
-tokenizer.fit_on_texts(X_train)
+# Tokenization (reuses the sequences saved for the same CSVs)
+tokenizer = artifacts.load_object("lstm_tokenizer")
+X_train_seq = artifacts.load_matrix("lstm_train_seq")
+X_test_seq  = artifacts.load_matrix("lstm_test_seq")
+if tokenizer is None or X_train_seq is None or X_test_seq is None:
+    tokenizer = Tokenizer(num_words=20000)
+    tokenizer.fit_on_texts(X_train)
 
-X_train_seq = pad_sequences(tokenizer.texts_to_sequences(X_train), maxlen=200)
-X_test_seq  = pad_sequences(tokenizer.texts_to_sequences(X_test), maxlen=200)
+    X_train_seq = pad_sequences(tokenizer.texts_to_sequences(X_train), maxlen=200)
+    X_test_seq  = pad_sequences(tokenizer.texts_to_sequences(X_test), maxlen=200)
+    artifacts.save_object("lstm_tokenizer", tokenizer)
+    artifacts.save_matrix("lstm_train_seq", X_train_seq)
+    artifacts.save_matrix("lstm_test_seq", X_test_seq)
+else:
+    print("Loaded token sequences from", artifacts.path)
 
 # Build model
 model_lstm = Sequential([
@@ -42,11 +51,15 @@ history = model_lstm.fit(
 )
 
 # Evaluate
-y_pred_lstm = (model_lstm.predict(X_test_seq) > 0.5).astype("int32").flatten()
+y_proba_lstm = model_lstm.predict(X_test_seq).flatten()
+y_pred_lstm = (y_proba_lstm > 0.5).astype("int32")
 print(" LSTM Results:")
 print("Accuracy:", accuracy_score(y_test, y_pred_lstm))
 print(classification_report(y_test, y_pred_lstm))
 
+# Test predictions for model_performance.py
+artifacts.save_predictions("lstm", y_test, y_pred_lstm, np.column_stack([1 - y_proba_lstm, y_proba_lstm]), [0, 1])
+
 cm = confusion_matrix(y_test, y_pred_lstm)
 sns.heatmap(cm, annot=True, fmt="d", cmap="Greens")
 plt.title("LSTM Confusion Matrix")
@@ -1,48 +1,42 @@
 # model_performance.py
 
+import numpy as np
 import pandas as pd
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 
-# Import data
-from train_test import X_test, y_test
+# Test predictions saved by model_1.py and model_2.py for the current CSVs (no retraining)
+from data_paths import split_artifacts
 
-# Import predictions from models
-from model_1 import y_pred_rf
-from model_2 import y_pred_lstm
+artifacts = split_artifacts()
+models = {"Random Forest": ("random_forest", "model_1.py"), "LSTM": ("lstm", "model_2.py")}
+predictions = {}
+for name, (key, script) in models.items():
+    predictions[name] = artifacts.load_predictions(key)
+    if predictions[name] is None:
+        raise Exception(f"No {name} predictions in {artifacts.path}; run {script} first")
+
+y_test = pd.Series(predictions["Random Forest"]["y_true"])
+for name, saved in predictions.items():
+    if not np.array_equal(saved["y_true"], y_test.to_numpy()):
+        raise Exception(f"{name} predictions were made on a different test set; rerun {models[name][1]}")
 
 
 
 print("Train/Test sizes:")
-print("Test size:", len(X_test))
+print("Test size:", len(y_test))
 print("Test labels distribution:\n", y_test.value_counts())
 
 
 
 # Collect metrics
 results = {
-    "Model": ["Random Forest", "LSTM"],
-    "Accuracy": [
-        accuracy_score(y_test, y_pred_rf),
-        accuracy_score(y_test, y_pred_lstm),
-
-    ],
-    "Precision": [
-        precision_score(y_test, y_pred_rf),
-        precision_score(y_test, y_pred_lstm),
-
-    ],
-    "Recall": [
-        recall_score(y_test, y_pred_rf),
-        recall_score(y_test, y_pred_lstm),
-
-    ],
-    "F1-Score": [
-        f1_score(y_test, y_pred_rf),
-        f1_score(y_test, y_pred_lstm),
-
-    ],
+    "Model": list(predictions),
+    "Accuracy": [accuracy_score(y_test, saved["y_pred"]) for saved in predictions.values()],
+    "Precision": [precision_score(y_test, saved["y_pred"]) for saved in predictions.values()],
+    "Recall": [recall_score(y_test, saved["y_pred"]) for saved in predictions.values()],
+    "F1-Score": [f1_score(y_test, saved["y_pred"]) for saved in predictions.values()],
 }
 
 df_results = pd.DataFrame(results)
 print(" Model Performance Summary")
-print(df_results)
\ No newline at end of file
+print(df_results)
@@ -1,8 +1,12 @@
+import os
+import sys
 import joblib
 import tensorflow as tf
 from tensorflow.keras.models import load_model
 from tensorflow.keras.preprocessing.sequence import pad_sequences
-from train_test import clean_text
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from preprocessing.reviews import clean_text
 
 # Load saved RF + TF-IDF
 rf_loaded = joblib.load("random_forest_model.pkl")
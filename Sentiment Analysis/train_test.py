@@ -1,45 +1,38 @@
-train_path = r"data\amazon_rev\amazon_reviews_train.csv"
-test_path  = r"data\amazon_rev\amazon_reviews_test.csv"
-
-
-
-import re
-import nltk
+import os
+import sys
 import pandas as pd
-nltk.download("stopwords")
-nltk.download("wordnet")
 
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-
-stop_words = set(stopwords.words("english"))
-lemmatizer = WordNetLemmatizer()
-
-def clean_text(text):
-    """Basic cleaning: lowercasing, removing special chars, stopwords, lemmatization"""
-    text = str(text).lower()
-    text = re.sub(r"http\S+|www\S+|https\S+", "", text)
-    text = re.sub(r"[^a-z\s]", "", text)
-    tokens = [lemmatizer.lemmatize(w) for w in text.split() if w not in stop_words]
-    return " ".join(tokens)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from preprocessing.cache import cached_map, default_cache
+from preprocessing.reviews import clean_text, CLEAN_TEXT_VERSION, CACHE_NAMESPACE
+from data_paths import train_path, test_path, split_artifacts
 
 
 train_df = pd.read_csv(train_path, on_bad_lines='skip')
 test_df  = pd.read_csv(test_path, on_bad_lines='skip')
 
 
-train_df["text"] = (train_df["title"].astype(str) + " " + train_df["content"].astype(str)).apply(clean_text)
-test_df["text"]  = (test_df["title"].astype(str) + " " + test_df["content"].astype(str)).apply(clean_text)
+# Only reviews not seen before (by content) are cleaned; the rest come from the cache
+train_df["text"] = cached_map(clean_text, train_df["title"].astype(str) + " " + train_df["content"].astype(str),
+                              CACHE_NAMESPACE, CLEAN_TEXT_VERSION)
+test_df["text"]  = cached_map(clean_text, test_df["title"].astype(str) + " " + test_df["content"].astype(str),
+                              CACHE_NAMESPACE, CLEAN_TEXT_VERSION)
 
 X_train, y_train = train_df["text"], train_df["label"]
 X_test,  y_test  = test_df["text"],  test_df["label"]
 
 print("Train size:", len(X_train), " Test size:", len(X_test))
+cache = default_cache()
+if cache is not None:
+    print(cache.summary())
 
 
 # train_test.py
 
 # your preprocessing code above...
 
+# Vectorized matrices and per-model predictions for these CSVs (see model_1.py, model_2.py)
+artifacts = split_artifacts()
+
 # Expose variables for import
-__all__ = ["X_train", "y_train", "X_test", "y_test"]
+__all__ = ["X_train", "y_train", "X_test", "y_test", "artifacts"]
@@ -0,0 +1,64 @@
+"""
+Benchmark: batched nlp_preprocess vs the original per-token implementation.
+
+The original is kept below as the reference; every output of the new engine
+must be identical. The memo tables are cleared before each timed run, and
+the preprocessing cache is bypassed.
+
+    python src/bench_preprocess.py --scale 4 --workers 4
+"""
+import os
+import sys
+import time
+import argparse
+
+import nltk
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+import text_processing
+from text_processing import nlp_preprocess_batch
+
+
+def reference_nlp_preprocess(text):
+    if not isinstance(text, str):
+        return ""
+    tokens = nltk.word_tokenize(text.lower())
+    tokens = [t for t in tokens if t.isalpha() and t not in text_processing.stop_words]
+    tokens = [text_processing.lemmatizer.lemmatize(t) for t in tokens]
+    return " ".join(tokens)
+
+
+def timed(func, texts):
+    text_processing._words.clear()
+    text_processing._lemmas.clear()
+    start = time.perf_counter()
+    result = func(texts)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", default=os.path.join("req_data", "processed", "20news_18828_clean.parquet"))
+    parser.add_argument("--column", default="text")
+    parser.add_argument("--scale", type=int, default=1, help="repeat the texts this many times")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    text_processing.load_resources()
+    texts = pd.read_parquet(args.dataset, columns=[args.column])[args.column].tolist() * args.scale
+    print(f"📚 {len(texts):,} texts, {sum(map(len, texts)) / 1e6:.1f} MB")
+
+    expected, baseline = timed(lambda batch: [reference_nlp_preprocess(t) for t in batch], texts)
+    print(f"{'original':<22} {baseline:>8.2f}s")
+    runs = [("batched", lambda batch: nlp_preprocess_batch(batch))]
+    if args.workers > 1:
+        runs.append((f"batched, {args.workers} workers", lambda batch: nlp_preprocess_batch(batch, args.workers)))
+    for name, func in runs:
+        result, elapsed = timed(func, texts)
+        status = "identical" if result == expected else "OUTPUT DIFFERS"
+        print(f"{name:<22} {elapsed:>8.2f}s  {baseline / elapsed:>5.1f}x  {status}")
+
+
+if __name__ == "__main__":
+    main()
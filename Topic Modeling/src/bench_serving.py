@@ -0,0 +1,106 @@
+"""
+Load test for serve_classifier.py across micro-batch windows.
+
+For every ``--windows`` value a fresh in-process server is started and
+``--clients`` concurrent clients send ``--requests`` single-text HTTP
+requests (real newsgroup posts). Client-side p50/p99 latency, throughput and
+the server's mean batch size are reported; window 0 means no waiting, i.e.
+a batch is whatever is already queued.
+
+    python src/bench_serving.py --windows 0 1 5 20 --clients 16 --requests 2000
+    python src/bench_serving.py --url http://127.0.0.1:8000 --clients 32
+"""
+import os
+import json
+import time
+import argparse
+import threading
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+from serve_classifier import MODEL_PATH, MicroBatcher, make_server, load_model
+
+
+def load_texts(dataset, column="text", limit=5000):
+    texts = pd.read_parquet(dataset, columns=[column])[column].dropna().tolist()[:limit]
+    return [t[:2000] for t in texts]
+
+
+def run_load(url, texts, clients, requests, k=3):
+    """Client latencies (s) and wall time for ``requests`` POSTs spread over ``clients`` threads"""
+    latencies = [[] for _ in range(clients)]
+    errors = [0]
+
+    def client(i):
+        for n in range(i, requests, clients):
+            body = json.dumps({"text": texts[n % len(texts)], "k": k}).encode("utf-8")
+            request = urllib.request.Request(url + "/predict", body, {"Content-Type": "application/json"})
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=60) as response:
+                    response.read()
+            except Exception:
+                errors[0] += 1
+                continue
+            latencies[i].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.concatenate([np.array(l) for l in latencies]), time.perf_counter() - start, errors[0]
+
+
+def fetch_metrics(url):
+    with urllib.request.urlopen(url + "/metrics", timeout=10) as response:
+        return json.loads(response.read())
+
+
+def report(label, latencies, wall, errors, metrics):
+    p50, p99 = np.percentile(latencies * 1000, [50, 99]) if len(latencies) else (0.0, 0.0)
+    print(f"{label:>10} {p50:>9.2f} {p99:>9.2f} {len(latencies) / wall:>9.1f} "
+          f"{metrics.get('mean_batch_size', 0):>7.1f} {errors:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--dataset", default=os.path.join("req_data", "processed", "20news_18828_clean.parquet"))
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 1, 2, 5, 10, 20], help="batch windows in ms")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--url", help="load-test an already running server instead")
+    args = parser.parse_args()
+
+    texts = load_texts(args.dataset)
+    print(f"📚 {len(texts):,} texts, {args.clients} clients, {args.requests:,} requests per run")
+    print(f"{'window ms':>10} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>9} {'batch':>7} {'errors':>6}")
+
+    if args.url:
+        latencies, wall, errors = run_load(args.url.rstrip("/"), texts, args.clients, args.requests)
+        report("remote", latencies, wall, errors, fetch_metrics(args.url.rstrip("/")))
+        return
+
+    pipeline = load_model(args.model)
+    for window in args.windows:
+        batcher = MicroBatcher(pipeline, window / 1000, args.max_batch)
+        server = make_server(batcher, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        run_load(url, texts, args.clients, min(200, args.requests))  # warm up
+        batcher.metrics.reset()
+        latencies, wall, errors = run_load(url, texts, args.clients, args.requests)
+        report(f"{window:g}", latencies, wall, errors, fetch_metrics(url))
+        server.shutdown()
+        server.server_close()
+        batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: in-memory TF-IDF + LogisticRegression training (train_classifier.py)
+vs out-of-core hashing + SGD training (train_streaming.py).
+
+The corpus is replicated ``--scales`` times into a temporary Parquet file.
+Each (mode, scale) runs in its own process so peak RSS is not shared.
+Both modes use the same held-out documents (by text hash) for accuracy.
+
+    python src/bench_training.py --scales 1 4 16
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+import pandas as pd
+
+INPUT_PATH = os.path.join("req_data", "processed", "20news_18828_clean.parquet")
+
+
+def run_batch(path, test_fraction):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from train_streaming import is_holdout
+
+    df = pd.read_parquet(path).dropna(subset=["text", "category"])
+    df = df[df["text"].str.strip() != ""]
+    held = df["text"].map(lambda text: is_holdout(text, test_fraction))
+    pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(max_features=5000, stop_words="english")),
+        ("clf", LogisticRegression(max_iter=1000, random_state=42)),
+    ])
+    start = time.perf_counter()
+    pipeline.fit(df["text"][~held], df["category"][~held])
+    seconds = time.perf_counter() - start
+    return seconds, pipeline.score(df["text"][held], df["category"][held])
+
+
+def run_streaming(path, test_fraction, epochs):
+    from train_streaming import train
+
+    _, state = train(path, epochs=epochs, test_fraction=test_fraction)
+    return state["train_seconds"], state["accuracy"]
+
+
+def child(mode, path, test_fraction, epochs):
+    start = time.perf_counter()
+    if mode == "batch":
+        fit_seconds, accuracy = run_batch(path, test_fraction)
+    else:
+        fit_seconds, accuracy = run_streaming(path, test_fraction, epochs)
+    print(json.dumps({
+        "wall": time.perf_counter() - start,
+        "fit": fit_seconds,
+        "accuracy": accuracy,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default=INPUT_PATH)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    parser.add_argument("--child", choices=["batch", "streaming"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.child, args.input, args.test_fraction, args.epochs)
+
+    base = pd.read_parquet(args.input, columns=["text", "category"])
+    print(f"{'docs':>8} {'mode':<10} {'wall':>8} {'fit':>8} {'peak RSS':>10} {'accuracy':>9}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in args.scales:
+            path = os.path.join(workdir, f"corpus_x{scale}.parquet")
+            pd.concat([base] * scale, ignore_index=True).to_parquet(path, row_group_size=5000)
+            for mode in ("batch", "streaming"):
+                output = subprocess.run(
+                    [sys.executable, "-W", "ignore", os.path.abspath(__file__), "--child", mode, "--input", path,
+                     "--epochs", str(args.epochs), "--test-fraction", str(args.test_fraction)],
+                    capture_output=True, text=True, check=True,
+                ).stdout
+                r = json.loads(output.strip().splitlines()[-1])
+                print(f"{len(base) * scale:>8,} {mode:<10} {r['wall']:>7.2f}s {r['fit']:>7.2f}s "
+                      f"{r['peak_rss_mb']:>8.0f}MB {r['accuracy']:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
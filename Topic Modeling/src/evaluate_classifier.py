@@ -1,37 +1,52 @@
+import os
+import sys
 import pandas as pd
 import joblib
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, accuracy_score, confusion_matrix
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-
-from text_processing import preprocess_series
-
-
-df = pd.read_csv("req_data\processed\20news_18828_clean.csv")
-pipeline = joblib.load("models/text_classifier.pkl")
-
-X = df["text"]
-y = df["category"]
-
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
-
-y_pred = pipeline.predict(X_test)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from modeling.artifacts import Artifacts, clean_labelled, file_key
+
+INPUT_PATH = os.path.join("req_data", "processed", "20news_18828_clean.parquet")
+MODEL_PATH = os.path.join("models", "text_classifier.pkl")
+
+# Test split and predictions saved by train_classifier.py for this data file and model
+artifacts = Artifacts("topic", file_key(INPUT_PATH))
+model_key = file_key(MODEL_PATH)
+predictions = artifacts.load_predictions("text_classifier", model_key=model_key)
+
+if predictions is None:
+    test = artifacts.load_frame("test")
+    if test is None:
+        # No training artifacts yet: rebuild the same split train_classifier.py uses
+        df = clean_labelled(pd.read_parquet(INPUT_PATH, columns=["text", "category"]), "text", "category")
+        _, test_idx = artifacts.split(len(df), stratify=df["category"], test_size=0.2, random_state=42)
+        test = df.iloc[test_idx]
+        artifacts.save_frame("test", test)
+    pipeline = joblib.load(MODEL_PATH)
+    y_proba = pipeline.predict_proba(test["text"])
+    y_pred = pipeline.classes_[y_proba.argmax(axis=1)]
+    artifacts.save_predictions("text_classifier", test["category"].to_numpy(), y_pred, y_proba, pipeline.classes_,
+                               model_key=model_key)
+    predictions = artifacts.load_predictions("text_classifier", model_key=model_key)
+    print(f" Predictions saved to {artifacts.path}")
+else:
+    print(f" Loaded predictions from {artifacts.path}")
+
+y_test, y_pred, classes = predictions["y_true"], predictions["y_pred"], predictions["classes"]
 
 
 print(" Accuracy:", accuracy_score(y_test, y_pred))
 print("\n Classification Report:\n", classification_report(y_test, y_pred))
 
 
-cm = confusion_matrix(y_test, y_pred, labels=pipeline.classes_)
+cm = confusion_matrix(y_test, y_pred, labels=classes)
 plt.figure(figsize=(12, 10))
 sns.heatmap(cm, annot=False, fmt="d", cmap="Blues",
-            xticklabels=pipeline.classes_,
-            yticklabels=pipeline.classes_)
+            xticklabels=classes,
+            yticklabels=classes)
 plt.xlabel("Predicted")
 plt.ylabel("True")
 plt.title("Confusion Matrix - News Classifier")
@@ -1,4 +1,9 @@
+import os
+import sys
+
 import joblib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
 from text_processing import preprocess_series
 
 pipeline = joblib.load("models/text_classifier.pkl")
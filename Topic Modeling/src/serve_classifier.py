@@ -0,0 +1,261 @@
+"""
+Local inference service for the topic classifier.
+
+The pipeline (a joblib pickle, or a compact artifact directory whose pages
+are shared by every process serving it) is loaded once. Incoming requests are queued and a single
+worker thread drains the queue into micro-batches: it waits up to
+``--batch-window`` ms (or until ``--max-batch`` texts are queued) and scores
+the whole batch with one ``pipeline.predict_proba`` call.
+
+    python src/serve_classifier.py --port 8000 --batch-window 5
+    python src/serve_classifier.py --model models/text_classifier.compact
+    curl -s localhost:8000/predict -d '{"texts": ["NASA found water on Mars"], "k": 3}'
+    curl -s localhost:8000/metrics
+
+    # CLI: one text per line on stdin, one JSON result per line on stdout
+    python src/serve_classifier.py --stdin < texts.txt
+"""
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from modeling.compact import load_model
+
+
+MODEL_PATH = "models/text_classifier.pkl"
+DEFAULT_TOP_K = 3
+
+
+def top_k(proba, classes, k):
+    """The ``k`` most probable categories for each row of ``proba``"""
+    k = max(1, min(k, len(classes)))
+    order = np.argsort(-proba, axis=1)[:, :k]
+    return [
+        [{"category": str(classes[j]), "probability": round(float(row[j]), 6)} for j in best]
+        for row, best in zip(proba, order)
+    ]
+
+
+class Metrics:
+    """Request latency, batch sizes and throughput over the most recent ``window`` requests"""
+
+    def __init__(self, window=10000):
+        self.lock = threading.Lock()
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.latencies = deque(maxlen=self.window)
+            self.batch_sizes = deque(maxlen=self.window)
+            self.requests = self.texts = self.batches = self.errors = 0
+            self.started = time.time()
+
+    def record_batch(self, size, latencies):
+        with self.lock:
+            self.batches += 1
+            self.texts += size
+            self.requests += len(latencies)
+            self.batch_sizes.append(size)
+            self.latencies.extend(latencies)
+
+    def record_error(self):
+        with self.lock:
+            self.errors += 1
+
+    def snapshot(self):
+        with self.lock:
+            latencies = np.array(self.latencies) * 1000
+            sizes = np.array(self.batch_sizes)
+            uptime = time.time() - self.started
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+            return {
+                "uptime_s": round(uptime, 3),
+                "requests": self.requests,
+                "texts": self.texts,
+                "batches": self.batches,
+                "errors": self.errors,
+                "requests_per_s": round(self.requests / uptime, 2) if uptime else 0.0,
+                "texts_per_s": round(self.texts / uptime, 2) if uptime else 0.0,
+                "mean_batch_size": round(float(sizes.mean()), 2) if len(sizes) else 0.0,
+                "latency_ms": {"p50": round(float(p50), 3), "p90": round(float(p90), 3),
+                               "p99": round(float(p99), 3)},
+            }
+
+
+class MicroBatcher:
+    """
+    Collects concurrent ``submit`` calls into batched ``predict_proba`` calls.
+    Each request's texts stay together in one batch.
+    """
+
+    def __init__(self, pipeline, batch_window=0.005, max_batch=64, metrics=None):
+        self.pipeline = pipeline
+        self.classes = pipeline.classes_
+        self.batch_window, self.max_batch = batch_window, max_batch
+        self.metrics = metrics or Metrics()
+        self.queue = queue.Queue()
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def submit(self, texts, k=DEFAULT_TOP_K):
+        """A Future resolving to the top-``k`` predictions for ``texts``"""
+        future = Future()
+        self.queue.put((list(texts), k, future, time.perf_counter()))
+        return future
+
+    def predict(self, texts, k=DEFAULT_TOP_K, timeout=None):
+        return self.submit(texts, k).result(timeout)
+
+    def close(self):
+        self.queue.put(None)
+        self.worker.join()
+
+    def _collect(self):
+        first = self.queue.get()
+        if first is None:
+            return None
+        batch, size = [first], len(first[0])
+        deadline = time.perf_counter() + self.batch_window
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self.queue.put(None)
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            texts = [text for item in batch for text in item[0]]
+            try:
+                proba = self.pipeline.predict_proba(texts) if texts else np.empty((0, len(self.classes)))
+            except Exception as e:
+                for _, _, future, _ in batch:
+                    future.set_exception(e)
+                    self.metrics.record_error()
+                continue
+            done = time.perf_counter()
+            start = 0
+            for item_texts, k, future, _ in batch:
+                end = start + len(item_texts)
+                future.set_result(top_k(proba[start:end], self.classes, k))
+                start = end
+            self.metrics.record_batch(len(texts), [done - submitted for *_, submitted in batch])
+
+
+def make_handler(batcher, default_k, timeout):
+
+    class ClassifierHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                return self._send(200, batcher.metrics.snapshot())
+            if self.path == "/health":
+                return self._send(200, {"status": "ok", "classes": len(batcher.classes)})
+            return self._send(404, {"error": f"unknown path {self.path}"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                return self._send(404, {"error": f"unknown path {self.path}"})
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                texts = request["texts"] if "texts" in request else [request["text"]]
+                if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                    raise ValueError("'texts' must be a list of strings")
+                k = int(request.get("k", default_k))
+            except (KeyError, ValueError, TypeError) as e:
+                return self._send(400, {"error": f"bad request: {e}"})
+            try:
+                predictions = batcher.predict(texts, k, timeout)
+            except Exception as e:
+                return self._send(500, {"error": str(e)})
+            self._send(200, {"predictions": predictions})
+
+    return ClassifierHandler
+
+
+class ClassifierServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under bursts (1s+ SYN retries)
+    request_queue_size = 128
+
+
+def make_server(batcher, host="127.0.0.1", port=8000, default_k=DEFAULT_TOP_K, timeout=30):
+    return ClassifierServer((host, port), make_handler(batcher, default_k, timeout))
+
+
+def serve_stdin(batcher, k):
+    """Score stdin line by line; lines are submitted as they arrive so they batch together"""
+    pending = deque()
+    for line in sys.stdin:
+        text = line.rstrip("\n")
+        pending.append((text, batcher.submit([text], k)))
+        while pending and pending[0][1].done():
+            text, future = pending.popleft()
+            print(json.dumps({"text": text, "predictions": future.result()[0]}), flush=True)
+    for text, future in pending:
+        print(json.dumps({"text": text, "predictions": future.result()[0]}), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=MODEL_PATH, help="joblib pickle or compact artifact directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--batch-window", type=float, default=5.0, help="max ms to wait for a batch to fill")
+    parser.add_argument("--max-batch", type=int, default=64, help="max texts per predict_proba call")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--stdin", action="store_true", help="score lines from stdin instead of serving HTTP")
+    args = parser.parse_args()
+
+    pipeline = load_model(args.model)
+    batcher = MicroBatcher(pipeline, args.batch_window / 1000, args.max_batch)
+    if args.stdin:
+        serve_stdin(batcher, args.top_k)
+        batcher.close()
+        print(json.dumps(batcher.metrics.snapshot()), file=sys.stderr)
+        return
+
+    server = make_server(batcher, args.host, args.port, args.top_k)
+    print(f"🚀 Serving {args.model} ({len(batcher.classes)} categories) on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+        print(f"📈 {batcher.metrics.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
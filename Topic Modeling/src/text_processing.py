@@ -1,27 +1,97 @@
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+import re
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 
+# The repository root must be on sys.path (the entry-point scripts add it)
+from preprocessing.cache import cached_map
+from preprocessing.nltk_resources import ensure, tokenizer
 
-nltk.download("punkt")
-nltk.download("stopwords")
-nltk.download("wordnet")
+# Bump whenever nlp_preprocess output changes; it keys cached results.
+PREPROCESS_VERSION = 1
+
+
+# NLTK (slow to import) and its data are loaded on first use, so importing
+# this module is fast and needs no network
+stop_words = word_tokenize = contractions = lemmatizer = None
+
+
+def load_resources():
+    """Load the tokenizer, stopword list and lemmatizer from local NLTK data"""
+    global stop_words, word_tokenize, contractions, lemmatizer
+    if lemmatizer is None:
+        ensure("stopwords", "wordnet", tokenizer())
+        import nltk
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
+        from nltk.tokenize import NLTKWordTokenizer
+
+        stop_words = set(stopwords.words("english"))
+        word_tokenize = nltk.word_tokenize
+        contractions = NLTKWordTokenizer.CONTRACTIONS2 + NLTKWordTokenizer.CONTRACTIONS3
+        lemmatizer = WordNetLemmatizer()
+
+# Lower-cased text made only of ASCII letters and whitespace: word_tokenize
+# splits it exactly on whitespace, except for the few words its contraction
+# rules break up ("cannot" -> "can not", "gonna" -> "gon na"). Such text is
+# split directly and each distinct word is processed once through the memo
+# tables below.
+SIMPLE_TEXT = re.compile(r"[a-z\s]*")
+CHUNK_SIZE = 2000
+
+
+class _LemmaTable(dict):
+    """token -> lemma, or "" when the token is dropped"""
+
+    def __missing__(self, token):
+        lemma = lemmatizer.lemmatize(token) if token.isalpha() and token not in stop_words else ""
+        self[token] = lemma
+        return lemma
+
+
+class _WordTable(dict):
+    """whitespace-separated word -> its processed tokens joined with spaces"""
+
+    def __missing__(self, word):
+        padded = f" {word} "
+        tokens = word_tokenize(word) if any(p.search(padded) for p in contractions) else [word]
+        result = " ".join(filter(None, map(_lemmas.__getitem__, tokens)))
+        self[word] = result
+        return result
+
+
+_lemmas = _LemmaTable()
+_words = _WordTable()
 
-stop_words = set(stopwords.words("english"))
-lemmatizer = WordNetLemmatizer()
 
 def nlp_preprocess(text):
     """Tokenize, clean, remove stopwords, lemmatize"""
     if not isinstance(text, str):
         return ""
-    
-    tokens = nltk.word_tokenize(text.lower())
-    tokens = [t for t in tokens if t.isalpha() and t not in stop_words]
-    tokens = [lemmatizer.lemmatize(t) for t in tokens]
-    return " ".join(tokens)
+    if lemmatizer is None:
+        load_resources()
+
+    text = text.lower()
+    if SIMPLE_TEXT.fullmatch(text):
+        return " ".join(filter(None, map(_words.__getitem__, text.split())))
+    return " ".join(filter(None, map(_lemmas.__getitem__, word_tokenize(text))))
+
+
+def nlp_preprocess_batch(texts, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    nlp_preprocess over a list of texts. With ``workers`` > 1 large batches are
+    split into chunks and processed in a process pool (each worker keeps its
+    own memo tables).
+    """
+    texts = list(texts)
+    load_resources()
+    if not workers or workers <= 1 or len(texts) <= chunk_size:
+        return [nlp_preprocess(t) for t in texts]
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [result for chunk in pool.map(nlp_preprocess_batch, chunks) for result in chunk]
 
-def preprocess_series(X):
-    """Apply nlp_preprocess to a list/Series"""
-    return [nlp_preprocess(t) for t in X]
 
-print("Text preprocessing functions ready.")
\ No newline at end of file
+def preprocess_series(X, cache=None, workers=None):
+    """Apply nlp_preprocess to a list/Series, reusing cached results for unchanged texts"""
+    return cached_map(partial(nlp_preprocess_batch, workers=workers), X,
+                      "text_processing.nlp_preprocess", PREPROCESS_VERSION, cache, batched=True)
@@ -1,8 +1,8 @@
 # training/train_classifier.py
 
 import os
+import sys
 import pandas as pd
-import nltk
 import joblib
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -10,24 +10,22 @@ import seaborn as sns
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, confusion_matrix
 
-# Ensure NLTK data
-nltk.download("punkt")
-nltk.download("stopwords")
-nltk.download("wordnet")
-nltk.download("punkt_tab")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from modeling.compact import export_compact
+from modeling.artifacts import Artifacts, clean_labelled, file_key
 
-INPUT_CSV = "req_data\processed\20news_18828_clean.csv"
+INPUT_PATH = os.path.join("req_data", "processed", "20news_18828_clean.parquet")
 MODEL_PATH = os.path.join("models", "text_classifier.pkl")
+COMPACT_PATH = os.path.join("models", "text_classifier.compact")
 CONF_MATRIX_PATH = os.path.join("models", "confusion_matrix.png")
 
 # ===================
 # 1. Load Dataset & Inspect Columns
 # ===================
-print(f"📂 Loading dataset: {INPUT_CSV}")
-df = pd.read_csv(INPUT_CSV)
+print(f"📂 Loading dataset: {INPUT_PATH}")
+df = pd.read_parquet(INPUT_PATH)
 
 print(f"📋 Available columns: {list(df.columns)}")
 print(f"📊 Dataset shape: {df.shape}")
@@ -80,18 +78,13 @@ print(f"🏷️  Using target column: '{target_col}'")
 # ===================
 # 3. Data Cleaning
 # ===================
-# Drop rows with missing or empty text
+# Drop rows with missing or empty text, and categories with <2 samples (needed for stratified split)
 initial_rows = len(df)
-df = df.dropna(subset=[text_col, target_col])
-df = df[df[text_col].str.strip() != ""]
-
-print(f"🧹 Dropped {initial_rows - len(df)} rows with missing/empty data")
-
-# Drop categories with <2 samples (needed for stratified split)
 initial_categories = df[target_col].nunique()
-df = df.groupby(target_col).filter(lambda x: len(x) > 1)
+df = clean_labelled(df, text_col, target_col)
 final_categories = df[target_col].nunique()
 
+print(f"🧹 Dropped {initial_rows - len(df)} rows with missing/empty data or rare categories")
 print(f"📊 Categories: {initial_categories} → {final_categories}")
 
 if len(df) == 0:
@@ -107,17 +100,18 @@ print(y.value_counts().head(10))
 # ===================
 # 4. Train-Test Split
 # ===================
+# Index arrays are cached per input file hash and shared with evaluate_classifier.py
+artifacts = Artifacts("topic", file_key(INPUT_PATH))
 try:
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
-    print(f"✅ Train set: {len(X_train)}, Test set: {len(X_test)}")
+    train_idx, test_idx = artifacts.split(len(df), stratify=y, test_size=0.2, random_state=42)
+    print(f"✅ Train set: {len(train_idx)}, Test set: {len(test_idx)}")
 except ValueError as e:
     print(f"⚠️  Stratified split failed: {e}")
     print("Using random split instead...")
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=None
-    )
+    train_idx, test_idx = artifacts.split(len(df), stratify=None, test_size=0.2, random_state=42)
+
+X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
+y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
 
 # ===================
 # 5. Pipeline
@@ -133,8 +127,9 @@ pipeline.fit(X_train, y_train)
 # ===================
 # 6. Evaluation
 # ===================
-y_pred = pipeline.predict(X_test)
-accuracy = pipeline.score(X_test, y_test)
+y_proba = pipeline.predict_proba(X_test)
+y_pred = pipeline.classes_[y_proba.argmax(axis=1)]
+accuracy = (y_pred == y_test.to_numpy()).mean()
 
 print(f"\n🎯 Accuracy: {accuracy:.4f}")
 print("\n📊 Classification Report:")
@@ -181,6 +176,14 @@ try:
     os.makedirs("models", exist_ok=True)
     joblib.dump(pipeline, MODEL_PATH)
     print(f"💾 Model saved to {MODEL_PATH}")
+    export_compact(pipeline, COMPACT_PATH)
+    print(f"💾 Memory-mappable copy saved to {COMPACT_PATH}")
+
+    # Test set and predictions for evaluate_classifier.py, tied to this model file
+    artifacts.save_frame("test", pd.DataFrame({"text": X_test.to_numpy(), "category": y_test.to_numpy()}))
+    artifacts.save_predictions("text_classifier", y_test.to_numpy(), y_pred, y_proba, pipeline.classes_,
+                               model_key=file_key(MODEL_PATH))
+    print(f"💾 Test split and predictions saved to {artifacts.path}")
     
     # Save column mapping for future reference
     column_info = {
@@ -0,0 +1,273 @@
+"""
+Out-of-core training for the topic classifier.
+
+The corpus is streamed in chunks through a stateless ``HashingVectorizer``
+into an ``SGDClassifier`` (logistic loss, averaged) with ``partial_fit``, so
+memory is bounded by the chunk and shuffle buffer sizes, not the corpus.
+Hashed chunks of the first epoch are spilled to a temp dir and later epochs
+replay them in random order instead of re-reading and re-hashing the text.
+A fixed 20% of documents (by text hash, so no index of the corpus is
+needed) is held out and scored in a final streaming pass.
+
+The saved model is a regular Pipeline (same predict/predict_proba API as
+text_classifier.pkl). It can be warm-started on new labelled data without
+a refit:
+
+    python src/train_streaming.py
+    python src/train_streaming.py --input big_corpus.parquet --epochs 5
+    python src/train_streaming.py --update new_posts.parquet
+    python src/train_streaming.py --update-from-store ../NerrativeNexus/data --label-field category
+
+Updates skip the documents held out at training time and re-score the
+original file's held-out documents, so ``<model>.json`` stays accurate.
+Store updates use records whose ``metadata.<field>`` (or, for CSV uploads,
+``metadata.fields.<field>``) holds a known category, and resume after the
+last record already learned from.
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "NerrativeNexus"))
+
+INPUT_PATH = os.path.join("req_data", "processed", "20news_18828_clean.parquet")
+MODEL_PATH = os.path.join("models", "text_classifier_streaming.pkl")
+N_FEATURES = 2 ** 18
+HOLDOUT_BUCKETS = 1000
+
+
+def make_pipeline(n_features=N_FEATURES, alpha=1e-5, random_state=42):
+    return Pipeline([
+        ("hashing", HashingVectorizer(n_features=n_features, alternate_sign=False, stop_words="english",
+                                      dtype=np.float32)),
+        ("clf", SGDClassifier(loss="log_loss", alpha=alpha, average=True, random_state=random_state)),
+    ])
+
+
+def state_path(model_path):
+    return os.path.splitext(model_path)[0] + ".json"
+
+
+def is_holdout(text, test_fraction):
+    digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % HOLDOUT_BUCKETS < test_fraction * HOLDOUT_BUCKETS
+
+
+def iter_labelled(path, text_col="text", target_col="category", chunk_size=2000):
+    """Yield ``(texts, labels)`` chunks of a Parquet or CSV file, skipping empty rows"""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        batches = (batch.to_pandas() for batch in
+                   pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=[text_col, target_col]))
+    else:
+        batches = pd.read_csv(path, usecols=[text_col, target_col], chunksize=chunk_size)
+    for df in batches:
+        df = df.dropna(subset=[text_col, target_col])
+        df = df[df[text_col].str.strip() != ""]
+        if len(df):
+            yield df[text_col].tolist(), df[target_col].astype(str).tolist()
+
+
+def iter_store_labelled(data_dir, label_field, after_rowid=0, chunk_size=2000, last=None):
+    """
+    Yield ``(texts, labels)`` chunks of stored records that carry a label.
+    ``last`` (a dict) receives the highest rowid read under ``"rowid"``.
+    """
+    from record_store import open_record_store
+
+    log, store = open_record_store(data_dir)
+    try:
+        for rowid, records in store.iter_batches(chunk_size, after_rowid=after_rowid):
+            texts, labels = [], []
+            for record in records:
+                metadata = record.get("metadata") or {}
+                label = metadata.get(label_field) or (metadata.get("fields") or {}).get(label_field)
+                if label and (record.get("text") or "").strip():
+                    texts.append(record["text"])
+                    labels.append(str(label))
+            if last is not None:
+                last["rowid"] = rowid
+            if texts:
+                yield texts, labels
+    finally:
+        log.close()
+        store.close()
+
+
+def read_classes(path, target_col="category"):
+    if path.endswith(".parquet"):
+        labels = pd.read_parquet(path, columns=[target_col])[target_col]
+    else:
+        labels = pd.concat(chunk[target_col] for chunk in pd.read_csv(path, usecols=[target_col], chunksize=100_000))
+    return np.array(sorted(labels.dropna().astype(str).unique()))
+
+
+def shuffled(chunks, buffer_rows, chunk_size, rng):
+    """Re-chunk a stream through a shuffle buffer so sorted input (e.g. by category) is mixed"""
+    texts, labels = [], []
+    for chunk_texts, chunk_labels in chunks:
+        texts += chunk_texts
+        labels += chunk_labels
+        if len(texts) >= buffer_rows:
+            order = rng.permutation(len(texts))
+            for start in range(0, len(order), chunk_size):
+                part = order[start:start + chunk_size]
+                yield [texts[i] for i in part], [labels[i] for i in part]
+            texts, labels = [], []
+    order = rng.permutation(len(texts))
+    for start in range(0, len(order), chunk_size):
+        part = order[start:start + chunk_size]
+        yield [texts[i] for i in part], [labels[i] for i in part]
+
+
+def fit_stream(pipeline, chunks, epochs=1, test_fraction=0.0, buffer_rows=20000, chunk_size=2000, seed=42,
+               classes=None):
+    """
+    ``partial_fit`` ``pipeline`` on a stream of ``(texts, labels)`` chunks for
+    ``epochs`` passes. Held-out documents are skipped. ``classes`` is required
+    for an untrained pipeline. Returns the number of training documents per epoch.
+    """
+    vectorizer, clf = pipeline.named_steps["hashing"], pipeline.named_steps["clf"]
+    if classes is None:
+        classes = clf.classes_
+    rng = np.random.RandomState(seed)
+    seen = 0
+    with tempfile.TemporaryDirectory(prefix="train_streaming_") as spill:
+        spilled = []
+        for texts, labels in shuffled(chunks, buffer_rows, chunk_size, rng):
+            if test_fraction:
+                keep = [i for i, text in enumerate(texts) if not is_holdout(text, test_fraction)]
+                texts, labels = [texts[i] for i in keep], [labels[i] for i in keep]
+            if not texts:
+                continue
+            unknown = set(labels) - set(classes)
+            if unknown:
+                raise Exception(f"Unknown categories {sorted(unknown)}; retrain with them from scratch")
+            X, y = vectorizer.transform(texts), np.array(labels)
+            clf.partial_fit(X, y, classes=classes)
+            seen += len(y)
+            if epochs > 1:
+                name = os.path.join(spill, f"{len(spilled):06d}")
+                sp.save_npz(name + ".npz", X, compressed=False)
+                np.save(name + ".npy", y)
+                spilled.append(name)
+        for _ in range(epochs - 1):
+            for i in rng.permutation(len(spilled)):
+                X, y = sp.load_npz(spilled[i] + ".npz"), np.load(spilled[i] + ".npy")
+                order = rng.permutation(len(y))
+                clf.partial_fit(X[order], y[order])
+    return seen
+
+
+def evaluate_stream(pipeline, chunks, test_fraction):
+    """Accuracy on the held-out documents of a stream"""
+    correct = total = 0
+    for texts, labels in chunks:
+        held = [(text, label) for text, label in zip(texts, labels) if is_holdout(text, test_fraction)]
+        if held:
+            predicted = pipeline.predict([text for text, _ in held])
+            correct += int((predicted == np.array([label for _, label in held])).sum())
+            total += len(held)
+    return correct / total if total else float("nan"), total
+
+
+def train(path, epochs=10, chunk_size=2000, buffer_rows=20000, test_fraction=0.2, n_features=N_FEATURES,
+          alpha=1e-5, text_col="text", target_col="category"):
+    """Train from scratch on ``path``; returns ``(pipeline, state)``"""
+    pipeline = make_pipeline(n_features, alpha)
+    start = time.perf_counter()
+    seen = fit_stream(pipeline, iter_labelled(path, text_col, target_col, chunk_size), epochs,
+                      test_fraction, buffer_rows, chunk_size, classes=read_classes(path, target_col))
+    seconds = time.perf_counter() - start
+    accuracy, held = evaluate_stream(pipeline, iter_labelled(path, text_col, target_col, chunk_size), test_fraction)
+    state = {"trained_on": [path], "documents": seen, "epochs": epochs, "test_fraction": test_fraction,
+             "holdout": held, "accuracy": accuracy, "train_seconds": round(seconds, 3), "store_rowid": 0}
+    return pipeline, state
+
+
+def save(pipeline, state, model_path=MODEL_PATH):
+    os.makedirs(os.path.dirname(model_path) or ".", exist_ok=True)
+    joblib.dump(pipeline, model_path)
+    with open(state_path(model_path), "w", encoding="utf-8") as f:
+        json.dump(dict(state, classes=list(pipeline.classes_)), f, indent=2)
+
+
+def load(model_path=MODEL_PATH):
+    with open(state_path(model_path), encoding="utf-8") as f:
+        return joblib.load(model_path), json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default=INPUT_PATH, help="Parquet or CSV with text and category columns")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--target-column", default="category")
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--buffer-rows", type=int, default=20000, help="shuffle buffer size")
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    parser.add_argument("--n-features", type=int, default=N_FEATURES)
+    parser.add_argument("--alpha", type=float, default=1e-5)
+    parser.add_argument("--update", help="warm-start the saved model on this labelled Parquet/CSV file")
+    parser.add_argument("--update-from-store", metavar="DATA_DIR", help="warm-start on labelled stored records")
+    parser.add_argument("--label-field", default="category", help="metadata field holding the label")
+    parser.add_argument("--update-epochs", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.update or args.update_from_store:
+        pipeline, state = load(args.model)
+        last = {"rowid": state.get("store_rowid", 0)}
+        if args.update:
+            chunks = iter_labelled(args.update, args.text_column, args.target_column, args.chunk_size)
+        else:
+            chunks = iter_store_labelled(args.update_from_store, args.label_field, last["rowid"],
+                                         args.chunk_size, last)
+        # Documents held out of the original training stay held out of updates
+        test_fraction = state.get("test_fraction", args.test_fraction)
+        start = time.perf_counter()
+        seen = fit_stream(pipeline, chunks, args.update_epochs, test_fraction, args.buffer_rows, args.chunk_size)
+        state["documents"] += seen
+        if args.update_from_store:
+            state["store_rowid"] = last["rowid"]
+        state["trained_on"].append(args.update or args.update_from_store)
+        original = state["trained_on"][0]
+        if os.path.isfile(original):
+            state["accuracy"], state["holdout"] = evaluate_stream(
+                pipeline, iter_labelled(original, args.text_column, args.target_column, args.chunk_size),
+                test_fraction)
+            state.pop("accuracy_stale", None)
+        else:
+            state["accuracy"], state["accuracy_stale"] = None, True
+        save(pipeline, state, args.model)
+        print(f"🔁 Updated {args.model} with {seen:,} documents in {time.perf_counter() - start:.2f}s")
+        if state["accuracy"] is None:
+            print(f"⚠️ {original} not found; held-out accuracy is stale")
+        else:
+            print(f"🎯 Held-out accuracy: {state['accuracy']:.4f} ({state['holdout']:,} documents)")
+        return
+
+    print(f"📂 Streaming {args.input} in chunks of {args.chunk_size:,}")
+    pipeline, state = train(args.input, args.epochs, args.chunk_size, args.buffer_rows, args.test_fraction,
+                            args.n_features, args.alpha, args.text_column, args.target_column)
+    save(pipeline, state, args.model)
+    print(f"🚀 Trained on {state['documents']:,} documents × {args.epochs} epochs in {state['train_seconds']:.2f}s")
+    print(f"🎯 Held-out accuracy: {state['accuracy']:.4f} ({state['holdout']:,} documents)")
+    print(f"💾 Model saved to {args.model}")
+
+
+if __name__ == "__main__":
+    main()
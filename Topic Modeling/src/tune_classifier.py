@@ -0,0 +1,358 @@
+"""
+Hyperparameter search for the topic classifier.
+
+The train/test split is the one train_classifier.py and
+evaluate_classifier.py share (see modeling/artifacts.py). Every vectorizer
+configuration is fitted once on the training split and the resulting
+train/test matrices are stored with the topic artifacts of the data file
+(``artifacts/topic/<data hash>/tune-<config>-*``), so classifier trials and
+later runs never refit TF-IDF. The (vectorizer × classifier) grid is run
+with successive halving: all configurations are trained on a small sample of
+the training split and scored on a validation slice of it, the best
+1/``--factor`` move on to ``--factor`` times more samples, and so on until
+the full split. The finalists are refitted on the whole training split and
+scored on the test split, which is never used for selection.
+
+Trials run in parallel across all cores, as many as fit in the available
+memory (``--trial-memory-mb`` each); workers load the cached matrices from
+disk instead of receiving copies. A trial that fails (e.g. MemoryError) is
+recorded on the leaderboard instead of aborting the search. If a worker is
+killed, the unfinished trials are retried with half the workers; with one
+worker each trial gets its own process, so only the trial that was killed
+fails. A leaderboard with validation and test accuracy, fit time and predict latency
+is written as CSV.
+
+    python src/tune_classifier.py
+    python src/tune_classifier.py --jobs 8 --factor 3 --finalists 5 --save-best models/text_classifier.pkl
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import itertools
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from joblib import Parallel, delayed
+from joblib.externals.loky import get_reusable_executor
+from joblib.externals.loky.process_executor import TerminatedWorkerError
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.naive_bayes import ComplementNB
+from sklearn.pipeline import Pipeline
+from sklearn.svm import LinearSVC
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from modeling.artifacts import Artifacts, clean_labelled, file_key
+
+INPUT_PATH = os.path.join("req_data", "processed", "20news_18828_clean.parquet")
+LEADERBOARD_PATH = os.path.join("models", "tuning_leaderboard.csv")
+
+VECTORIZER_GRID = {
+    # Capped: unlimited (1, 2)-gram vocabularies need over 1 GB per logreg trial
+    "max_features": [5000, 20000, 100000],
+    "ngram_range": [(1, 1), (1, 2)],
+    "sublinear_tf": [False, True],
+}
+CLASSIFIER_GRID = {
+    "logreg": (LogisticRegression, {"C": [1, 10, 100], "max_iter": [1000], "random_state": [42]}),
+    "linear_svc": (LinearSVC, {"C": [0.1, 0.5, 1], "random_state": [42]}),
+    "sgd": (SGDClassifier, {"loss": ["log_loss", "modified_huber"], "alpha": [1e-5, 1e-4], "random_state": [42]}),
+    "complement_nb": (ComplementNB, {"alpha": [0.1, 0.3, 1.0]}),
+}
+LATENCY_SAMPLES = 50
+TRIAL_MEMORY_MB = 1200
+
+
+def expand(grid):
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def load_split(path, test_size=0.2, random_state=42):
+    """
+    The cleaning and split train_classifier.py uses, loaded from the topic
+    artifacts of ``path``. Returns ``(artifacts, X_train, X_test, y_train, y_test)``.
+    """
+    artifacts = Artifacts("topic", file_key(path))
+    df = clean_labelled(pd.read_parquet(path, columns=["text", "category"]), "text", "category")
+    train_idx, test_idx = artifacts.split(len(df), stratify=df["category"], test_size=test_size,
+                                          random_state=random_state)
+    texts, labels = df["text"].to_numpy(), df["category"].to_numpy()
+    return artifacts, texts[train_idx].tolist(), texts[test_idx].tolist(), labels[train_idx], labels[test_idx]
+
+
+def median_latency(func, items):
+    times = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+class FeatureCache:
+    """
+    Vectorized train/test matrices of one split, stored through ``artifacts``
+    under a ``tune-<config>`` prefix per vectorizer configuration
+    """
+
+    def __init__(self, artifacts, X_train, y_train, X_test, y_test):
+        self.artifacts = artifacts
+        self.data = (X_train, y_train, X_test, y_test)
+
+    def prefix(self, params):
+        split = [len(self.data[0]), len(self.data[2])]
+        key = hashlib.blake2b(json.dumps([params, split], sort_keys=True).encode(), digest_size=8).hexdigest()
+        return f"tune-{key}-"
+
+    def ensure(self, params):
+        """``(artifacts, prefix)`` of the matrices for ``params``; vectorizes only on a cache miss"""
+        features = (self.artifacts, self.prefix(params))
+        if self.artifacts.exists(features[1] + "meta.parquet"):
+            return features, False
+        X_train, y_train, X_test, y_test = self.data
+        vectorizer = TfidfVectorizer(stop_words="english", **params)
+        start = time.perf_counter()
+        train = vectorizer.fit_transform(X_train)
+        fit_seconds = time.perf_counter() - start
+        test = vectorizer.transform(X_test)
+        latency = median_latency(lambda text: vectorizer.transform([text]), X_test[:LATENCY_SAMPLES])
+        artifacts, prefix = features
+        artifacts.save_matrix(prefix + "X_train", train)
+        artifacts.save_matrix(prefix + "X_test", test)
+        artifacts.save_matrix(prefix + "y_train", y_train.astype(str))
+        artifacts.save_matrix(prefix + "y_test", y_test.astype(str))
+        artifacts.save_object(prefix + "vectorizer", vectorizer)
+        # Written last: marks the configuration as complete
+        artifacts.save_frame(prefix + "meta", pd.DataFrame([{
+            "params": json.dumps(params), "features": train.shape[1], "fit_seconds": fit_seconds,
+            "transform_ms": latency * 1000}]))
+        return features, True
+
+
+def load_features(features, test=False):
+    artifacts, prefix = features
+    split = "test" if test else "train"
+    return artifacts.load_matrix(f"{prefix}X_{split}"), artifacts.load_matrix(f"{prefix}y_{split}")
+
+
+def run_trial(features, classifier, params, train_rows, eval_rows=None):
+    """
+    Fit ``classifier(**params)`` on ``train_rows`` of the cached training
+    matrix. Scores on ``eval_rows`` of it, or on the test matrix when None.
+    """
+    X, y = load_features(features)
+    model = CLASSIFIER_GRID[classifier][0](**params)
+    start = time.perf_counter()
+    model.fit(X[train_rows], y[train_rows])
+    fit_seconds = time.perf_counter() - start
+    X_eval, y_eval = (X[eval_rows], y[eval_rows]) if eval_rows is not None else load_features(features, True)
+    start = time.perf_counter()
+    accuracy = float((model.predict(X_eval) == y_eval).mean())
+    batch_ms = (time.perf_counter() - start) * 1000 / X_eval.shape[0]
+    single_ms = median_latency(lambda i: model.predict(X_eval[i:i + 1]), range(min(LATENCY_SAMPLES, X_eval.shape[0])))
+    return {"accuracy": accuracy, "fit_seconds": fit_seconds, "batch_ms_per_doc": batch_ms,
+            "predict_ms": single_ms * 1000}
+
+
+def try_trial(*args):
+    """``run_trial``, with a failure (e.g. MemoryError) returned as ``{"error": ...}`` instead of raised"""
+    try:
+        return run_trial(*args)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def available_memory():
+    """Available RAM in bytes, or None where it can't be read"""
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def memory_jobs(jobs, trial_memory_mb=TRIAL_MEMORY_MB):
+    """``jobs`` (-1: all cores) capped so that parallel trials fit in the available memory"""
+    jobs = (os.cpu_count() or 1) if jobs < 0 else jobs
+    available = available_memory()
+    if available is None:
+        return jobs
+    return max(1, min(jobs, available // (trial_memory_mb << 20)))
+
+
+def run_isolated(task):
+    """``try_trial`` in a separate worker process, so a killed worker only fails this trial"""
+    try:
+        return get_reusable_executor(max_workers=1).submit(try_trial, *task).result()
+    except TerminatedWorkerError:
+        return {"error": "worker died (out of memory?)"}
+
+
+def run_trials(tasks, jobs):
+    """
+    Run ``try_trial`` argument tuples in parallel; returns ``(results, jobs)``.
+    If a worker dies (e.g. killed for memory), finished results are kept and
+    the rest are retried with half the workers, which are also used from then
+    on. With one worker each trial runs isolated.
+    """
+    results = []
+    while len(results) < len(tasks):
+        if jobs == 1:
+            results += [run_isolated(task) for task in tasks[len(results):]]
+            break
+        try:
+            for result in Parallel(n_jobs=jobs, return_as="generator")(
+                    delayed(try_trial)(*task) for task in tasks[len(results):]):
+                results.append(result)
+        except TerminatedWorkerError:
+            jobs = max(1, jobs // 2)
+            print(f"⚠️ A worker died; retrying {len(tasks) - len(results)} trials with {jobs} workers")
+    return results, jobs
+
+
+def successive_halving(trials, n_train, jobs, factor=3, min_samples=300, validation=0.2, seed=42):
+    """
+    Run ``trials`` (dicts with features/classifier/params) through
+    successive halving on the training split. Returns every trial with the
+    largest sample size it reached and its validation scores there (or the
+    ``error`` it failed with), and the number of workers still in use.
+    """
+    rng = np.random.RandomState(seed)
+    order = rng.permutation(n_train)
+    n_val = int(n_train * validation)
+    val_rows, fit_rows = order[:n_val], order[n_val:]
+    sizes = []
+    size = len(fit_rows)
+    while True:
+        sizes.append(size)
+        size //= factor
+        if size < min_samples:
+            break
+    sizes.reverse()
+
+    alive = list(trials)
+    for rung, size in enumerate(sizes):
+        results, jobs = run_trials(
+            [(t["features"], t["classifier"], t["params"], fit_rows[:size], val_rows) for t in alive], jobs)
+        for trial, result in zip(alive, results):
+            if "error" in result:
+                # Keeps the rung and scores it last reached, if any
+                trial.setdefault("rung", rung)
+                trial.setdefault("samples", int(size))
+                trial["error"] = result["error"]
+            else:
+                trial.update(rung=rung, samples=int(size), **{f"val_{k}": v for k, v in result.items()})
+        failed = [t for t in alive if "error" in t]
+        alive = [t for t in alive if "error" not in t]
+        if not alive:
+            raise Exception(f"Every trial failed in rung {rung}, e.g. {failed[0]['error']}")
+        print(f"🪜 Rung {rung}: {len(alive)} configs on {size:,} samples, "
+              f"best validation accuracy {max(t['val_accuracy'] for t in alive):.4f}"
+              + (f", {len(failed)} failed" if failed else ""))
+        if rung < len(sizes) - 1:
+            alive = sorted(alive, key=lambda t: -t["val_accuracy"])[:max(1, len(alive) // factor)]
+    return trials, jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default=INPUT_PATH)
+    parser.add_argument("--leaderboard", default=LEADERBOARD_PATH)
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel trials (-1: all cores), capped by memory")
+    parser.add_argument("--trial-memory-mb", type=int, default=TRIAL_MEMORY_MB,
+                        help="memory to reserve per parallel trial")
+    parser.add_argument("--factor", type=int, default=3, help="keep 1/factor of configs per rung")
+    parser.add_argument("--min-samples", type=int, default=300, help="training samples in the first rung")
+    parser.add_argument("--finalists", type=int, default=5, help="configs refitted on the full split and tested")
+    parser.add_argument("--save-best", help="save the best finalist as a Pipeline to this path")
+    args = parser.parse_args()
+
+    artifacts, X_train, X_test, y_train, y_test = load_split(args.input)
+    cache = FeatureCache(artifacts, X_train, y_train, X_test, y_test)
+    vectorizer_configs = expand(VECTORIZER_GRID)
+    print(f"📂 {len(X_train):,} train / {len(X_test):,} test documents, "
+          f"{len(vectorizer_configs)} vectorizer configs")
+
+    start = time.perf_counter()
+    feature_sets = []
+    for params in vectorizer_configs:
+        features, built = cache.ensure(params)
+        feature_sets.append(features)
+        print(f"{'🧮 Vectorized' if built else '♻️ Cached'} {params}")
+    print(f"⏱️ Features ready in {time.perf_counter() - start:.1f}s")
+
+    trials = [
+        {"features": features, "vectorizer": params, "classifier": name, "params": clf_params}
+        for features, params in zip(feature_sets, vectorizer_configs)
+        for name, (_, grid) in CLASSIFIER_GRID.items()
+        for clf_params in expand(grid)
+    ]
+    jobs = memory_jobs(args.jobs, args.trial_memory_mb)
+    print(f"🔎 {len(trials)} configurations, successive halving with factor {args.factor}, {jobs} workers")
+    start = time.perf_counter()
+    _, jobs = successive_halving(trials, len(X_train), jobs, args.factor, args.min_samples)
+
+    last_rung = max(t["rung"] for t in trials)
+    finalists = sorted((t for t in trials if t["rung"] == last_rung and "error" not in t),
+                       key=lambda t: -t["val_accuracy"])
+    finalists = finalists[:args.finalists]
+    all_rows = np.arange(len(X_train))
+    results, _ = run_trials([(t["features"], t["classifier"], t["params"], all_rows) for t in finalists], jobs)
+    for trial, result in zip(finalists, results):
+        if "error" in result:
+            trial["error"] = result["error"]
+        else:
+            trial.update({f"test_{k}": v for k, v in result.items()})
+    print(f"⏱️ Search finished in {time.perf_counter() - start:.1f}s")
+
+    transform_ms = {prefix: artifacts.load_frame(prefix + "meta")["transform_ms"].iloc[0]
+                    for artifacts, prefix in feature_sets}
+    rows = []
+    for t in trials:
+        row = {
+            "vectorizer": json.dumps(t["vectorizer"]), "classifier": t["classifier"], "params": json.dumps(t["params"]),
+            "rung": t["rung"], "samples": t["samples"], "val_accuracy": t.get("val_accuracy"),
+            "test_accuracy": t.get("test_accuracy"),
+            "fit_seconds": t.get("test_fit_seconds", t.get("val_fit_seconds")),
+            "predict_ms": transform_ms[t["features"][1]] + t.get("test_predict_ms", t.get("val_predict_ms", np.nan)),
+            "batch_ms_per_doc": t.get("test_batch_ms_per_doc", t.get("val_batch_ms_per_doc")),
+            "error": t.get("error"),
+        }
+        rows.append(row)
+    board = pd.DataFrame(rows).sort_values(["test_accuracy", "rung", "val_accuracy"], ascending=False,
+                                           na_position="last").reset_index(drop=True)
+    os.makedirs(os.path.dirname(args.leaderboard) or ".", exist_ok=True)
+    board.to_csv(args.leaderboard, index_label="rank")
+    with pd.option_context("display.width", 200, "display.max_colwidth", 60):
+        print(board.head(10).to_string(float_format=lambda v: f"{v:.4f}"))
+    print(f"📋 Leaderboard ({len(board)} configurations) saved to {args.leaderboard}")
+
+    if args.save_best:
+        # Chosen on validation accuracy like the rest of the search; the serving
+        # code needs predict_proba, which LinearSVC (and hinge SGD) lack
+        candidates = [t for t in finalists if "test_accuracy" in t and hasattr(CLASSIFIER_GRID[t["classifier"]][0](**t["params"]), "predict_proba")]
+        if not candidates:
+            raise Exception("No finalist supports predict_proba; increase --finalists")
+        best = candidates[0]
+        X, y = load_features(best["features"])
+        classifier = CLASSIFIER_GRID[best["classifier"]][0](**best["params"]).fit(X, y)
+        artifacts, prefix = best["features"]
+        vectorizer = artifacts.load_object(prefix + "vectorizer")
+        joblib.dump(Pipeline([("tfidf", vectorizer), ("clf", classifier)]), args.save_best)
+        print(f"💾 Best configuration ({best['classifier']}, {best['test_accuracy']:.4f}) saved to {args.save_best}")
+
+
+if __name__ == "__main__":
+    main()
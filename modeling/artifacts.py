@@ -0,0 +1,160 @@
+"""
+Split, feature and prediction artifacts shared between training and
+evaluation scripts.
+
+Artifacts live under ``artifacts/<name>/<key>/`` where ``key`` is a content
+hash of the input data files, so they are reused exactly as long as the data
+is unchanged and never mixed up between datasets:
+
+    split-*.npz         train/test index arrays (same result as train_test_split)
+    <frame>.parquet     small tables, e.g. the test texts and labels
+    <matrix>.npz/.npy   vectorized matrices (sparse or dense)
+    <object>.pkl        fitted vectorizers/tokenizers (joblib)
+    pred-<model>.npz    per-model test predictions, probabilities and classes
+
+Training scripts write them once; evaluation and comparison scripts load
+them in milliseconds instead of re-splitting, re-vectorizing or retraining.
+"""
+import os
+import json
+import time
+import hashlib
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+ARTIFACT_DIR = os.environ.get(
+    "MODEL_ARTIFACTS", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "artifacts"))
+
+
+def file_key(*paths):
+    """Content hash of one or more files"""
+    digest = hashlib.blake2b(digest_size=12)
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def clean_labelled(df, text_col, target_col):
+    """Rows with non-empty text and a label, from categories with at least two samples (for stratifying)"""
+    df = df.dropna(subset=[text_col, target_col])
+    df = df[df[text_col].str.strip() != ""]
+    return df.groupby(target_col).filter(lambda x: len(x) > 1)
+
+
+def _plain(values):
+    """Labels as an array that loads without pickle (object strings become fixed-width)"""
+    values = np.asarray(values)
+    return values.astype(str) if values.dtype == object else values
+
+
+class Artifacts:
+    """Artifacts of dataset ``name`` for the data with content hash ``key``"""
+
+    def __init__(self, name, key, root=ARTIFACT_DIR):
+        self.name, self.key = name, key
+        self.path = os.path.join(root, name, key)
+
+    def _file(self, filename):
+        return os.path.join(self.path, filename)
+
+    def _write(self, filename, save):
+        """Write through a temp file so readers never see a partial artifact"""
+        os.makedirs(self.path, exist_ok=True)
+        final = self._file(filename)
+        root, ext = os.path.splitext(final)
+        tmp = f"{root}.tmp{os.getpid()}{ext}"
+        save(tmp)
+        os.replace(tmp, final)
+        return final
+
+    def exists(self, filename):
+        return os.path.exists(self._file(filename))
+
+    # ------------------------------------------------------------------
+    # Splits
+    # ------------------------------------------------------------------
+    def split(self, n, stratify=None, test_size=0.2, random_state=42):
+        """
+        ``(train_idx, test_idx)`` for ``n`` rows, identical to
+        ``train_test_split(..., test_size, random_state, stratify)``.
+        Computed once and then loaded.
+        """
+        filename = f"split-{n}-{test_size}-{random_state}-{'strat' if stratify is not None else 'plain'}.npz"
+        if self.exists(filename):
+            with np.load(self._file(filename)) as saved:
+                return saved["train"], saved["test"]
+        from sklearn.model_selection import train_test_split
+
+        train, test = train_test_split(np.arange(n), test_size=test_size, random_state=random_state,
+                                       stratify=stratify)
+        self._write(filename, lambda tmp: np.savez(tmp, train=train, test=test))
+        return train, test
+
+    # ------------------------------------------------------------------
+    # Frames, matrices and fitted objects
+    # ------------------------------------------------------------------
+    def save_frame(self, name, df):
+        return self._write(name + ".parquet", lambda tmp: df.to_parquet(tmp, index=False))
+
+    def load_frame(self, name, columns=None):
+        path = self._file(name + ".parquet")
+        return pd.read_parquet(path, columns=columns) if os.path.exists(path) else None
+
+    def save_matrix(self, name, X):
+        if sp.issparse(X):
+            return self._write(name + ".npz", lambda tmp: sp.save_npz(tmp, sp.csr_matrix(X), compressed=False))
+        return self._write(name + ".npy", lambda tmp: np.save(tmp, np.asarray(X)))
+
+    def load_matrix(self, name, mmap_mode=None):
+        if self.exists(name + ".npz"):
+            return sp.load_npz(self._file(name + ".npz"))
+        if self.exists(name + ".npy"):
+            return np.load(self._file(name + ".npy"), mmap_mode=mmap_mode)
+        return None
+
+    def save_object(self, name, obj):
+        import joblib
+
+        return self._write(name + ".pkl", lambda tmp: joblib.dump(obj, tmp))
+
+    def load_object(self, name):
+        import joblib
+
+        return joblib.load(self._file(name + ".pkl")) if self.exists(name + ".pkl") else None
+
+    # ------------------------------------------------------------------
+    # Predictions
+    # ------------------------------------------------------------------
+    def save_predictions(self, model, y_true, y_pred, proba=None, classes=None, model_key=None):
+        """
+        Store ``model``'s test predictions. ``model_key`` (e.g. ``file_key`` of
+        the saved model) lets loaders detect that the model has since changed.
+        """
+        arrays = {"y_true": _plain(y_true), "y_pred": _plain(y_pred)}
+        if proba is not None:
+            arrays["proba"] = np.asarray(proba, dtype=np.float32)
+        if classes is not None:
+            arrays["classes"] = _plain(classes)
+        meta = {"model_key": model_key, "created": time.time()}
+        arrays["meta"] = np.array(json.dumps(meta))
+        return self._write(f"pred-{model}.npz", lambda tmp: np.savez(tmp, **arrays))
+
+    def load_predictions(self, model, model_key=None):
+        """
+        ``{"y_true", "y_pred", "proba"?, "classes"?, "meta"}`` for ``model``, or
+        None if missing or produced by a different ``model_key``.
+        """
+        filename = f"pred-{model}.npz"
+        if not self.exists(filename):
+            return None
+        with np.load(self._file(filename), allow_pickle=False) as saved:
+            result = {name: saved[name] for name in saved.files}
+        result["meta"] = json.loads(str(result["meta"]))
+        if model_key is not None and result["meta"]["model_key"] != model_key:
+            return None
+        return result
@@ -0,0 +1,113 @@
+"""
+Load time and memory of joblib pickles vs compact memory-mapped artifacts.
+
+``--workers`` processes are started per format. Each loads the model and
+scores a few texts (so the pages it needs are really touched), then waits
+while the parent reads its memory from /proc (Linux only): RSS growth from
+the load, and PSS, which splits shared pages between the processes that map
+them, so the PSS total is what the workers really cost together.
+
+    python modeling/bench_compact.py "Topic Modeling/models/text_classifier.pkl" --workers 4
+    python modeling/bench_compact.py rf.pkl --vectorizer tfidf_vectorizer.pkl --workers 4
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import multiprocessing as mp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modeling.compact import export_compact, load_compact
+
+
+SAMPLE_TEXTS = [
+    "The new graphics card renders 3D scenes much faster than the old one.",
+    "NASA confirmed the launch of the probe was delayed again.",
+    "This product broke after two days, total waste of money.",
+    "Great value, works exactly as described and arrived early.",
+]
+
+
+def memory_kb(pid="self", fields=("Rss", "Pss")):
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in fields:
+                values[name] = int(rest.split()[0])
+    return values
+
+
+def worker(fmt, model_path, vectorizer_path, conn, release):
+    import joblib
+    import sklearn.pipeline  # noqa: F401  (import cost is not load cost)
+
+    before = memory_kb()["Rss"]
+    start = time.perf_counter()
+    if fmt == "compact":
+        model = load_compact(model_path)
+        predict = model.predict_proba
+    else:
+        model = joblib.load(model_path)
+        if vectorizer_path:
+            vectorizer = joblib.load(vectorizer_path)
+            predict = lambda texts: model.predict_proba(vectorizer.transform(texts))  # noqa: E731
+        else:
+            predict = model.predict_proba
+    loaded = time.perf_counter() - start
+    predict(SAMPLE_TEXTS)
+    conn.send((loaded, time.perf_counter() - start - loaded, memory_kb()["Rss"] - before))
+    release.wait()
+
+
+def measure(fmt, model_path, vectorizer_path, workers):
+    ctx = mp.get_context("spawn")
+    release = ctx.Event()
+    pipes, procs = [], []
+    for _ in range(workers):
+        parent, child = ctx.Pipe()
+        proc = ctx.Process(target=worker, args=(fmt, model_path, vectorizer_path, child, release))
+        proc.start()
+        pipes.append(parent)
+        procs.append(proc)
+    results = [pipe.recv() for pipe in pipes]
+    pss = sum(memory_kb(proc.pid)["Pss"] for proc in procs)
+    release.set()
+    for proc in procs:
+        proc.join()
+    load = min(r[0] for r in results)
+    first_predict = min(r[1] for r in results)
+    rss = sum(r[2] for r in results) / workers
+    return load, first_predict, rss, pss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("model", help="joblib pickle of a Pipeline, or of the classifier with --vectorizer")
+    parser.add_argument("--vectorizer", help="joblib pickle of the fitted TfidfVectorizer")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--compact", help="existing artifact directory (default: export to a temp dir)")
+    args = parser.parse_args()
+
+    import joblib
+
+    with tempfile.TemporaryDirectory() as workdir:
+        compact = args.compact
+        if compact is None:
+            compact = os.path.join(workdir, "model.compact")
+            vectorizer = joblib.load(args.vectorizer) if args.vectorizer else None
+            export_compact(joblib.load(args.model), compact, vectorizer)
+        pickle_size = os.path.getsize(args.model) + (os.path.getsize(args.vectorizer) if args.vectorizer else 0)
+        compact_size = sum(os.path.getsize(os.path.join(compact, name)) for name in os.listdir(compact))
+
+        print(f"📦 pickle {pickle_size / 1e6:.1f} MB, compact {compact_size / 1e6:.1f} MB, {args.workers} workers")
+        print(f"{'format':<9} {'load':>8} {'1st predict':>12} {'RSS/worker':>11} {'PSS total':>10}")
+        for fmt, path in (("pickle", args.model), ("compact", compact)):
+            load, first_predict, rss, pss = measure(fmt, path, args.vectorizer if fmt == "pickle" else None,
+                                                    args.workers)
+            print(f"{fmt:<9} {load:>7.3f}s {first_predict:>11.3f}s {rss / 1024:>9.1f}MB {pss / 1024:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
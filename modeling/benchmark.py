@@ -0,0 +1,358 @@
+"""
+Benchmark suite for the sentiment and topic models.
+
+For every model and corpus size it measures fit time, accuracy and macro F1
+on a stratified 20% test split, inference latency and throughput per batch
+size, serialized model size and peak memory. Each (model, corpus size) run
+is a separate process, so peak RSS is not shared between runs.
+
+    random_forest   Sentiment Analysis/model_1.py  (TF-IDF 5000 + RandomForest 200)
+    lstm            Sentiment Analysis/model_2.py  (Tokenizer 20000 + LSTM 128, needs tensorflow)
+    vader           Sentiment Analysis/sentiment_vader.py  (sentence-level VADER, no training)
+    topic           Topic Modeling/src/train_classifier.py  (TF-IDF 5000 + LogisticRegression)
+
+Sentiment models use the cleaned Amazon reviews (train and test CSVs pooled),
+the topic model the 20 Newsgroups Parquet. Models whose data or dependencies
+are missing are reported as skipped.
+
+The report is JSON. With ``--baseline``, it is compared with a stored
+report and the exit status is 1 if a model got slower, bigger, hungrier or
+less accurate than the tolerances allow:
+
+    python modeling/benchmark.py --sizes 1000 4000 --output baseline.json
+    python modeling/benchmark.py --sizes 1000 4000 --output report.json --baseline baseline.json
+"""
+import os
+import io
+import sys
+import json
+import time
+import platform
+import argparse
+import resource
+import subprocess
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+TOPIC_DATA = os.path.join(REPO_ROOT, "Topic Modeling", "req_data", "processed", "20news_18828_clean.parquet")
+SENTIMENT_DIR = os.path.join(REPO_ROOT, "Sentiment Analysis")
+
+# Metrics where bigger is worse, and which tolerance (time or memory) applies
+LOWER_IS_BETTER = {"fit_seconds": "time", "model_mb": "memory", "peak_rss_mb": "memory"}
+HIGHER_IS_BETTER = ("accuracy", "f1_macro")
+
+
+# ----------------------------------------------------------------------
+# Data
+# ----------------------------------------------------------------------
+def load_topic():
+    import pandas as pd
+    from modeling.artifacts import clean_labelled
+
+    df = clean_labelled(pd.read_parquet(TOPIC_DATA, columns=["text", "category"]), "text", "category")
+    return df["text"].tolist(), df["category"].to_numpy()
+
+
+def load_sentiment():
+    import pandas as pd
+    from preprocessing.cache import cached_map
+    from preprocessing.reviews import clean_text, CLEAN_TEXT_VERSION, CACHE_NAMESPACE
+
+    sys.path.insert(0, SENTIMENT_DIR)
+    from data_paths import train_path, test_path
+
+    # The paths are relative to SENTIMENT_DIR, not the working directory
+    df = pd.concat([pd.read_csv(os.path.join(SENTIMENT_DIR, path), on_bad_lines="skip")
+                    for path in (train_path, test_path)], ignore_index=True)
+    texts = cached_map(clean_text, df["title"].astype(str) + " " + df["content"].astype(str),
+                       CACHE_NAMESPACE, CLEAN_TEXT_VERSION)
+    return list(texts), df["label"].to_numpy()
+
+
+DATASETS = {"topic": load_topic, "sentiment": load_sentiment}
+
+
+def sample(texts, labels, size, seed=42):
+    """Stratified subsample of ``size`` documents (all of them if fewer), split 80/20"""
+    from sklearn.model_selection import train_test_split
+
+    index = np.arange(len(texts))
+    if size < len(texts):
+        index, _ = train_test_split(index, train_size=size, random_state=seed, stratify=labels)
+    train, test = train_test_split(index, test_size=0.2, random_state=seed, stratify=labels[index])
+    return ([texts[i] for i in train], labels[train]), ([texts[i] for i in test], labels[test])
+
+
+# ----------------------------------------------------------------------
+# Models: fit(texts, labels), predict(texts) -> labels, size() -> bytes
+# ----------------------------------------------------------------------
+class SklearnModel:
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    def fit(self, texts, labels):
+        self.pipeline.fit(texts, labels)
+
+    def predict(self, texts):
+        return self.pipeline.predict(texts)
+
+    def size(self):
+        import joblib
+
+        buffer = io.BytesIO()
+        joblib.dump(self.pipeline, buffer)
+        return buffer.tell()
+
+
+def random_forest():
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.pipeline import Pipeline
+
+    return SklearnModel(Pipeline([
+        ("tfidf", TfidfVectorizer(max_features=5000)),
+        ("clf", RandomForestClassifier(n_estimators=200, random_state=42)),
+    ]))
+
+
+def topic():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+
+    return SklearnModel(Pipeline([
+        ("tfidf", TfidfVectorizer(max_features=5000, stop_words="english")),
+        ("clf", LogisticRegression(max_iter=1000, random_state=42)),
+    ]))
+
+
+class LSTMModel:
+    def __init__(self, epochs=3):
+        from tensorflow.keras.preprocessing.text import Tokenizer
+
+        self.epochs = epochs
+        self.tokenizer = Tokenizer(num_words=20000)
+
+    def sequences(self, texts):
+        from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+        return pad_sequences(self.tokenizer.texts_to_sequences(texts), maxlen=200)
+
+    def fit(self, texts, labels):
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import Embedding, LSTM, Dense, Dropout
+
+        self.tokenizer.fit_on_texts(texts)
+        self.model = Sequential([
+            Embedding(input_dim=20000, output_dim=128),
+            LSTM(128, dropout=0.2, recurrent_dropout=0.2),
+            Dense(64, activation="relu"),
+            Dropout(0.3),
+            Dense(1, activation="sigmoid"),
+        ])
+        self.model.compile(loss="binary_crossentropy", optimizer="adam", metrics=["accuracy"])
+        self.model.fit(self.sequences(texts), np.asarray(labels), epochs=self.epochs, batch_size=128, verbose=0)
+
+    def predict(self, texts):
+        proba = self.model.predict(self.sequences(texts), batch_size=max(len(texts), 1), verbose=0)
+        return (proba.ravel() > 0.5).astype("int32")
+
+    def size(self):
+        import pickle
+
+        return sum(w.nbytes for w in self.model.get_weights()) + len(pickle.dumps(self.tokenizer))
+
+
+class VaderModel:
+    """Sentence-level VADER (modeling/vader.py, as used by sentiment_vader.py); nothing to fit"""
+
+    def __init__(self):
+        from modeling.vader import VaderEngine, _load
+
+        _load()
+        self.engine = VaderEngine(workers=1)
+
+    def fit(self, texts, labels):
+        pass
+
+    def predict(self, texts):
+        from modeling.vader import label
+
+        return label(self.engine.score(texts)).to_numpy()
+
+    def size(self):
+        return None
+
+
+MODELS = {
+    "random_forest": ("sentiment", random_forest),
+    "lstm": ("sentiment", LSTMModel),
+    "vader": ("sentiment", VaderModel),
+    "topic": ("topic", topic),
+}
+
+
+# ----------------------------------------------------------------------
+# One run (child process)
+# ----------------------------------------------------------------------
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def time_batches(model, texts, batch_size, max_docs, min_batches=10):
+    """
+    Latency of ``predict`` on batches of ``batch_size`` test documents, cycling
+    through them until ``max_docs`` documents and ``min_batches`` batches were
+    timed. ``per_doc_ms`` is from the median batch, so one slow batch (GC, page
+    faults) does not show up as a regression.
+    """
+    n_batches = max(min_batches, -(-max_docs // batch_size))
+    model.predict(texts[:batch_size])  # warm-up
+    latencies = []
+    for i in range(n_batches):
+        batch = [texts[j % len(texts)] for j in range(i * batch_size, (i + 1) * batch_size)]
+        began = time.perf_counter()
+        model.predict(batch)
+        latencies.append(time.perf_counter() - began)
+    latencies = np.array(latencies)
+    return {
+        "batches": n_batches,
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 3),
+        "per_doc_ms": round(float(np.median(latencies)) / batch_size * 1000, 4),
+        "docs_per_second": round(n_batches * batch_size / float(latencies.sum()), 1),
+    }
+
+
+def run(name, size, batch_sizes, max_docs):
+    from sklearn.metrics import accuracy_score, f1_score
+
+    task, factory = MODELS[name]
+    try:
+        model = factory()
+        texts, labels = DATASETS[task]()
+    except (ImportError, LookupError, FileNotFoundError) as e:
+        return {"skipped": f"{type(e).__name__}: {e}"}
+    (train_texts, train_labels), (test_texts, test_labels) = sample(texts, labels, size)
+    del texts, labels
+    rss_data = peak_rss_mb()
+
+    start = time.perf_counter()
+    model.fit(train_texts, train_labels)
+    fit_seconds = time.perf_counter() - start
+
+    predicted = model.predict(test_texts)
+    model_bytes = model.size()
+    return {
+        "documents": len(train_texts) + len(test_texts),
+        "fit_seconds": round(fit_seconds, 3),
+        "accuracy": round(float(accuracy_score(test_labels, predicted)), 4),
+        "f1_macro": round(float(f1_score(test_labels, predicted, average="macro")), 4),
+        "model_mb": None if model_bytes is None else round(model_bytes / 2 ** 20, 3),
+        "batch": {str(b): time_batches(model, test_texts, b, max_docs) for b in batch_sizes},
+        "data_rss_mb": round(rss_data, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+# ----------------------------------------------------------------------
+# Report and regression check
+# ----------------------------------------------------------------------
+def environment():
+    import sklearn
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+            "numpy": np.__version__, "sklearn": sklearn.__version__, "commit": commit}
+
+
+def compare(report, baseline, time_tolerance=0.25, memory_tolerance=0.10, accuracy_drop=0.01):
+    """Regressions of ``report`` against ``baseline``, as readable strings"""
+    previous = {(r["model"], r["size"]): r for r in baseline["results"] if "skipped" not in r}
+    tolerance = {"time": time_tolerance, "memory": memory_tolerance}
+    problems = []
+    for result in report["results"]:
+        base = previous.get((result["model"], result["size"]))
+        if base is None or "skipped" in result:
+            continue
+        label = f"{result['model']} @ {result['size']}"
+        for metric in HIGHER_IS_BETTER:
+            if result[metric] < base[metric] - accuracy_drop:
+                problems.append(f"{label}: {metric} {base[metric]:.4f} → {result[metric]:.4f}")
+        checks = [(metric, result[metric], base[metric], kind) for metric, kind in LOWER_IS_BETTER.items()]
+        checks += [(f"per_doc_ms[batch {b}]", timing["per_doc_ms"], base["batch"][b]["per_doc_ms"], "time")
+                   for b, timing in result["batch"].items() if b in base.get("batch", {})]
+        for metric, value, old, kind in checks:
+            if value is not None and old and value > old * (1 + tolerance[kind]):
+                problems.append(f"{label}: {metric} {old:g} → {value:g} (+{(value / old - 1) * 100:.0f}%)")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000], help="corpus sizes (documents)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 256])
+    parser.add_argument("--max-docs", type=int, default=512, help="documents timed per batch size (at least 10 batches)")
+    parser.add_argument("--output", default="benchmark_report.json")
+    parser.add_argument("--baseline", help="report to check for regressions against")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10, help="allowed relative size/RSS growth")
+    parser.add_argument("--accuracy-drop", type=float, default=0.01, help="allowed absolute accuracy/F1 drop")
+    parser.add_argument("--child", nargs=2, metavar=("MODEL", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        name, size = args.child[0], int(args.child[1])
+        print(json.dumps(run(name, size, args.batch_sizes, args.max_docs)))
+        return
+
+    report = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "environment": environment(),
+              "batch_sizes": args.batch_sizes, "results": []}
+    print(f"{'model':<14} {'size':>7} {'fit':>8} {'acc':>7} {'f1':>7} {'model':>9} {'peak RSS':>9}  per-doc ms by batch")
+    for name in args.models:
+        for size in args.sizes:
+            output = subprocess.run(
+                [sys.executable, "-W", "ignore", os.path.abspath(__file__), "--child", name, str(size),
+                 "--batch-sizes", *map(str, args.batch_sizes), "--max-docs", str(args.max_docs)],
+                capture_output=True, text=True,
+            )
+            if output.returncode:
+                raise Exception(f"{name} @ {size} failed:\n{output.stderr}")
+            result = dict(model=name, size=size, **json.loads(output.stdout.strip().splitlines()[-1]))
+            report["results"].append(result)
+            if "skipped" in result:
+                print(f"{name:<14} {size:>7} ⏭️ skipped ({result['skipped']})")
+                continue
+            model_mb = "-" if result["model_mb"] is None else f"{result['model_mb']:.1f}MB"
+            timings = "  ".join(f"{b}:{t['per_doc_ms']:.3f}" for b, t in result["batch"].items())
+            print(f"{name:<14} {result['documents']:>7,} {result['fit_seconds']:>7.2f}s {result['accuracy']:>7.4f} "
+                  f"{result['f1_macro']:>7.4f} {model_mb:>9} {result['peak_rss_mb']:>7.0f}MB  {timings}")
+            if result["documents"] < size:
+                print(f"   ⚠️ only {result['documents']:,} documents available")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Report saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        problems = compare(report, baseline, args.time_tolerance, args.memory_tolerance, args.accuracy_drop)
+        if problems:
+            print(f"❌ {len(problems)} regression(s) against {args.baseline}:")
+            for problem in problems:
+                print(f"   {problem}")
+            sys.exit(1)
+        print(f"✅ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Compact, memory-mapped model artifacts.
+
+A fitted ``TfidfVectorizer`` plus ``LogisticRegression`` or
+``RandomForestClassifier`` (a scikit-learn Pipeline, or the two objects
+saved separately) is exported to a directory of ``.npy`` arrays:
+
+- the vocabulary as one sorted term array (looked up with ``searchsorted``,
+  no dict) and the idf weights; the fitted ``stop_words_`` set is dropped;
+- logistic regression coefficients as float32;
+- all forest trees concatenated into flat node arrays (int32 children and
+  features, float32 thresholds and leaf probabilities).
+
+``load_compact`` opens every array with ``np.load(mmap_mode="r")``: loading
+is near-instant and processes that load the same artifact share one copy of
+the pages through the OS page cache instead of each unpickling its own.
+
+    python modeling/compact.py "Topic Modeling/models/text_classifier.pkl" "Topic Modeling/models/text_classifier.compact"
+    python modeling/compact.py random_forest_model.pkl rf.compact --vectorizer tfidf_vectorizer.pkl
+"""
+import os
+import json
+import argparse
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+
+FORMAT_VERSION = 1
+VECTORIZER_PARAMS = ("lowercase", "strip_accents", "token_pattern", "ngram_range", "analyzer", "stop_words",
+                     "norm", "use_idf", "smooth_idf", "sublinear_tf", "binary")
+
+
+def _split(model, vectorizer):
+    if vectorizer is None:
+        if not hasattr(model, "steps") or len(model.steps) != 2:
+            raise Exception("Expected a (vectorizer, classifier) Pipeline or an explicit vectorizer")
+        vectorizer, model = model.steps[0][1], model.steps[1][1]
+    for name in ("preprocessor", "tokenizer"):
+        if getattr(vectorizer, name, None) is not None:
+            raise Exception(f"Vectorizers with a custom {name} cannot be exported")
+    if callable(vectorizer.analyzer):
+        raise Exception("Vectorizers with a custom analyzer cannot be exported")
+    return vectorizer, model
+
+
+def _idf(vectorizer):
+    # Pickles from older scikit-learn keep only the diagonal matrix
+    tfidf = getattr(vectorizer, "_tfidf", None)
+    if tfidf is not None and "_idf_diag" in vars(tfidf):
+        return np.asarray(tfidf._idf_diag.diagonal())
+    return vectorizer.idf_
+
+
+def _float32_thresholds(threshold):
+    """Largest float32 <= each threshold: x <= t gives the same answer for every float32 x"""
+    rounded = threshold.astype(np.float32)
+    too_high = rounded.astype(np.float64) > threshold
+    rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+    return rounded
+
+
+def _forest_arrays(forest):
+    """
+    All trees as one node table. Leaves point to themselves (threshold +inf),
+    so walking past a leaf is a no-op and rows can take several steps between
+    checks for finished walks.
+    """
+    trees = [estimator.tree_ for estimator in forest.estimators_]
+    if any(tree.n_outputs != 1 for tree in trees):
+        raise Exception("Only single-output forests can be exported")
+    sizes = np.array([tree.node_count for tree in trees])
+    roots = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    left, right, feature, threshold = [], [], [], []
+    for tree, root in zip(trees, roots):
+        leaf = tree.children_left == -1
+        nodes = np.arange(tree.node_count) + root
+        left.append(np.where(leaf, nodes, tree.children_left + root))
+        right.append(np.where(leaf, nodes, tree.children_right + root))
+        feature.append(np.where(leaf, 0, tree.feature))
+        threshold.append(np.where(leaf, np.inf, tree.threshold))
+    value = np.concatenate([tree.value[:, 0, :] for tree in trees])
+    value /= value.sum(axis=1, keepdims=True)
+    return {
+        "roots": roots.astype(np.int32),
+        "children_left": np.concatenate(left).astype(np.int32),
+        "children_right": np.concatenate(right).astype(np.int32),
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": _float32_thresholds(np.concatenate(threshold)),
+        "value": value.astype(np.float32),
+    }
+
+
+def export_compact(model, path, vectorizer=None):
+    """Write ``model`` (a Pipeline, or a classifier plus ``vectorizer``) to the directory ``path``"""
+    vectorizer, classifier = _split(model, vectorizer)
+    kind = type(classifier).__name__
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    order = np.argsort(np.array(terms))
+    arrays = {"terms": np.array(terms)[order], "term_index": order.astype(np.int32)}
+    if vectorizer.use_idf:
+        arrays["idf"] = _idf(vectorizer).astype(np.float64)
+
+    params = {name: getattr(vectorizer, name) for name in VECTORIZER_PARAMS}
+    if isinstance(params["stop_words"], (set, frozenset, tuple)):
+        params["stop_words"] = sorted(params["stop_words"])
+    meta = {"format": FORMAT_VERSION, "kind": kind, "classes": np.asarray(classifier.classes_).tolist(),
+            "vectorizer": params}
+
+    if kind == "LogisticRegression":
+        arrays["coef"] = classifier.coef_.astype(np.float32)
+        arrays["intercept"] = classifier.intercept_.astype(np.float32)
+        multinomial = getattr(classifier, "multi_class", "auto") != "ovr" and classifier.solver != "liblinear"
+        meta["link"] = "binary" if classifier.coef_.shape[0] == 1 else "softmax" if multinomial else "ovr"
+    elif kind == "RandomForestClassifier":
+        arrays.update(_forest_arrays(classifier))
+    else:
+        raise Exception(f"Cannot export {kind}; expected LogisticRegression or RandomForestClassifier")
+
+    os.makedirs(path, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, name + ".npy"), array)
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return path
+
+
+class CompactModel:
+    """Read-only model backed by memory-mapped arrays, with the Pipeline's predict API"""
+
+    def __init__(self, path):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta["format"] != FORMAT_VERSION:
+            raise Exception(f"{path} has format {self.meta['format']}, expected {FORMAT_VERSION}")
+        self.path = path
+        self.kind = self.meta["kind"]
+        self.classes_ = np.array(self.meta["classes"])
+        for name in os.listdir(path):
+            if name.endswith(".npy"):
+                # A plain ndarray view of the mapping avoids np.memmap's per-operation overhead
+                setattr(self, name[:-4], np.asarray(np.load(os.path.join(path, name), mmap_mode="r")))
+        self._analyzer = None
+
+    @property
+    def analyzer(self):
+        if self._analyzer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+
+            params = dict(self.meta["vectorizer"], ngram_range=tuple(self.meta["vectorizer"]["ngram_range"]))
+            self._analyzer = TfidfVectorizer(**params).build_analyzer()
+        return self._analyzer
+
+    def transform(self, texts):
+        """TF-IDF matrix for ``texts``, identical to the original vectorizer's"""
+        params = self.meta["vectorizer"]
+        analyze = self.analyzer
+        docs = [analyze(text) for text in texts]
+        lengths = np.fromiter(map(len, docs), dtype=np.int64, count=len(docs))
+        tokens = np.array([token for doc in docs for token in doc] or [""])[:lengths.sum()]
+        position = np.searchsorted(self.terms, tokens).clip(max=len(self.terms) - 1)
+        known = self.terms[position] == tokens
+        rows = np.repeat(np.arange(len(docs)), lengths)[known]
+        counts = sp.csr_matrix((np.ones(known.sum()), (rows, self.term_index[position[known]])),
+                               shape=(len(docs), len(self.terms)))
+        counts.sum_duplicates()
+        if params["binary"]:
+            counts.data[:] = 1
+        if params["sublinear_tf"]:
+            np.log(counts.data, out=counts.data)
+            counts.data += 1
+        if params["use_idf"]:
+            counts.data *= self.idf[counts.indices]
+        if params["norm"]:
+            counts = normalize(counts, norm=params["norm"], copy=False)
+        return counts
+
+    def predict_proba(self, texts):
+        X = self.transform(texts)
+        if self.kind == "LogisticRegression":
+            scores = np.asarray(X @ self.coef.T, dtype=np.float64) + self.intercept
+            link = self.meta["link"]
+            if link == "binary":
+                positive = 1 / (1 + np.exp(-scores[:, 0]))
+                return np.column_stack([1 - positive, positive])
+            if link == "ovr":
+                scores = 1 / (1 + np.exp(-scores))
+                return scores / scores.sum(axis=1, keepdims=True)
+            scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+            return scores / scores.sum(axis=1, keepdims=True)
+        return self._forest_proba(X.astype(np.float32))
+
+    def _forest_proba(self, X, chunk_size=256, steps=4):
+        """Mean leaf probability over all trees, walking every (row, tree) pair level by level"""
+        left, right, feature, threshold = self.children_left, self.children_right, self.feature, self.threshold
+        proba = np.zeros((X.shape[0], len(self.classes_)))
+        for start in range(0, X.shape[0], chunk_size):
+            dense = X[start:start + chunk_size].toarray()
+            values = dense.ravel()
+            offset = np.repeat(np.arange(len(dense)) * dense.shape[1], len(self.roots))
+            node = np.tile(self.roots, len(dense))
+            active, current = np.arange(len(node)), node.copy()
+            while len(active):
+                for _ in range(steps):
+                    go_left = values[offset + feature[current]] <= threshold[current]
+                    current = np.where(go_left, left[current], right[current])
+                node[active] = current
+                walking = left[current] != current
+                active, current, offset = active[walking], current[walking], offset[walking]
+            leaves = self.value[node].reshape(len(dense), len(self.roots), -1)
+            proba[start:start + chunk_size] = leaves.mean(axis=1, dtype=np.float64)
+        return proba
+
+    def predict(self, texts):
+        return self.classes_[np.argmax(self.predict_proba(texts), axis=1)]
+
+
+def load_compact(path):
+    return CompactModel(path)
+
+
+def load_model(path):
+    """A compact artifact directory, or any joblib-pickled model"""
+    if os.path.isdir(path):
+        return load_compact(path)
+    import joblib
+
+    return joblib.load(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("model", help="joblib pickle of a Pipeline, or of the classifier with --vectorizer")
+    parser.add_argument("output", help="artifact directory to write")
+    parser.add_argument("--vectorizer", help="joblib pickle of the fitted TfidfVectorizer")
+    args = parser.parse_args()
+
+    import joblib
+
+    model = joblib.load(args.model)
+    vectorizer = joblib.load(args.vectorizer) if args.vectorizer else None
+    export_compact(model, args.output, vectorizer)
+    size = sum(os.path.getsize(os.path.join(args.output, name)) for name in os.listdir(args.output))
+    print(f"✅ {args.model} ({os.path.getsize(args.model) / 1e6:.1f} MB) → {args.output} ({size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Sentence-level VADER sentiment scoring.
+
+Each document is split into sentences (NLTK punkt) and scored as the mean
+``(compound, pos, neg, neu)`` VADER vector of its sentences. The vectors are
+returned in full so callers can pick their own threshold. ``label`` turns
+them into the binary label sentiment_vader.py has always used (compound >= 0).
+
+``VaderEngine`` scores in chunks across a process pool that stays up between
+calls, so a stream of batches (e.g. stored records) only pays the start-up
+once. Sentence scores are memoized in an LRU cache per process, because
+reviews and posts repeat many short sentences ("Great product.", "Thanks!").
+
+    python modeling/vader.py reviews.csv --text-column content --output vader.parquet --workers 4
+"""
+import os
+import sys
+import time
+import argparse
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIELDS = ("compound", "pos", "neg", "neu")
+# Bump when the scoring changes; stored record scores are keyed on it
+VADER_VERSION = 1
+CACHE_SIZE = int(os.environ.get("VADER_CACHE_SIZE", 100_000))
+
+_analyzer = None
+_sent_tokenize = None
+
+
+def _load():
+    global _analyzer, _sent_tokenize
+    if _analyzer is None:
+        from preprocessing.nltk_resources import ensure, tokenizer
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+        ensure(tokenizer())
+        from nltk.tokenize import sent_tokenize
+
+        _sent_tokenize = sent_tokenize
+        _analyzer = SentimentIntensityAnalyzer()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def sentence_scores(sentence):
+    scores = _analyzer.polarity_scores(sentence)
+    return tuple(scores[field] for field in FIELDS)
+
+
+def score_text(text):
+    """Mean ``(compound, pos, neg, neu)`` over the sentences of ``text``; zeros if it has none"""
+    _load()
+    sentences = _sent_tokenize(text) if text else []
+    if not sentences:
+        return (0.0,) * len(FIELDS)
+    rows = [sentence_scores(sentence) for sentence in sentences]
+    return tuple(sum(column) / len(rows) for column in zip(*rows))
+
+
+def _score_chunk(texts):
+    before = sentence_scores.cache_info()
+    values = np.array([score_text(text) for text in texts], dtype=np.float64).reshape(-1, len(FIELDS))
+    after = sentence_scores.cache_info()
+    return values, after.hits - before.hits, after.misses - before.misses
+
+
+def label(scores, threshold=0.0):
+    """Binary sentiment (1 positive, 0 negative) from ``score`` output"""
+    return (scores["compound"] >= threshold).astype("int64")
+
+
+class VaderEngine:
+    """
+    ``score(texts)`` returns a DataFrame of ``FIELDS`` per text. With more than
+    one worker, chunks of ``chunk_size`` texts are scored in a process pool.
+    ``stats`` accumulates documents, seconds and sentence cache hits/misses.
+    """
+
+    def __init__(self, workers=None, chunk_size=500):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._pool = None
+        self.stats = {"documents": 0, "seconds": 0.0, "cache_hits": 0, "cache_misses": 0}
+
+    def _map(self, chunks):
+        if self.workers == 1 or len(chunks) == 1:
+            return map(_score_chunk, chunks)
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            _load()  # fail fast here (missing punkt) rather than inside every worker
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_load)
+        return self._pool.map(_score_chunk, chunks)
+
+    def score(self, texts):
+        start = time.perf_counter()
+        index = texts.index if isinstance(texts, pd.Series) else None
+        texts = [text if isinstance(text, str) else "" for text in texts]
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        parts = []
+        for values, hits, misses in self._map(chunks):
+            parts.append(values)
+            self.stats["cache_hits"] += hits
+            self.stats["cache_misses"] += misses
+        values = np.vstack(parts) if parts else np.zeros((0, len(FIELDS)))
+        self.stats["documents"] += len(texts)
+        self.stats["seconds"] += time.perf_counter() - start
+        return pd.DataFrame(values, columns=list(FIELDS), index=index)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV or Parquet file")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--output", help="Parquet or CSV with the input columns plus vader_* scores")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    df = pd.read_parquet(args.input) if args.input.endswith(".parquet") else pd.read_csv(args.input)
+    with VaderEngine(args.workers, args.chunk_size) as engine:
+        scores = engine.score(df[args.text_column])
+    for field in FIELDS:
+        df[f"vader_{field}"] = scores[field]
+    df["vader_label"] = label(scores)
+
+    stats = engine.stats
+    lookups = stats["cache_hits"] + stats["cache_misses"]
+    print(f"✅ Scored {stats['documents']:,} documents in {stats['seconds']:.2f}s "
+          f"({stats['documents'] / max(stats['seconds'], 1e-9):,.0f} docs/s, {engine.workers} workers)")
+    if lookups:
+        print(f"🧠 Sentence cache: {stats['cache_hits'] / lookups:.1%} hits of {lookups:,} sentences")
+    print(f"📊 Positive: {df['vader_label'].mean():.1%}, mean compound {scores['compound'].mean():+.3f}")
+    if args.output:
+        if args.output.endswith(".parquet"):
+            df.to_parquet(args.output, index=False)
+        else:
+            df.to_csv(args.output, index=False)
+        print(f"💾 Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
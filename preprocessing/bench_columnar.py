@@ -0,0 +1,64 @@
+"""
+Save/load benchmark for the intermediate dataset formats.
+
+The same DataFrame is written and read back as Excel (openpyxl), CSV,
+Parquet and Arrow IPC (memory-mapped); the best of ``--repeat`` runs is
+reported with the file size.
+
+    python bench_columnar.py "../Topic Modeling/req_data/processed/20news_18828_clean.parquet"
+    python bench_columnar.py corpus.parquet --scale 5 --skip-excel
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing.columnar import read_table, write_table, write_excel_report
+
+
+FORMATS = {
+    "excel": (".xlsx", write_excel_report, lambda path: pd.read_excel(path, engine="openpyxl")),
+    "csv": (".csv", lambda df, path: df.to_csv(path, index=False), lambda path: pd.read_csv(path)),
+    "parquet": (".parquet", write_table, read_table),
+    "arrow": (".arrow", write_table, read_table),
+}
+
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dataset", help="any .parquet, .arrow or .csv dataset")
+    parser.add_argument("--scale", type=int, default=1, help="repeat the rows this many times")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-excel", action="store_true")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.dataset) if args.dataset.endswith(".csv") else read_table(args.dataset)
+    df = pd.concat([df] * args.scale, ignore_index=True)
+    print(f"📚 {len(df):,} rows, {df.memory_usage(deep=True).sum() / 1e6:.1f} MB in memory")
+    print(f"{'format':<10} {'save':>9} {'load':>9} {'size':>10}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, (suffix, save, load) in FORMATS.items():
+            if name == "excel" and args.skip_excel:
+                continue
+            path = os.path.join(workdir, "dataset" + suffix)
+            save_time = best_of(lambda: save(df, path), args.repeat)
+            load_time = best_of(lambda: load(path), args.repeat)
+            print(f"{name:<10} {save_time:>8.3f}s {load_time:>8.3f}s {os.path.getsize(path) / 1e6:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
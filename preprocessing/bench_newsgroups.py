@@ -0,0 +1,154 @@
+"""
+Microbenchmark: shared NewsgroupCleaner profiles vs the original cleaners.
+
+The original per-line implementations are kept below verbatim as the
+reference. Every post is cleaned by both and the outputs must be identical.
+
+    python bench_newsgroups.py "../Topic Modeling/req_data/20news-18828"
+    python bench_newsgroups.py --sklearn          # fetch_20newsgroups(subset="all")
+"""
+import os
+import re
+import sys
+import time
+import argparse
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing.newsgroups import PROFILES
+
+
+def reference_extract_body(text):
+    parts = re.split(r"\n\s*\n", text, maxsplit=1)
+    body = parts[1] if len(parts) > 1 else parts[0]
+    cleaned_lines = []
+    for line in body.splitlines():
+        if re.match(r"^(Archive-name|From|Subject|Path|Xref|Organization|Lines|Newsgroups|Message-ID|Keywords):", line, re.I):
+            continue
+        if line.strip().startswith((">", "|")):
+            continue
+        cleaned_lines.append(line)
+    body_text = "\n".join(cleaned_lines).strip()
+    body_text = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F]", "", body_text)
+    return body_text
+
+
+def reference_clean_body(raw_text):
+    if pd.isna(raw_text):
+        return ""
+    parts = re.split(r"\n\s*\n", raw_text, maxsplit=1)
+    body = parts[1] if len(parts) > 1 else parts[0]
+    cleaned_lines = []
+    for line in body.splitlines():
+        if re.match(r"^(archive-name|from|subject|path|xref|organization|lines|newsgroups|message-id|keywords|last-modified|version):", line, re.I):
+            continue
+        if line.strip().startswith((">", "|")):
+            continue
+        if line.strip().startswith("--"):
+            break
+        if re.search(r"In article\s*<.*?>", line, re.I):
+            continue
+        if re.search(r"writes:|wrote:", line, re.I):
+            continue
+        cleaned_lines.append(line)
+    body = "\n".join(cleaned_lines)
+    body = re.sub(r"\S+@\S+", " ", body)
+    body = re.sub(r"http\S+|www\.\S+", " ", body)
+    body = re.sub(r"<[^>]+>", " ", body)
+    body = re.sub(r"[^a-zA-Z0-9\s\.\,\!\?]", " ", body)
+    body = re.sub(r"\s{2,}", " ", body)
+    return body.lower().strip()
+
+
+def reference_clean_body_classification(raw_text):
+    if not raw_text or pd.isna(raw_text):
+        return ""
+    parts = re.split(r"\n\s*\n", raw_text, maxsplit=1)
+    body = parts[1] if len(parts) > 1 else parts[0]
+    cleaned_lines = []
+    for line in body.splitlines():
+        if re.match(r"^\s*(from|subject|path|organization|lines|newsgroups|"
+                    r"message-id|keywords|last-modified|version|distribution|"
+                    r"summary|sender|references|nntp-posting-host|article-id|"
+                    r"followup-to|content-type|content-transfer-encoding)\s*:",
+                    line, re.I):
+            continue
+        if re.match(r"^(\-\-+|__+|\*\*+)\s*$", line.strip()):
+            break
+        if line.strip().startswith((">", "|")):
+            continue
+        if re.search(r"(writes:|wrote:|In article\s*<.*?>)", line, re.I):
+            continue
+        cleaned_lines.append(line)
+    body = "\n".join(cleaned_lines)
+    body = re.sub(r"\b\S+@\S+\b", " ", body)
+    body = re.sub(r"http\S+|www\.\S+", " ", body)
+    body = re.sub(r"<[^>]+>", " ", body)
+    body = re.sub(r"\d+", " ", body)
+    body = re.sub(r"[^a-zA-Z\s]", " ", body)
+    body = re.sub(r"\s{2,}", " ", body)
+    body = re.sub(r"\n{3,}", "\n\n", body)
+    return body.lower().strip()
+
+
+REFERENCES = {
+    "body": reference_extract_body,
+    "metadata": reference_clean_body,
+    "classification": reference_clean_body_classification,
+}
+
+
+def load_folder(root):
+    posts = []
+    for category in sorted(os.listdir(root)):
+        category_path = os.path.join(root, category)
+        if os.path.isdir(category_path):
+            for filename in sorted(os.listdir(category_path)):
+                with open(os.path.join(category_path, filename), "r", encoding="latin1") as f:
+                    posts.append(f.read())
+    return posts
+
+
+def load_sklearn():
+    from sklearn.datasets import fetch_20newsgroups
+
+    return list(fetch_20newsgroups(subset="all").data)
+
+
+def best_of(func, posts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for post in posts:
+            func(post)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", nargs="?", help="20news-18828 style folder (one sub-folder per category)")
+    parser.add_argument("--sklearn", action="store_true", help="use sklearn's fetch_20newsgroups instead")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    if not args.root and not args.sklearn:
+        parser.error("give a corpus folder or --sklearn")
+
+    posts = load_sklearn() if args.sklearn else load_folder(args.root)
+    # The metadata profile runs on the output of the body profile, as in MetaData
+    inputs = {"body": posts, "metadata": [reference_extract_body(p) for p in posts], "classification": posts}
+    print(f"📚 {len(posts):,} posts, {sum(map(len, posts)) / 1e6:.1f} MB")
+    print(f"{'profile':<16} {'original':>10} {'shared':>10} {'speedup':>8}  output")
+
+    for profile, reference in REFERENCES.items():
+        cleaner, texts = PROFILES[profile], inputs[profile]
+        mismatches = sum(reference(t) != cleaner(t) for t in texts)
+        before = best_of(reference, texts, args.repeat)
+        after = best_of(cleaner, texts, args.repeat)
+        status = "identical" if not mismatches else f"{mismatches} MISMATCHES"
+        print(f"{profile:<16} {before:>9.2f}s {after:>9.2f}s {before / after:>7.2f}x  {status}")
+
+
+if __name__ == "__main__":
+    main()
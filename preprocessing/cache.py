@@ -0,0 +1,193 @@
+"""
+Persistent, content-addressed cache for text preprocessing.
+
+Results are stored in SQLite keyed by a hash of the cleaner name, the
+cleaner version and the input text, so unchanged documents are never
+cleaned twice and bumping a cleaner's version invalidates only its own
+entries. The database is kept under ``max_bytes`` by evicting the least
+recently used entries.
+
+    from preprocessing.cache import cached_map
+    texts = cached_map(clean_text, series, "sentiment.clean_text", CLEAN_TEXT_VERSION)
+
+The location defaults to ~/.cache/narrative_nexus/preprocess.sqlite3 and can
+be changed with the PREPROCESS_CACHE environment variable ("off" disables
+caching). ``python cache.py`` prints the cache size; ``--clear`` empties it.
+"""
+import os
+import time
+import sqlite3
+import hashlib
+import argparse
+
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "narrative_nexus", "preprocess.sqlite3")
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+LOOKUP_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key BLOB PRIMARY KEY,
+    value TEXT NOT NULL,
+    used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_entries_used ON entries(used);
+"""
+
+
+def content_key(namespace, version, text):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{namespace}\0{version}\0".encode())
+    digest.update(text.encode("utf-8", "surrogatepass"))
+    return digest.digest()
+
+
+class PreprocessCache:
+    """
+    On-disk cache of preprocessing results, safe to share between processes.
+    ``hits``/``misses``/``evicted`` count this instance's activity.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path, self.max_bytes = path, max_bytes
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.hits = self.misses = self.evicted = 0
+        self.pid = os.getpid()
+
+    def get_many(self, keys):
+        """Cached values for ``keys``; found entries are marked as recently used"""
+        found = {}
+        for start in range(0, len(keys), LOOKUP_BATCH):
+            batch = keys[start:start + LOOKUP_BATCH]
+            marks = ",".join("?" * len(batch))
+            found.update(self.conn.execute(f"SELECT key, value FROM entries WHERE key IN ({marks})", batch))
+        if found:
+            now = time.time()
+            with self.conn:
+                self.conn.executemany("UPDATE entries SET used = ? WHERE key = ?", ((now, k) for k in found))
+        return found
+
+    def put_many(self, items):
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, used) VALUES (?, ?, ?)",
+                ((key, value, now) for key, value in items),
+            )
+        self.evict()
+
+    def size(self):
+        """Bytes in use by the database (pages that are not on the free list)"""
+        pages = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        free = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        return (pages - free) * page_size
+
+    def evict(self, target=0.8):
+        """Drop least recently used entries until the cache is under ``target`` of ``max_bytes``"""
+        size = self.size()
+        while size > self.max_bytes:
+            count = len(self)
+            if not count:
+                break
+            drop = max(1, int(count * (1 - self.max_bytes * target / size)))
+            with self.conn:
+                self.conn.execute(
+                    "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY used LIMIT ?)", (drop,)
+                )
+            self.evicted += drop
+            size = self.size()
+
+    def map(self, func, texts, namespace, version, batched=False):
+        """
+        ``[func(t) for t in texts]``, computing only texts not cached for this
+        ``namespace``/``version``. With ``batched`` ``func`` takes the list of
+        uncached texts and returns their results in order. Non-string inputs
+        are passed through uncached.
+        """
+        texts = list(texts)
+        keys = {text: content_key(namespace, version, text) for text in texts if isinstance(text, str)}
+        cached = self.get_many(list(keys.values()))
+        results = {text: cached[key] for text, key in keys.items() if key in cached}
+        missing = [text for text in keys if text not in results]
+        if missing:
+            values = func(missing) if batched else [func(text) for text in missing]
+            results.update(zip(missing, values))
+            self.put_many((keys[text], value) for text, value in zip(missing, values))
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        others = [t for t in texts if not isinstance(t, str)]
+        computed = iter((func(others) if batched else [func(t) for t in others]) if others else ())
+        return [results[t] if isinstance(t, str) else next(computed) for t in texts]
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate,
+                "evicted": self.evicted, "entries": len(self), "bytes": self.size()}
+
+    def summary(self):
+        return (f"🗃️ Preprocess cache: {self.hits:,} hits, {self.misses:,} misses "
+                f"({self.hit_rate:.1%} hit rate), {len(self):,} entries, {self.size() / 1e6:.1f} MB")
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM entries")
+
+    def close(self):
+        self.conn.close()
+
+
+_default = None
+
+
+def default_cache():
+    """Shared cache for this process, or None when PREPROCESS_CACHE=off"""
+    global _default
+    path = os.environ.get("PREPROCESS_CACHE", DEFAULT_PATH)
+    if path.lower() == "off":
+        return None
+    # A connection must not cross a fork, so worker processes open their own
+    if _default is None or _default.path != path or _default.pid != os.getpid():
+        _default = PreprocessCache(path)
+    return _default
+
+
+def cached_map(func, texts, namespace, version, cache=None, batched=False):
+    """
+    Apply ``func`` to every text through ``cache`` (the default cache if not
+    given). With ``batched`` ``func`` maps a list of texts to a list of results.
+    """
+    if cache is None:
+        cache = default_cache()
+    if cache is None:
+        texts = list(texts)
+        return func(texts) if batched else [func(t) for t in texts]
+    return cache.map(func, texts, namespace, version, batched)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the preprocessing cache")
+    parser.add_argument("--path", default=os.environ.get("PREPROCESS_CACHE", DEFAULT_PATH))
+    parser.add_argument("--clear", action="store_true")
+    args = parser.parse_args()
+
+    cache = PreprocessCache(args.path)
+    if args.clear:
+        cache.clear()
+        cache.conn.execute("VACUUM")
+    print(f"{args.path}: {len(cache):,} entries, {cache.size() / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
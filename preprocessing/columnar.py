@@ -0,0 +1,71 @@
+"""
+Columnar storage for the intermediate datasets.
+
+Parquet (``.parquet``) is the canonical format between cleaning, training and
+evaluation; Arrow IPC (``.arrow`` / ``.feather``) is supported for
+memory-mapped reads. Excel is only written as an optional human-readable
+report.
+"""
+import os
+from importlib.util import find_spec
+
+import pandas as pd
+
+PARQUET_AVAILABLE = find_spec("pyarrow") is not None
+
+EXCEL_CELL_LIMIT = 32_767
+IPC_EXTENSIONS = (".arrow", ".feather")
+
+
+def require_pyarrow():
+    if not PARQUET_AVAILABLE:
+        raise Exception("pyarrow not installed. Install with: pip install pyarrow")
+
+
+def read_table(path, columns=None):
+    """Load a Parquet or Arrow IPC file into a DataFrame (IPC files are memory-mapped)"""
+    require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if path.endswith(IPC_EXTENSIONS):
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns:
+            table = table.select(columns)
+    else:
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    return table.to_pandas()
+
+
+def write_table(df, path):
+    """Save a DataFrame as Parquet or Arrow IPC depending on the file extension"""
+    require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if path.endswith(IPC_EXTENSIONS):
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pq.write_table(table, path, compression="zstd")
+
+
+def sanitize_for_excel(value):
+    """Prevent Excel from misinterpreting text as formulas."""
+    if isinstance(value, str) and value and value[0] in ('=', '+', '-', '@'):
+        return "'" + value
+    return value
+
+
+def write_excel_report(df, path):
+    """Optional Excel copy of a dataset: formula-safe and cut to Excel's cell limit"""
+    report = df.copy()
+    for col in report.columns:
+        if pd.api.types.is_string_dtype(report[col]):
+            report[col] = report[col].map(sanitize_for_excel).map(
+                lambda v: v[:EXCEL_CELL_LIMIT] if isinstance(v, str) else v
+            )
+    report.to_excel(path, index=False, engine="openpyxl")
@@ -0,0 +1,248 @@
+"""
+Parallel, resumable corpus builder for 20 Newsgroups style folders.
+
+Files are grouped into chunks and cleaned in a process pool. Finished chunks
+are written to disk as they arrive, so memory holds only the chunks in
+flight, and an interrupted build continues from the finished chunks with
+``--resume``. The output is Parquet (each chunk goes to a part file, merged
+at the end) or CSV (appended, with the size after each chunk logged to a
+``.progress`` file so a half-written chunk can be cut off).
+
+    python corpus_builder.py "Topic Modeling/req_data/20news-18828" 20news_clean.parquet --workers 8
+    python corpus_builder.py 20news-18828 metadata.parquet --profiles body,metadata --resume
+"""
+import os
+import csv
+import sys
+import json
+import time
+import shutil
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing.newsgroups import PROFILES, VERSION
+from preprocessing.cache import cached_map
+from preprocessing.columnar import require_pyarrow
+
+
+COLUMNS = ["filename", "category", "text"]
+CHUNK_FILES = 200
+
+
+def list_files(root, max_files=None):
+    """(category, filename, path) for every post, categories and files in sorted order"""
+    files = []
+    for category in sorted(os.listdir(root)):
+        category_path = os.path.join(root, category)
+        if os.path.isdir(category_path):
+            names = sorted(os.listdir(category_path))[:max_files]
+            files.extend((category, name, os.path.join(category_path, name)) for name in names)
+    return files
+
+
+def clean_chunk(files, profiles):
+    """Worker: read and clean a chunk of files; returns (rows, errors)"""
+    names, texts, errors = [], [], []
+    for category, filename, path in files:
+        try:
+            with open(path, "r", encoding="latin1") as f:
+                texts.append(f.read())
+            names.append((filename, category))
+        except Exception as e:
+            errors.append(f"{path}: {e}")
+
+    def clean(text):
+        for profile in profiles:
+            text = PROFILES[profile](text)
+        return text
+
+    cleaned = cached_map(clean, texts, "newsgroups." + "+".join(profiles), VERSION)
+    rows = [(filename, category, text) for (filename, category), text in zip(names, cleaned) if text]
+    return rows, errors
+
+
+def check_settings(path, settings):
+    with open(path, encoding="utf-8") as f:
+        if json.loads(f.readline()) != settings:
+            raise Exception(f"{path} was written with different settings; rerun without --resume")
+
+
+class CSVSink:
+    """
+    Appends chunks to one CSV. The file size after each chunk is logged to
+    ``<output>.progress`` so a resumed build can cut off a half-written chunk.
+    """
+
+    def __init__(self, output, settings, resume):
+        self.output, self.progress_path = output, output + ".progress"
+        self.done, size = set(), 0
+        if resume and os.path.exists(self.progress_path) and os.path.exists(output):
+            check_settings(self.progress_path, settings)
+            with open(self.progress_path, encoding="utf-8") as f:
+                next(f)
+                for line in f:
+                    if not line.endswith("\n"):
+                        break  # torn last line
+                    chunk_id, size = map(int, line.split("\t"))
+                    self.done.add(chunk_id)
+        if self.done:
+            with open(output, "r+b") as f:
+                f.truncate(size)
+        else:
+            with open(output, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(COLUMNS)
+            with open(self.progress_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(settings) + "\n")
+        self.out = open(output, "a", newline="", encoding="utf-8")
+        self.log = open(self.progress_path, "a", encoding="utf-8")
+        self.writer = csv.writer(self.out)
+
+    def write(self, chunk_id, rows):
+        self.writer.writerows(rows)
+        self.out.flush()
+        self.log.write(f"{chunk_id}\t{self.out.tell()}\n")
+        self.log.flush()
+
+    def close(self):
+        self.out.close()
+        self.log.close()
+
+    def finish(self):
+        pass
+
+
+class ParquetSink:
+    """
+    Writes each chunk to its own file in ``<output>.parts/`` (renamed into
+    place once complete, so finished parts are exactly the finished chunks)
+    and merges the parts into ``output`` in chunk order at the end.
+    """
+
+    def __init__(self, output, settings, resume):
+        require_pyarrow()
+        import pyarrow as pa
+
+        self.pa, self.output = pa, output
+        self.parts = output + ".parts"
+        self.schema = pa.schema([(name, pa.string()) for name in COLUMNS])
+        settings_path = os.path.join(self.parts, "settings.json")
+        if resume and os.path.exists(settings_path):
+            check_settings(settings_path, settings)
+        else:
+            shutil.rmtree(self.parts, ignore_errors=True)
+            os.makedirs(self.parts)
+            with open(settings_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(settings) + "\n")
+        self.done = {int(name.split(".")[0]) for name in os.listdir(self.parts) if name.endswith(".parquet")}
+
+    def write(self, chunk_id, rows):
+        import pyarrow.parquet as pq
+
+        table = self.pa.table(list(zip(*rows)) if rows else [[], [], []], schema=self.schema)
+        path = os.path.join(self.parts, f"{chunk_id:06d}.parquet")
+        pq.write_table(table, path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    def close(self):
+        pass
+
+    def finish(self):
+        import pyarrow.parquet as pq
+
+        names = sorted(name for name in os.listdir(self.parts) if name.endswith(".parquet"))
+        with pq.ParquetWriter(self.output, self.schema, compression="zstd") as writer:
+            for name in names:
+                writer.write_table(pq.read_table(os.path.join(self.parts, name)))
+        shutil.rmtree(self.parts)
+
+
+def iter_chunks(files, chunk_files, done, workers, profiles, max_in_flight=None):
+    """Yield (chunk_id, rows, errors) in chunk order, skipping chunks in ``done``"""
+    tasks = ((i, files[start:start + chunk_files])
+             for i, start in enumerate(range(0, len(files), chunk_files)) if i not in done)
+    if workers == 1:
+        for chunk_id, chunk in tasks:
+            yield (chunk_id, *clean_chunk(chunk, profiles))
+        return
+
+    max_in_flight = max_in_flight or workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk_id, chunk in tasks:
+            pending.append((chunk_id, pool.submit(clean_chunk, chunk, profiles)))
+            if len(pending) >= max_in_flight:
+                break
+        while pending:
+            chunk_id, future = pending.popleft()
+            next_task = next(tasks, None)
+            if next_task:
+                pending.append((next_task[0], pool.submit(clean_chunk, next_task[1], profiles)))
+            yield (chunk_id, *future.result())
+
+
+def build_corpus(root, output, profiles=("classification",), workers=None, chunk_files=CHUNK_FILES,
+                 max_files=None, resume=False, on_progress=None):
+    """
+    Clean every post under ``root`` with the given profile chain and stream
+    the rows to ``output`` (.parquet or .csv). Returns (rows written, files processed, errors).
+    ``on_progress(files_done, files_total)`` is called after each chunk.
+    """
+    profiles = list(profiles)
+    for profile in profiles:
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile: {profile}")
+    files = list_files(root, max_files)
+    workers = workers or os.cpu_count() or 1
+    settings = {"root": os.path.abspath(root), "profiles": profiles, "chunk_files": chunk_files,
+                "max_files": max_files, "files": len(files)}
+    sink = (ParquetSink if output.endswith(".parquet") else CSVSink)(output, settings, resume)
+
+    def files_in(chunk_id):
+        return min(chunk_files, len(files) - chunk_id * chunk_files)
+
+    written, processed, errors = 0, sum(map(files_in, sink.done)), []
+    try:
+        for chunk_id, rows, chunk_errors in iter_chunks(files, chunk_files, sink.done, workers, profiles):
+            sink.write(chunk_id, rows)
+            written += len(rows)
+            processed += files_in(chunk_id)
+            errors.extend(chunk_errors)
+            if on_progress:
+                on_progress(processed, len(files))
+    finally:
+        sink.close()
+    sink.finish()
+    return written, processed, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", help="folder with one sub-folder per category")
+    parser.add_argument("output", help="output .parquet or .csv (filename, category, text)")
+    parser.add_argument("--profiles", default="classification",
+                        help=f"comma-separated cleaning profiles applied in order ({', '.join(PROFILES)})")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-files", type=int, default=CHUNK_FILES)
+    parser.add_argument("--max-files", type=int, default=None, help="files per category")
+    parser.add_argument("--resume", action="store_true", help="continue an interrupted build")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    def report(done, total):
+        elapsed = time.perf_counter() - start
+        print(f"   {done:,}/{total:,} files  ({done / max(elapsed, 1e-9):,.0f} files/s)")
+
+    written, processed, errors = build_corpus(
+        args.root, args.output, args.profiles.split(","), args.workers, args.chunk_files,
+        args.max_files, args.resume, report,
+    )
+    for error in errors:
+        print(f" Skipping {error}")
+    print(f"✅ {written:,} rows from {processed:,} files → {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Single-pass header/quote/signature cleaner for 20 Newsgroups posts.
+
+All pipelines share one engine configured by a profile:
+
+    body            stage 1 of the metadata pipeline (MetaData.extract_body)
+    metadata        stage 2 of the metadata pipeline (MetaData.clean_body)
+    classification  strict cleaner for topic classification
+
+Patterns are compiled once. Lines are screened with plain string tests and
+only the few that contain ":" or "<" go through one combined header/reply
+regex. Email, url and html removal are skipped when the text cannot contain
+a match, and character filtering plus whitespace collapsing run as a single
+pass, so most posts are scanned with one or two regex passes instead of five
+to seven. Output is identical to the original per-line implementations.
+"""
+import re
+
+# Bump whenever the output of any profile changes; it keys cached results.
+VERSION = 1
+
+BLANK_LINE = re.compile(r"\n\s*\n")
+CONTROL_CHARS = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F]")
+URL = re.compile(r"http\S+|www\.\S+")
+HTML_TAG = re.compile(r"<[^>]+>")
+
+BODY_HEADERS = ("archive-name", "from", "subject", "path", "xref", "organization", "lines",
+                "newsgroups", "message-id", "keywords")
+METADATA_HEADERS = BODY_HEADERS + ("last-modified", "version")
+CLASSIFICATION_HEADERS = ("from", "subject", "path", "organization", "lines", "newsgroups",
+                          "message-id", "keywords", "last-modified", "version", "distribution",
+                          "summary", "sender", "references", "nntp-posting-host", "article-id",
+                          "followup-to", "content-type", "content-transfer-encoding")
+
+
+class NewsgroupCleaner:
+    """
+    Cleaner for one profile.
+
+    headers:       header names whose lines are dropped
+    loose_headers: allow whitespace around the header name ("  From :")
+    signature:     regex for the line that starts a signature; it and everything after is dropped
+    drop_replies:  drop "In article <...>" and "... writes:" / "wrote:" lines
+    email:         regex for email addresses; when set, emails, urls and html tags become spaces
+    keep:          character class body of the characters to keep besides whitespace;
+                   others become spaces, whitespace runs collapse and the text is lower-cased
+    """
+
+    def __init__(self, headers, loose_headers=False, signature=None, drop_replies=False,
+                 email=None, keep=None, strip_controls=False):
+        names = "|".join(re.escape(name) for name in headers)
+        drop = [rf"^\s*(?:{names})\s*:" if loose_headers else rf"^(?:{names}):"]
+        if drop_replies:
+            drop += [r"In article\s*<.*?>", r"writes:|wrote:"]
+        # Every header and reply line contains ":" or "<", so the regex only
+        # runs on the few lines that do.
+        self.drop_line = re.compile("|".join(drop), re.I)
+        self.signature = re.compile(signature) if signature else None
+        self.email = re.compile(email) if email else None
+        # Replacing each character outside ``keep`` with a space and then
+        # collapsing runs of 2+ whitespace is the same as replacing any run of
+        # 2+ characters outside ``keep`` (whitespace included) or a single
+        # non-space character outside it.
+        self.filter = re.compile(rf"[^{keep}]{{2,}}|[^{keep}\s]") if keep else None
+        self.strip_controls = strip_controls
+
+    def __call__(self, text):
+        if not isinstance(text, str):
+            return ""
+        split = BLANK_LINE.search(text)
+        body = text[split.end():] if split else text
+
+        lines = []
+        drop_line, signature = self.drop_line.search, self.signature
+        for line in body.splitlines():
+            if signature and signature.match(line):
+                break
+            if line.lstrip().startswith((">", "|")):
+                continue
+            if (":" in line or "<" in line) and drop_line(line):
+                continue
+            lines.append(line)
+        body = "\n".join(lines)
+
+        if self.strip_controls:
+            return CONTROL_CHARS.sub("", body.strip())
+        # Each removal pass is skipped when its pattern cannot match
+        if self.email:
+            if "@" in body:
+                body = self.email.sub(" ", body)
+            if "http" in body or "www." in body:
+                body = URL.sub(" ", body)
+            if "<" in body:
+                body = HTML_TAG.sub(" ", body)
+        if self.filter:
+            body = self.filter.sub(" ", body).lower()
+        return body.strip()
+
+
+PROFILES = {
+    "body": NewsgroupCleaner(BODY_HEADERS, strip_controls=True),
+    "metadata": NewsgroupCleaner(
+        METADATA_HEADERS, signature=r"\s*--", drop_replies=True,
+        email=r"\S+@\S+", keep=r"a-zA-Z0-9.,!?",
+    ),
+    "classification": NewsgroupCleaner(
+        CLASSIFICATION_HEADERS, loose_headers=True, signature=r"\s*(?:--+|__+|\*\*+)\s*$",
+        drop_replies=True, email=r"\b\S+@\S+\b", keep=r"a-zA-Z",
+    ),
+}
+
+
+def clean_post(text, profile="classification"):
+    """Clean one raw 20 Newsgroups post with the named profile"""
+    return PROFILES[profile](text)
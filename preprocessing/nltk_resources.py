@@ -0,0 +1,100 @@
+"""
+Offline NLTK resource manager.
+
+Corpora are looked up locally (the standard NLTK search path plus the
+repository's ``nltk_data/`` folder) and downloaded into ``nltk_data/`` only
+when missing, once. Importing this module does nothing; modules call
+``ensure(...)`` right before they first need a resource.
+
+On a connected machine, vendor everything once and copy ``nltk_data/`` to
+air-gapped workers:
+
+    python preprocessing/nltk_resources.py
+    python preprocessing/nltk_resources.py --check
+
+Set NLTK_OFFLINE=1 to never download; a missing resource then raises a
+LookupError naming the command above.
+"""
+import os
+import sys
+import argparse
+
+
+VENDOR_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "nltk_data")
+
+RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",
+    "stopwords": "corpora/stopwords",
+    "wordnet": "corpora/wordnet",
+}
+
+_ready = set()
+
+
+def tokenizer():
+    """The punkt resource word_tokenize/sent_tokenize need with the installed NLTK"""
+    import nltk.tokenize.punkt
+
+    return "punkt_tab" if hasattr(nltk.tokenize.punkt, "PunktTokenizer") else "punkt"
+
+
+def _search_path():
+    import nltk
+
+    if VENDOR_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, VENDOR_DIR)
+    return nltk
+
+
+def is_available(name):
+    nltk = _search_path()
+    try:
+        nltk.data.find(RESOURCES[name])
+    except LookupError:
+        return False
+    return True
+
+
+def ensure(*names, download=None):
+    """
+    Make sure the named resources are available locally, downloading missing
+    ones into ``nltk_data/`` unless offline. Cheap after the first call.
+    """
+    missing = [name for name in names if name not in _ready and not is_available(name)]
+    if download is None:
+        download = os.environ.get("NLTK_OFFLINE", "").lower() not in ("1", "true", "yes")
+    if missing and download:
+        import nltk
+
+        for name in missing:
+            nltk.download(name, download_dir=VENDOR_DIR, quiet=True)
+        missing = [name for name in missing if not is_available(name)]
+    if missing:
+        raise LookupError(
+            f"NLTK resources not found locally: {', '.join(missing)}. "
+            f"Run 'python preprocessing/nltk_resources.py' on a connected machine and copy {VENDOR_DIR}"
+        )
+    _ready.update(names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="only report what is available")
+    args = parser.parse_args()
+
+    if not args.check:
+        try:
+            ensure(*RESOURCES, download=True)
+        except LookupError as e:
+            print(f"❌ {e}")
+    ok = True
+    for name in RESOURCES:
+        available = is_available(name)
+        ok &= available
+        print(f"{'✅' if available else '❌'} {name}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
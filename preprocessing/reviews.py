@@ -0,0 +1,42 @@
+"""
+Review text cleaning for the sentiment models.
+
+Shared by the training scripts in Sentiment Analysis and by anything that
+scores new text with those models, so both see exactly the same input.
+Importing this module loads nothing; NLTK data is loaded on first use.
+"""
+import re
+
+from preprocessing.nltk_resources import ensure
+
+# Bump whenever clean_text output changes; it keys cached results.
+CLEAN_TEXT_VERSION = 1
+CACHE_NAMESPACE = "train_test.clean_text"
+
+URL = re.compile(r"http\S+|www\S+|https\S+")
+NON_LETTERS = re.compile(r"[^a-z\s]")
+
+stop_words = None
+lemmatizer = None
+
+
+def load_resources():
+    global stop_words, lemmatizer
+    if lemmatizer is None:
+        ensure("stopwords", "wordnet")
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
+
+        stop_words = set(stopwords.words("english"))
+        lemmatizer = WordNetLemmatizer()
+
+
+def clean_text(text):
+    """Basic cleaning: lowercasing, removing special chars, stopwords, lemmatization"""
+    if lemmatizer is None:
+        load_resources()
+    text = str(text).lower()
+    text = URL.sub("", text)
+    text = NON_LETTERS.sub("", text)
+    tokens = [lemmatizer.lemmatize(w) for w in text.split() if w not in stop_words]
+    return " ".join(tokens)